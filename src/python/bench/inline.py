@@ -0,0 +1,49 @@
+"""
+    Call-heavy programs with and without the optimizer (constant folding
+    and inlining of small functions), under both backends.
+
+    Run from src/python: python -m bench.inline [iterations]
+"""
+
+import sys
+import time
+
+from rinha.interpreter import parse, execute
+
+PROGRAMS = {
+    'square': '''
+let execute = fn (func, n) => { func(n) };
+let square = fn (n) => { n * n };
+let add = fn (a, b) => { a + b };
+let loop = fn (i, acc) => {
+    if (i == 0) { acc } else { loop(i - 1, add(acc, execute(square, i) %% 7)) }
+};
+loop(%d, 0)
+''',
+    'geometry': '''
+let max = fn (a, b) => { if (a > b) { a } else { b } };
+let min = fn (a, b) => { if (a < b) { a } else { b } };
+let clamp = fn (x, lo, hi) => { max(lo, min(x, hi)) };
+let loop = fn (i, acc) => {
+    if (i == 0) { acc } else { loop(i - 1, acc + clamp(i %% 100, 10, 90)) }
+};
+loop(%d, 0)
+''',
+}
+
+def measure(source, backend, optimize):
+    tree = parse(source)
+    start = time.time()
+    execute(tree, backend, optimize=optimize)
+    return time.time() - start
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for name in sorted(PROGRAMS):
+        source = PROGRAMS[name] % iterations
+        for backend in ['tree', 'vm']:
+            plain = measure(source, backend, False)
+            optimized = measure(source, backend, True)
+            print('%-9s %-4s  plain %6.3f s  optimized %6.3f s  %.2fx' % (
+                name, backend, plain, optimized, plain / optimized
+            ))
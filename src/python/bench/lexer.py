@@ -0,0 +1,27 @@
+"""
+    Lexer throughput on a scaled combination.rinha.
+
+    Run from src/python: python -m bench.lexer [copies]
+"""
+
+import sys
+import time
+
+from rinha.lexical import lexer
+from bench.memory import program
+
+def measure(source):
+    lexer.lex('')
+    start = time.time()
+    count = 0
+    for token in lexer.lex(source):
+        count += 1
+    return count, time.time() - start
+
+if __name__ == '__main__':
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = program(copies)
+    count, elapsed = measure(source)
+    print('%d bytes, %d tokens in %.3f s: %.2f MB/s, %d tokens/s' % (
+        len(source), count, elapsed, len(source) / elapsed / 1e6, count / elapsed
+    ))
@@ -0,0 +1,68 @@
+"""
+    Bytes retained per AST node after parsing a scaled combination.rinha.
+
+    Run from src/python: python -m bench.memory [copies]
+"""
+
+import sys
+import tracemalloc
+
+from rinha import ast
+from rinha.lexical import lexer
+from rinha.grammar import parser
+
+COMBINATION = '''
+let combination_%d = fn (n, k) => {
+    let a = (k == 0);
+    let b = (k == n);
+    if (a || b)
+    {
+        1
+    }
+    else {
+        combination_%d(n - 1, k - 1) + combination_%d(n - 1, k)
+    }
+};
+'''
+
+def program(copies):
+    parts = [COMBINATION % (i, i, i) for i in range(copies)]
+    parts.append('print(combination_0(10, 2))')
+    return ''.join(parts)
+
+def fields(node):
+    if hasattr(node, '__dict__'):
+        return list(vars(node).values())
+    names = []
+    for cls in type(node).__mro__:
+        names.extend(getattr(cls, '__slots__', ()))
+    return [getattr(node, name, None) for name in names]
+
+def count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, ast.Term) or isinstance(node, (ast.ParamList, ast.ArgList)):
+            count += 1
+            stack.extend(fields(node))
+    return count
+
+def measure(copies):
+    tokens = list(lexer.lex(program(copies)))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = parser.parse(iter(tokens))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = count_nodes(tree)
+    return nodes, after - before
+
+if __name__ == '__main__':
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    nodes, size = measure(copies)
+    print('%d nodes, %d bytes, %.1f bytes/node' % (nodes, size, float(size) / nodes))
@@ -0,0 +1,35 @@
+"""
+    Parser throughput, rply LALR against precedence climbing, on tokens
+    lexed ahead of time: a scaled combination.rinha and one call with many
+    arguments (which rply's ArgList.merge copies on every comma).
+
+    Run from src/python: python -m bench.parser [copies] [arguments]
+"""
+
+import sys
+import time
+
+from rinha import grammar, pratt
+from rinha.lexical import lexer
+from bench.memory import program
+
+PARSERS = [('rply', grammar.parser), ('pratt', pratt.parser)]
+
+def measure(parser, tokens):
+    start = time.time()
+    parser.parse(iter(tokens))
+    return time.time() - start
+
+def report(name, source):
+    tokens = list(lexer.lex(source))
+    print('%s: %d tokens' % (name, len(tokens)))
+    for label, parser in PARSERS:
+        elapsed = min(measure(parser, tokens) for _ in range(3))
+        print('    %-6s %8.3f s  %9d tokens/s' % (label, elapsed, len(tokens) / elapsed))
+
+if __name__ == '__main__':
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    arguments = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    report('combination x %d' % copies, program(copies))
+    report('call with %d arguments' % arguments, 'f(%s)' % ', '.join(['1'] * arguments))
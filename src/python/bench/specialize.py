@@ -0,0 +1,40 @@
+"""
+    Arithmetic-heavy programs on the plain and the self-specializing tree
+    walker.
+
+    Run from src/python: python -m bench.specialize [n]
+"""
+
+import sys
+import time
+
+from rinha.interpreter import parse, execute
+
+PROGRAMS = {
+    'fib': '''
+let fib = fn (n) => { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+fib(%d)
+''',
+    'sum': '''
+let loop = fn (i, acc) => {
+    if (i == 0) { acc } else { loop(i - 1, acc + (i * i) %% 7 - i / 3) }
+};
+loop(%d * 1000, 0)
+''',
+}
+
+def measure(source, backend):
+    tree = parse(source)
+    start = time.time()
+    execute(tree, backend)
+    return time.time() - start
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for name in sorted(PROGRAMS):
+        source = PROGRAMS[name] % n
+        plain = measure(source, 'tree')
+        specialized = measure(source, 'specialize')
+        print('%-4s  tree %6.3f s  specialize %6.3f s  %.2fx' % (
+            name, plain, specialized, plain / specialized
+        ))
@@ -0,0 +1,37 @@
+"""
+    Cold-start wall time of `python entrypoint.py print.rinha`, end to end:
+    interpreter startup, imports, lexing, parsing and running the program.
+
+    Run from src/python: python -m bench.startup [runs] [program.rinha]
+"""
+
+import os
+import sys
+import time
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENTRYPOINT = os.path.join(HERE, '..', 'entrypoint.py')
+PROGRAM = os.path.join(HERE, '..', '..', 'rinha', 'print.rinha')
+
+def timed(command):
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        subprocess.check_call(command, stdout=devnull, stderr=devnull)
+        return time.time() - start
+
+def measure(command, runs):
+    timed(command)  # warm the page cache and write any .pyc files
+    times = sorted(timed(command) for _ in range(runs))
+    return times[0], times[len(times) // 2]
+
+def report(name, command, runs):
+    best, median = measure(command, runs)
+    print('%-12s best %7.1f ms  median %7.1f ms' % (name, best * 1000, median * 1000))
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    program = sys.argv[2] if len(sys.argv) > 2 else PROGRAM
+
+    report('python', [sys.executable, '-c', 'pass'], runs)
+    report('entrypoint', [sys.executable, ENTRYPOINT, program], runs)
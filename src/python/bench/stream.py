@@ -0,0 +1,41 @@
+"""
+    Peak traced memory of parsing a generated program from a string read
+    up front against streaming it from the open file.
+
+    Run from src/python: python -m bench.stream [copies]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from rinha.interpreter import parse
+from bench.memory import program
+
+def peak(run):
+    tracemalloc.start()
+    run()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+def from_string(path):
+    with open(path, 'rb') as f:
+        parse(f.read().decode('utf-8'))
+
+def from_file(path):
+    with open(path, 'rb') as f:
+        parse(f)
+
+if __name__ == '__main__':
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    fd, path = tempfile.mkstemp(suffix='.rinha')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(program(copies))
+        print('%d bytes of source' % os.path.getsize(path))
+        for name, run in [('string', from_string), ('file', from_file)]:
+            print('    %-8s peak %6.1f MB' % (name, peak(lambda: run(path)) / 1e6))
+    finally:
+        os.remove(path)
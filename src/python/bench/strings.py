@@ -0,0 +1,41 @@
+"""
+    String accumulation in a loop, with ropes and with every concatenation
+    copied (ast.ROPE_MIN raised past any length), under both backends.
+
+    Run from src/python: python -m bench.strings [n]
+"""
+
+import sys
+import time
+
+from rinha import ast
+from rinha.interpreter import parse, execute
+
+SOURCE = '''
+let build = fn (i, acc) => {
+    if (i == 0) { acc } else { build(i - 1, acc + "item " + i + ", ") }
+};
+let s = build(%d, "");
+s == s
+'''
+
+def measure(source, backend, rope_min):
+    saved, ast.ROPE_MIN = ast.ROPE_MIN, rope_min
+    try:
+        tree = parse(source)
+        start = time.time()
+        execute(tree, backend)
+        return time.time() - start
+    finally:
+        ast.ROPE_MIN = saved
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for size in [n // 4, n // 2, n]:
+        source = SOURCE % size
+        for backend in ['tree', 'vm']:
+            ropes = measure(source, backend, ast.ROPE_MIN)
+            copies = measure(source, backend, sys.maxsize)
+            print('%6d  %-4s  ropes %6.3f s  copies %6.3f s  %.2fx' % (
+                size, backend, ropes, copies, copies / ropes
+            ))
@@ -0,0 +1,189 @@
+"""
+    Benchmark suite: a scaled corpus of rinha programs under every backend.
+
+    Each program runs in a fresh interpreter, so its peak RSS is its own,
+    and reports parse time, eval time, peak RSS and the peak of memory
+    allocated while evaluating (a second run under tracemalloc, where the
+    host has it, after the RSS is read). Printed output is captured, not timed against a terminal.
+
+    Run from src/python:
+
+        python -m bench [--scale F] [--repeat N] [--backend B]... [--program P]...
+                        [--output bench_output.txt] [--json results.json]
+
+    Results are written as a table to --output and, with --json, as a list of
+    records, so runs on different commits can be compared.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+from rinha.interpreter import parse, execute, BACKENDS
+from rinha.output import output
+
+# Each program takes its size as %(n)d, scaled by --scale
+CORPUS = {
+    'fib': (25, '''
+let fib = fn (n) => { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+print(fib(%(n)d))
+'''),
+    'combination': (18, '''
+let combination = fn (n, k) => {
+    let a = k == 0;
+    let b = k == n;
+    if (a || b) { 1 } else { combination(n - 1, k - 1) + combination(n - 1, k) }
+};
+print(combination(%(n)d, %(n)d / 2))
+'''),
+    'sum': (2000, '''
+let sum = fn (n) => { if (n == 1) { n } else { n + sum(n - 1) } };
+let loop = fn (i, acc) => { if (i == 0) { acc } else { loop(i - 1, acc + sum(100)) } };
+print(loop(%(n)d, 0))
+'''),
+    'string-concat': (50000, '''
+let build = fn (i, acc) => {
+    if (i == 0) { acc } else { build(i - 1, acc + "item " + i + ", ") }
+};
+let s = build(%(n)d, "");
+print(s == s)
+'''),
+    'tuple-heavy': (50000, '''
+let step = fn (p) => { (second(p), first(p) + second(p) %% 1000) };
+let loop = fn (i, p) => { if (i == 0) { p } else { loop(i - 1, step(p)) } };
+print(loop(%(n)d, (0, 1)))
+'''),
+    'closure-heavy': (50000, '''
+let adder = fn (x) => { fn (y) => { x + y } };
+let compose = fn (f, g) => { fn (x) => { g(f(x)) } };
+let loop = fn (i, acc) => {
+    if (i == 0) { acc } else { loop(i - 1, compose(adder(i), adder(1))(acc) %% 1000003) }
+};
+print(loop(%(n)d, 0))
+'''),
+}
+
+FIELDS = ['program', 'backend', 'n', 'parse_ms', 'eval_ms', 'peak_rss_kb', 'alloc_peak_kb']
+
+def source(name, scale):
+    size, template = CORPUS[name]
+    n = max(1, int(size * scale))
+    return n, template % {'n': n}
+
+## One run, in the child
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+def alloc_peak_kb(text, backend):
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tree = parse(text)
+    tracemalloc.start()
+    try:
+        execute(tree, backend)
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+def run(name, backend, scale, repeat):
+    n, text = source(name, scale)
+
+    parse_time = eval_time = None
+    output.capture()
+    try:
+        for _ in range(repeat):
+            start = time.time()
+            tree = parse(text)
+            elapsed = time.time() - start
+            parse_time = elapsed if parse_time is None else min(parse_time, elapsed)
+
+            start = time.time()
+            execute(tree, backend)
+            elapsed = time.time() - start
+            eval_time = elapsed if eval_time is None else min(eval_time, elapsed)
+        # ru_maxrss is a peak for the whole process, so it is read before
+        # tracemalloc adds its own overhead
+        rss = peak_rss_kb()
+        allocated = alloc_peak_kb(text, backend)
+    finally:
+        output.attach()
+
+    return {
+        'program': name,
+        'backend': backend,
+        'n': n,
+        'parse_ms': round(parse_time * 1000, 2),
+        'eval_ms': round(eval_time * 1000, 2),
+        'peak_rss_kb': rss,
+        'alloc_peak_kb': allocated,
+    }
+
+## Runner
+
+def spawn(name, backend, scale, repeat):
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [
+        sys.executable, '-m', 'bench.suite', '--child', name, backend,
+        '--scale', repr(scale), '--repeat', str(repeat),
+    ]
+    raw = subprocess.check_output(command, cwd=here)
+    return json.loads(raw.decode('utf-8').strip().splitlines()[-1])
+
+def table(results):
+    lines = ['%-14s %-10s %7s %10s %10s %12s %14s' % tuple(FIELDS)]
+    for r in results:
+        lines.append('%-14s %-10s %7d %10.2f %10.2f %12s %14s' % (
+            r['program'], r['backend'], r['n'], r['parse_ms'], r['eval_ms'],
+            r['peak_rss_kb'], r['alloc_peak_kb'],
+        ))
+    return '\n'.join(lines) + '\n'
+
+def main(argv = None):
+    cli = argparse.ArgumentParser(prog='python -m bench', description='Run the benchmark suite')
+    cli.add_argument('--scale', type=float, default=1.0,
+                     help='multiply every program size by F')
+    cli.add_argument('--repeat', type=int, default=3,
+                     help='report the best of N runs')
+    cli.add_argument('--backend', action='append', choices=BACKENDS,
+                     help='backends to run (default: all)')
+    cli.add_argument('--program', action='append', choices=sorted(CORPUS),
+                     help='programs to run (default: all)')
+    cli.add_argument('--output', default='bench_output.txt', metavar='PATH',
+                     help='where to write the table')
+    cli.add_argument('--json', metavar='PATH',
+                     help='also write the results as JSON')
+    cli.add_argument('--child', nargs=2, metavar=('PROGRAM', 'BACKEND'), help=argparse.SUPPRESS)
+    args = cli.parse_args(argv)
+
+    if args.child:
+        name, backend = args.child
+        sys.stdout.write(json.dumps(run(name, backend, args.scale, args.repeat)) + '\n')
+        return
+
+    results = []
+    for name in args.program or sorted(CORPUS):
+        for backend in args.backend or BACKENDS:
+            results.append(spawn(name, backend, args.scale, args.repeat))
+            sys.stderr.write(table(results[-1:]).splitlines()[-1] + '\n')
+
+    report = table(results)
+    with open(args.output, 'w') as f:
+        f.write(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    sys.stdout.write(report)
+
+if __name__ == '__main__':
+    main()
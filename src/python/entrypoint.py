@@ -1,16 +1,78 @@
 import sys
+import argparse
 
-from rinha.lexical import lexer
-from rinha.grammar import parser
-from rinha.ast import dump
-    
+from rinha.interpreter import parse, execute, BACKENDS, PARSERS
+from rinha.memo import LRUCache
+from rinha.loader import load
+from rinha.cache import ParseCache
+from rinha.output import output, FLUSH_LINE, FLUSH_FULL
+from rinha.profiler import Profiler
+from rinha.locations import Locations
+from rinha.exporter import dump
 
-def interpret(filename, source):
-    stream = lexer.lex(source)
-    ast = parser.parse(stream)
-    ast.eval()
 
 if __name__ == "__main__":
-    filename = sys.argv[1]
-    with open(filename) as f:
-        interpret(filename, f.read())
+    cli = argparse.ArgumentParser(description='Run a rinha program')
+    cli.add_argument('filename', help='.rinha source or .json AST')
+    cli.add_argument('--backend', choices=BACKENDS, default='tree',
+                     help='tree walker (reference), bytecode vm or self-specializing tree walker')
+    cli.add_argument('--parser', choices=PARSERS, default='pratt',
+                     help='precedence climbing or the rply LALR grammar')
+    cli.add_argument('--optimize', '-O', action='store_true',
+                     help='inline small functions, fold constants and dead branches')
+    cli.add_argument('--memoize', type=int, metavar='SIZE',
+                     help='cache results of pure functions in an LRU of SIZE entries')
+    cli.add_argument('--cache', metavar='DIR',
+                     help='reuse parsed programs stored in DIR')
+    cli.add_argument('--cache-size', type=int, metavar='BYTES', default=64 * 1024 * 1024,
+                     help='evict least recently used entries past BYTES')
+    cli.add_argument('--flush', choices=['auto', FLUSH_LINE, FLUSH_FULL], default='auto',
+                     help='flush printed lines one by one or when the buffer fills up '
+                          '(auto: by line on a terminal)')
+    cli.add_argument('--profile', metavar='PATH',
+                     help='write time per stack of functions and nodes to PATH, in the '
+                          'collapsed format of flame graph tools (tree backend only)')
+    cli.add_argument('--export', metavar='PATH',
+                     help='write the parsed program to PATH as a JSON AST, and exit')
+    args = cli.parse_args()
+
+    if args.flush == 'auto':
+        output.attach(policy=FLUSH_LINE if sys.stdout.isatty() else FLUSH_FULL)
+    else:
+        output.attach(policy=args.flush)
+
+    memo = LRUCache(args.memoize) if args.memoize else None
+    cache = ParseCache(args.cache, args.cache_size) if args.cache else None
+    profiler = Profiler() if args.profile else None
+
+    locations = None
+    if args.filename.endswith('.json'):
+        with open(args.filename) as f:
+            ast = load(f)
+    else:
+        locations = Locations()
+        with open(args.filename, 'rb') as f:
+            ast = parse(f, cache, args.parser, locations)
+
+    if args.export:
+        with open(args.export, 'w') as f:
+            dump(ast, f, locations, args.filename)
+        sys.exit(0)
+
+    try:
+        execute(ast, args.backend, memo, args.optimize, profiler, locations)
+    except Exception as e:
+        # Point at the innermost node being evaluated, where the tree backends know it
+        node = locations.failed(sys.exc_info()[2]) if locations is not None else None
+        where = '%s:%d' % (args.filename, locations.line(node)) if node is not None else args.filename
+        sys.stderr.write('%s: %s: %s\n' % (where, type(e).__name__, e))
+        sys.exit(1)
+
+    if memo is not None:
+        sys.stderr.write(memo.report() + '\n')
+    if cache is not None:
+        sys.stderr.write(cache.report() + '\n')
+    if profiler is not None:
+        with open(args.profile, 'w') as f:
+            f.write(profiler.collapsed())
+        sys.stderr.write(profiler.report())
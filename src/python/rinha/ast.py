@@ -1,11 +1,30 @@
 import json
 
-from math import fmod
 from rply.token import BaseBox
 
+from rinha.env import Scope, Frame
+from rinha.jit import TRANSLATABLE
+from rinha.numeric import ovfcheck, rbigint, rem, big_rem
+from rinha.output import output
+
+## Compact nodes
+#
+# Every node and value declares __slots__ (which RPython reads like _attrs_),
+# so instances carry no __dict__. rply's BaseBox has no __slots__ though, so it
+# is only used as the base when translating, where RPython needs every parser
+# result to share it.
+
+if TRANSLATABLE:
+    Box = BaseBox
+else:
+    class Box(object):
+        __slots__ = ()
+
 ## Term ABC
 
-class Term(BaseBox):
+class Term(Box):
+    __slots__ = ()
+
     def eval(self, scope = None):
         raise NotImplementedError()
 
@@ -15,16 +34,22 @@ class Term(BaseBox):
 ## Primitive values
 
 def boxed(value):
-    if isinstance(value, int):
+    if isinstance(value, bool):
+        return TRUE if value else FALSE
+    elif isinstance(value, int):
+        if SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+            return SMALL_INTS[value - SMALL_INT_MIN]
         return Int(value)
+    elif isinstance(value, Value):
+        return value
     elif isinstance(value, str):
         return Str(value)
-    elif isinstance(value, bool):
-        return Bool(value)
     else:
         return Str(str(value))
 
 class Value(Term):
+    __slots__ = ()
+
     def to_str(self):
         raise NotImplementedError()
     
@@ -32,6 +57,8 @@ class Value(Term):
         raise NotImplementedError()
 
 class Int(Value):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -47,10 +74,54 @@ class Int(Value):
     def is_truthy(self):
         return self.value == True
     
-class Str(Value):
+class BigInt(Value):
+    """ An integer outside a machine word, held as an rbigint """
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
+    def eval(self, scope = None):
+        return self
+
+    def to_json(self):
+        return {'int': self.value.str()}
+
+    def to_str(self):
+        return self.value.str()
+
+    def is_truthy(self):
+        return False
+
+class Str(Value):
+    # Either flat text, or a rope: the concatenation of two Strs, flattened
+    # (iteratively, as ropes built in a loop are as deep as they are long)
+    # the first time its text is read, e.g. by print or ==
+    __slots__ = ('text', 'left', 'right', 'length')
+
+    def __init__(self, value, left = None, right = None):
+        self.text = value
+        self.left = left
+        self.right = right
+        self.length = len(value) if value is not None else left.length + right.length
+
+    def flatten(self):
+        if self.text is None:
+            pieces = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if node.text is not None:
+                    pieces.append(node.text)
+                else:
+                    stack.append(node.right)
+                    stack.append(node.left)
+            self.text = ''.join(pieces)
+            self.left = self.right = None
+        return self.text
+
+    value = property(flatten)
+
     def eval(self, scope = None):
         return self
 
@@ -64,6 +135,8 @@ class Str(Value):
         return self.value == True
     
 class Bool(Value):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -78,24 +151,113 @@ class Bool(Value):
     
     def is_truthy(self):
         return self.value
+
+## Interned values, shared by every result since values are immutable
+
+TRUE = Bool(True)
+FALSE = Bool(False)
+
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1023
+SMALL_INTS = [Int(i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+
+## Numeric tower
+#
+# Int holds a machine word. Arithmetic on words runs under ovfcheck, and only
+# a result that overflows is redone on rbigints. Results are normalized, so
+# a number that fits in a word is always an Int, and a BigInt never is.
+
+def number(big):
+    try:
+        return boxed(big.toint())
+    except OverflowError:
+        return BigInt(big)
+
+def int_literal(text):
+    try:
+        return Int(ovfcheck(int(text)))
+    except (OverflowError, ValueError):
+        return number(rbigint.fromdecimalstr(text))
+
+def bignum(left, right):
+    return isinstance(left, BigInt) or isinstance(right, BigInt)
+
+def bigint(value):
+    if isinstance(value, BigInt):
+        return value.value
+    elif isinstance(value, Int) or isinstance(value, Bool):
+        return rbigint.fromint(int(value.value))
+    raise TypeError('not a number: %s' % value.to_str())
+
+def numeric(value):
+    return isinstance(value, Int) or isinstance(value, BigInt)
+
+def text(value):
+    if isinstance(value, BigInt):
+        return value.to_str()
+    return str(value.value)
+
+## Strings
+
+# Shorter concatenations are copied right away, which is cheaper than a rope
+# node and keeps ropes from splitting text into tiny leaves
+ROPE_MIN = 64
+
+def concat(left, right):
+    if not isinstance(left, Str):
+        left = Str(text(left))
+    if not isinstance(right, Str):
+        right = Str(text(right))
+
+    if left.length == 0:
+        return right
+    elif right.length == 0:
+        return left
+    elif left.length + right.length < ROPE_MIN:
+        return Str(left.flatten() + right.flatten())
+    return Str(None, left, right)
     
 ## Collections
 
 class Tuple(Value):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
-        self.left = left.eval()
-        self.right = right.eval()
+        assert isinstance(left, Value) and isinstance(right, Value)
+        self.left = left
+        self.right = right
 
     def eval(self, scope = None):
         return self
 
     def to_str(self):
-        return str((self.left.value, self.right.value))
+        return '(%s, %s)' % (item(self.left), item(self.right))
     
     def to_json(self):
         return {'tup': (self.left.to_json(), self.right.to_json())}
 
+def item(value):
+    # Printed as in a Python tuple; BigInts, tuples and closures by to_str
+    if isinstance(value, Int) or isinstance(value, Str) or isinstance(value, Bool):
+        return repr(value.value)
+    return value.to_str()
+
+class Pair(Term):
+    __slots__ = ('left', 'right')
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def eval(self, scope = None):
+        return Tuple(self.left.eval(scope), self.right.eval(scope))
+
+    def to_json(self):
+        return {'tup': (self.left.to_json(), self.right.to_json())}
+
 class First(Term):
+    __slots__ = ('ref',)
+
     def __init__(self, ref):
         self.ref = ref
 
@@ -108,6 +270,8 @@ class First(Term):
         return {'first': self.ref.to_json()}
 
 class Second(Term):
+    __slots__ = ('ref',)
+
     def __init__(self, ref):
         self.ref = ref
 
@@ -122,6 +286,8 @@ class Second(Term):
 ## Intrinsic functions
 
 class Print(Term):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
         self.expr = expr
 
@@ -129,7 +295,7 @@ class Print(Term):
         box = self.expr.eval(scope)
 
         assert isinstance(box, Value)
-        print(box.to_str())
+        output.write_line(box.to_str())
 
         return box
 
@@ -139,6 +305,8 @@ class Print(Term):
 ### Binary operators
 
 class Binary(Term):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         self.left = left
         self.right = right
@@ -154,86 +322,152 @@ class Binary(Term):
         raise NotImplementedError()
     
 class Add(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
         if(isinstance(left, Str) or isinstance(right, Str)):
-            return str(left.value) + str(right.value)
-        else:
-            return left.value + right.value
+            return concat(left, right)
+        elif not bignum(left, right):
+            try:
+                return ovfcheck(left.value + right.value)
+            except OverflowError:
+                pass
+        return number(bigint(left).add(bigint(right)))
 
     def to_json(self):
         return {'Add': (self.left.to_json(), self.right.to_json())}
     
 class Sub(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
-        return left.value - right.value
+        if not bignum(left, right):
+            try:
+                return ovfcheck(left.value - right.value)
+            except OverflowError:
+                pass
+        return number(bigint(left).sub(bigint(right)))
 
     def to_json(self):
         return {'Sub': (self.left.to_json(), self.right.to_json())}
     
 class Mul(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
-        return left.value * right.value
+        if not bignum(left, right):
+            try:
+                return ovfcheck(left.value * right.value)
+            except OverflowError:
+                pass
+        return number(bigint(left).mul(bigint(right)))
 
     def to_json(self):
         return {'Mul': (self.left.to_json(), self.right.to_json())}
     
 class Div(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
-        return left.value // right.value
+        if not bignum(left, right):
+            try:
+                return ovfcheck(left.value // right.value)
+            except OverflowError:
+                pass
+        return number(bigint(left).floordiv(bigint(right)))
 
     def to_json(self):
         return {'Div': (self.left.to_json(), self.right.to_json())}
     
 class Rem(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
-        return int(fmod(left.value, right.value))
+        if bignum(left, right):
+            return number(big_rem(bigint(left), bigint(right)))
+        return rem(left.value, right.value)
 
     def to_json(self):
         return {'Rem': (self.left.to_json(), self.right.to_json())}
     
 class Eq(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
+        if bignum(left, right):
+            return numeric(left) and numeric(right) and bigint(left).eq(bigint(right))
         return left.value == right.value
 
     def to_json(self):
         return {'Eq': (self.left.to_json(), self.right.to_json())}
     
 class Neq(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
+        if bignum(left, right):
+            return not (numeric(left) and numeric(right) and bigint(left).eq(bigint(right)))
         return left.value != right.value
 
     def to_json(self):
         return {'Neq': (self.left.to_json(), self.right.to_json())}
     
 class Lt(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
+        if bignum(left, right):
+            return bigint(left).lt(bigint(right))
         return left.value < right.value
 
     def to_json(self):
         return {'Lt': (self.left.to_json(), self.right.to_json())}
     
 class Gt(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
+        if bignum(left, right):
+            return bigint(right).lt(bigint(left))
         return left.value > right.value
 
     def to_json(self):
         return {'Gt': (self.left.to_json(), self.right.to_json())}
     
 class Lte(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
+        if bignum(left, right):
+            return not bigint(right).lt(bigint(left))
         return left.value <= right.value
 
     def to_json(self):
         return {'Lte': (self.left.to_json(), self.right.to_json())}
     
 class Gte(Binary):
+    __slots__ = ()
+
     def compute(self, left, right):
+        if bignum(left, right):
+            return not bigint(left).lt(bigint(right))
         return left.value >= right.value
 
     def to_json(self):
         return {'Gte': (self.left.to_json(), self.right.to_json())}
     
 class And(Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        # A false left side decides, and the right side is never evaluated
+        lhs = self.left.eval(scope)
+        if isinstance(lhs, Bool) and not lhs.value:
+            return FALSE
+        rhs = self.right.eval(scope)
+        assert isinstance(lhs, Value) and isinstance(rhs, Value)
+        return boxed(self.compute(lhs, rhs))
+
     def compute(self, left, right):
         return left.value and right.value
 
@@ -241,6 +475,17 @@ class And(Binary):
         return {'And': (self.left.to_json(), self.right.to_json())}
     
 class Or(Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        # Likewise for a true left side
+        lhs = self.left.eval(scope)
+        if isinstance(lhs, Bool) and lhs.value:
+            return TRUE
+        rhs = self.right.eval(scope)
+        assert isinstance(lhs, Value) and isinstance(rhs, Value)
+        return boxed(self.compute(lhs, rhs))
+
     def compute(self, left, right):
         return left.value or right.value
 
@@ -249,7 +494,9 @@ class Or(Binary):
     
 # User defined functions
 
-class ParamList(BaseBox):
+class ParamList(Box):
+    __slots__ = ('ids',)
+
     def __init__(self, identif = None):
         self.ids = [identif] if identif else []
     
@@ -259,6 +506,8 @@ class ParamList(BaseBox):
         return self
     
 class Function(Term):
+    __slots__ = ('params', 'body')
+
     def __init__(self, params, body):
         assert isinstance(params, ParamList)
         assert isinstance(body, Term)
@@ -266,15 +515,58 @@ class Function(Term):
         self.body = body
 
     def eval(self, scope = None):
-        return self
+        return Closure(self, scope)
+
+    def enter(self, args, scope):
+        return Scope(dict(zip(self.params.ids, args)), scope)
 
     def apply(self, scope):
         return self.body.eval(scope)
 
     def to_json(self):
         return {'fun': {'param': self.params.ids, 'body': self.body.to_json()} }
+
+class SlotFunction(Function):
+    __slots__ = ('size', 'code')
+
+    def __init__(self, params, body, size = 0):
+        Function.__init__(self, params, body)
+        self.size = size
+        self.code = None
+
+    def enter(self, args, scope):
+        return Frame(args + [None] * (self.size - len(args)), scope)
+
+class Closure(Value):
+    __slots__ = ('function', 'scope')
+    _immutable_fields_ = ['function', 'scope']
+
+    def __init__(self, function, scope):
+        assert isinstance(function, Function)
+        self.function = function
+        self.scope = scope
+
+    def eval(self, scope = None):
+        return self
+
+    def call(self, args):
+        closure = self
+        while True:
+            fn = closure.function
+            result = fn.apply(fn.enter(args, closure.scope))
+            if not isinstance(result, Bounce):
+                return result
+            closure, args = result.closure, result.args
+
+    def to_json(self):
+        return self.function.to_json()
+
+    def to_str(self):
+        return '<#closure>'
     
-class ArgList(BaseBox):
+class ArgList(Box):
+    __slots__ = ('exprs',)
+
     def __init__(self, expr = None):
         self.exprs = [expr] if expr else []
 
@@ -284,6 +576,8 @@ class ArgList(BaseBox):
         return self
     
 class Call(Term):
+    __slots__ = ('callee', 'args')
+
     def __init__(self, callee, args):
         self.callee = callee
         self.args = args
@@ -291,55 +585,130 @@ class Call(Term):
     def eval(self, scope = None):
         fn = self.callee.eval(scope)
 
-        assert isinstance(fn, Function)
-        assert len(fn.params.ids) == len(self.args.exprs)
-        
-        cloj = dict(scope) or dict()
+        assert isinstance(fn, Closure)
+        assert len(fn.function.params.ids) == len(self.args.exprs)
 
         args = [e.eval(scope) for e in self.args.exprs]
-        locals = zip(fn.params.ids, args)
-        cloj.update(locals)
-
-        result = fn.apply(cloj)
-        return result
+        return fn.call(args)
         
     def to_json(self):
         return "Cal(%s) <= (%s)" % (self.callee.to_json(), self.args.to_json())
         
     def to_json(self):
         return {'call': {'callee': self.callee.to_json(), 'args': [e.to_json() for e in self.args.exprs] } }
+
+## Tail calls
+
+class Bounce(Term):
+    __slots__ = ('closure', 'args')
+
+    def __init__(self, closure, args):
+        self.closure = closure
+        self.args = args
+
+class TailCall(Call):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        fn = self.callee.eval(scope)
+
+        assert isinstance(fn, Closure)
+        assert len(fn.function.params.ids) == len(self.args.exprs)
+
+        args = [e.eval(scope) for e in self.args.exprs]
+        return Bounce(fn, args)
     
 ## Naming things
 
 class Reference(Term):
+    __slots__ = ('identif',)
+
     def __init__(self, identif):
         self.identif = identif
 
     def eval(self, scope = None):
-        expr = scope[self.identif]
-        return expr.eval(scope)
+        return scope.lookup(self.identif)
     
     def to_json(self):
         return {'ref': self.identif }
+
+class SlotReference(Reference):
+    # fallback is read instead when the slot may not be bound yet
+    __slots__ = ('depth', 'slot', 'fallback')
+
+    def __init__(self, identif, depth, slot, fallback = None):
+        Reference.__init__(self, identif)
+        self.depth = depth
+        self.slot = slot
+        self.fallback = fallback
+
+    def eval(self, scope = None):
+        frame = scope
+        depth = self.depth
+        while depth > 0:
+            frame = frame.parent
+            depth -= 1
+
+        value = frame.slots[self.slot]
+        if value is None:
+            if self.fallback is not None:
+                return self.fallback.eval(scope)
+            raise KeyError(self.identif)
+        return value
         
 class Let(Term):
+    __slots__ = ('identif', 'expr', 'next')
+
     def __init__(self, identif, expr, next):
         self.identif = identif
         self.expr = expr
         self.next = next
 
     def eval(self, scope = None):
-        cloj = scope or dict()
-        cloj[self.identif] = self.expr.eval(scope)
+        if scope is None:
+            scope = Scope()
 
-        return self.next.eval(cloj)
+        scope.define(self.identif, self.expr.eval(scope))
+        return self.next.eval(scope)
 
     def to_json(self):
         return {'let': {'id': self.identif, 'exp': self.expr.to_json() , 'nxt': self.next.to_json() }}
 
+class SlotLet(Let):
+    __slots__ = ('slot',)
+
+    def __init__(self, identif, expr, next, slot):
+        Let.__init__(self, identif, expr, next)
+        self.slot = slot
+
+    def eval(self, scope = None):
+        # Along let chains iteratively, as they can be as long as the program
+        term = self
+        while isinstance(term, SlotLet):
+            scope.slots[term.slot] = term.expr.eval(scope)
+            term = term.next
+        return term.eval(scope)
+
+## Resolved programs
+
+class Program(Term):
+    __slots__ = ('body', 'size')
+
+    def __init__(self, body, size):
+        self.body = body
+        self.size = size
+
+    def eval(self, scope = None):
+        return self.body.eval(Frame([None] * self.size, scope))
+
+    def to_json(self):
+        return self.body.to_json()
+
 ## Flow control
 
 class If(Term):
+    __slots__ = ('condition', 'then', 'otherwise')
+
     def __init__(self, condition, then, otherwise):
         self.condition = condition
         self.then = then
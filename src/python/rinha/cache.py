@@ -0,0 +1,98 @@
+"""
+    Content-addressed on-disk cache of parsed programs.
+
+    Entries are rinha.serialize images named after a hash of the source,
+    the parser that built them, the grammar version and the image format
+    version, so changing any of them simply stops old entries from matching. Entries are validated when
+    they are loaded and dropped if broken. Once the directory grows past
+    its byte budget, the least recently used entries are evicted.
+"""
+
+import os
+import hashlib
+import tempfile
+
+from rinha import serialize
+from rinha.grammar import VERSION as GRAMMAR_VERSION
+
+SUFFIX = '.rinhac'
+
+class ParseCache(object):
+    def __init__(self, directory, max_bytes = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, source, parser = 'pratt'):
+        digest = hashlib.sha256()
+        digest.update(('rinha:%s:%d:%d:' % (parser, GRAMMAR_VERSION, serialize.VERSION)).encode('ascii'))
+        digest.update(serialize.encode(source))
+        return digest.hexdigest()
+
+    def path(self, source, parser = 'pratt'):
+        return os.path.join(self.directory, self.key(source, parser) + SUFFIX)
+
+    def get(self, source, parser = 'pratt'):
+        path = self.path(source, parser)
+        try:
+            tree = serialize.load(path)
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        except ValueError:
+            self.misses += 1
+            self.discard(path)
+            return None
+
+        self.hits += 1
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return tree
+
+    def put(self, source, tree, parser = 'pratt'):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            serialize.dump(tree, f)
+        os.rename(tmp, self.path(source, parser))
+        self.evict()
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            self.evictions += 1
+            total -= size
+
+    def report(self):
+        return 'cache: %d hits, %d misses, %d evictions' % (
+            self.hits, self.misses, self.evictions
+        )
@@ -0,0 +1,245 @@
+"""
+    Lowers resolved rinha programs (see rinha.resolver) into bytecode for
+    rinha.vm.
+
+    Each function body and the program top level become a Code object: an
+    array('i') of opcodes and their operands plus a constant pool. Nested
+    functions live in a separate pool of the code that creates them.
+
+    RPython has no array module, so the translated build keeps the finished
+    instruction stream as a plain list of ints instead.
+"""
+
+from array import array
+
+from rinha import ast
+from rinha.jit import we_are_translated
+
+## Opcodes
+
+CONST           = 0     # CONST k           push consts[k]
+LOAD_LOCAL      = 1     # LOAD_LOCAL s      push frame.slots[s]
+LOAD_OUTER      = 2     # LOAD_OUTER d s    push slot s of the frame d levels up
+LOOKUP          = 3     # LOOKUP k          unbound name consts[k], raises
+STORE           = 4     # STORE s           pop into frame.slots[s]
+BINARY          = 5     # BINARY i          pop rhs, lhs and push OPERATORS[i]
+JUMP            = 6     # JUMP t
+JUMP_IF_FALSE   = 7     # JUMP_IF_FALSE t   pop and jump unless truthy
+FUNCTION        = 8     # FUNCTION k        push a closure over functions[k]
+CALL            = 9     # CALL n            pop n args and the callee, call it
+RETURN          = 10
+PRINT           = 11
+FIRST           = 12
+SECOND          = 13
+TAIL_CALL       = 14    # TAIL_CALL n       like CALL, but replaces the frame
+TUPLE           = 15    # TUPLE             pop right, left and push a tuple
+AND_JUMP        = 16    # AND_JUMP t        jump to t if the top is false, keeping it
+OR_JUMP         = 17    # OR_JUMP t         jump to t if the top is true, keeping it
+LOAD_BOUND      = 18    # LOAD_BOUND d s t  like LOAD_OUTER, then jump to t; falls through if unbound
+CALLABLE        = 19    # CALLABLE n        check the top is a closure taking n args
+
+NAMES = [
+    'CONST', 'LOAD_LOCAL', 'LOAD_OUTER', 'LOOKUP', 'STORE', 'BINARY', 'JUMP',
+    'JUMP_IF_FALSE', 'FUNCTION', 'CALL', 'RETURN', 'PRINT', 'FIRST', 'SECOND',
+    'TAIL_CALL', 'TUPLE', 'AND_JUMP', 'OR_JUMP', 'LOAD_BOUND', 'CALLABLE',
+]
+
+ARITY = [1, 1, 2, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 0, 1, 1, 3, 1]
+
+## Binary operators, computed by the same code as the tree walker
+
+OPERATORS = [
+    ast.Add(None, None),
+    ast.Sub(None, None),
+    ast.Mul(None, None),
+    ast.Div(None, None),
+    ast.Rem(None, None),
+    ast.Eq(None, None),
+    ast.Neq(None, None),
+    ast.Lt(None, None),
+    ast.Gt(None, None),
+    ast.Lte(None, None),
+    ast.Gte(None, None),
+    ast.And(None, None),
+    ast.Or(None, None),
+]
+
+def operator_index(term):
+    for i, op in enumerate(OPERATORS):
+        if type(op) is type(term):
+            return i
+    raise NotImplementedError(type(term).__name__)
+
+## Code objects
+
+class Code(object):
+    # names maps the pc of each slot load to the name it reads, for errors
+    __slots__ = ('name', 'nparams', 'size', 'function', 'instrs', 'consts', 'functions', 'names')
+    _immutable_fields_ = [
+        'name', 'nparams', 'size', 'function', 'instrs[*]', 'consts[*]', 'functions[*]', 'names'
+    ]
+
+    def __init__(self, name, nparams, size, function, instrs, consts, functions, names):
+        self.name = name
+        self.nparams = nparams
+        self.size = size
+        self.function = function
+        self.instrs = instrs
+        self.consts = consts
+        self.functions = functions
+        self.names = names
+
+    def disassemble(self):
+        lines = []
+        pc = 0
+        while pc < len(self.instrs):
+            op = self.instrs[pc]
+            args = self.instrs[pc + 1:pc + 1 + ARITY[op]]
+            lines.append('%4d %-14s %s' % (pc, NAMES[op], ' '.join(str(a) for a in args)))
+            pc += 1 + ARITY[op]
+        return '\n'.join(lines)
+
+## Compiler
+
+class Compiler(object):
+    def __init__(self):
+        self.instrs = []
+        self.consts = []
+        self.functions = []
+        self.names = {}
+
+    def const(self, value):
+        self.consts.append(value)
+        return len(self.consts) - 1
+
+    def function(self, code):
+        self.functions.append(code)
+        return len(self.functions) - 1
+
+    def emit(self, op, *args):
+        self.instrs.append(op)
+        for arg in args:
+            self.instrs.append(arg)
+        return len(self.instrs) - 1
+
+    def load(self, term, op, *args):
+        self.names[self.label()] = term.identif
+        return self.emit(op, *args)
+
+    def label(self):
+        return len(self.instrs)
+
+    def patch(self, at, target):
+        self.instrs[at] = target
+
+    def finish(self, name, nparams, size, function = None):
+        self.emit(RETURN)
+        instrs = self.instrs
+        if not we_are_translated():
+            instrs = array('i', instrs)
+        return Code(name, nparams, size, function, instrs, self.consts, self.functions, self.names)
+
+    def compile(self, term):
+        if isinstance(term, ast.Value):
+            self.emit(CONST, self.const(term))
+
+        elif isinstance(term, ast.SlotReference) and term.fallback is not None:
+            # Each slot that may be unbound falls through to the next one out
+            ends = []
+            while term.fallback is not None:
+                ends.append(self.load(term, LOAD_BOUND, term.depth, term.slot, 0))
+                term = term.fallback
+            self.compile(term)
+            for end in ends:
+                self.patch(end, self.label())
+
+        elif isinstance(term, ast.SlotReference):
+            if term.depth == 0:
+                self.load(term, LOAD_LOCAL, term.slot)
+            else:
+                self.load(term, LOAD_OUTER, term.depth, term.slot)
+
+        elif isinstance(term, ast.Reference):
+            self.emit(LOOKUP, self.const(ast.Str(term.identif)))
+
+        elif isinstance(term, ast.SlotLet):
+            # Along let chains iteratively, as they can be as long as the program
+            while isinstance(term, ast.SlotLet):
+                if isinstance(term.expr, ast.SlotFunction):
+                    self.emit(FUNCTION, self.function(compile_function(term.expr, term.identif)))
+                else:
+                    self.compile(term.expr)
+                self.emit(STORE, term.slot)
+                term = term.next
+            self.compile(term)
+
+        elif isinstance(term, ast.SlotFunction):
+            self.emit(FUNCTION, self.function(compile_function(term)))
+
+        elif isinstance(term, ast.Call):
+            # The callee is checked before any argument runs, as in Call.eval
+            self.compile(term.callee)
+            self.emit(CALLABLE, len(term.args.exprs))
+            for expr in term.args.exprs:
+                self.compile(expr)
+            if isinstance(term, ast.TailCall):
+                self.emit(TAIL_CALL, len(term.args.exprs))
+            else:
+                self.emit(CALL, len(term.args.exprs))
+
+        elif isinstance(term, ast.And) or isinstance(term, ast.Or):
+            # Only a Bool on the left decides; anything else is combined with
+            # the right side by BINARY as usual
+            self.compile(term.left)
+            end = self.emit(AND_JUMP if isinstance(term, ast.And) else OR_JUMP, 0)
+            self.compile(term.right)
+            self.emit(BINARY, operator_index(term))
+            self.patch(end, self.label())
+
+        elif isinstance(term, ast.Binary):
+            self.compile(term.left)
+            self.compile(term.right)
+            self.emit(BINARY, operator_index(term))
+
+        elif isinstance(term, ast.If):
+            self.compile(term.condition)
+            otherwise = self.emit(JUMP_IF_FALSE, 0)
+            self.compile(term.then)
+            end = self.emit(JUMP, 0)
+            self.patch(otherwise, self.label())
+            self.compile(term.otherwise)
+            self.patch(end, self.label())
+
+        elif isinstance(term, ast.Pair):
+            self.compile(term.left)
+            self.compile(term.right)
+            self.emit(TUPLE)
+
+        elif isinstance(term, ast.Print):
+            self.compile(term.expr)
+            self.emit(PRINT)
+
+        elif isinstance(term, ast.First):
+            self.compile(term.ref)
+            self.emit(FIRST)
+
+        elif isinstance(term, ast.Second):
+            self.compile(term.ref)
+            self.emit(SECOND)
+
+        else:
+            raise NotImplementedError(type(term).__name__)
+
+def compile_function(fn, name = '<fn>'):
+    assert isinstance(fn, ast.SlotFunction)
+    if fn.code is None:
+        compiler = Compiler()
+        compiler.compile(fn.body)
+        fn.code = compiler.finish(name, len(fn.params.ids), fn.size, fn)
+    return fn.code
+
+def compile(program):
+    assert isinstance(program, ast.Program)
+    compiler = Compiler()
+    compiler.compile(program.body)
+    return compiler.finish('<main>', 0, program.size)
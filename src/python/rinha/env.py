@@ -0,0 +1,49 @@
+## Environments
+
+class Scope(object):
+    """
+        A frame of bindings linked to the scope it was created in.
+
+        Calls push a new frame holding only the parameters, so a call costs
+        O(arity) instead of a copy of every binding visible to the caller.
+        The frame's parent is the scope the function was defined in, so
+        names are looked up lexically: a function no longer sees the
+        bindings of whoever calls it, as it did when calls copied them.
+    """
+
+    __slots__ = ('bindings', 'parent')
+
+    def __init__(self, bindings = None, parent = None):
+        self.bindings = bindings if bindings is not None else {}
+        self.parent = parent
+
+    def lookup(self, identif):
+        scope = self
+        while scope is not None:
+            value = scope.bindings.get(identif, None)
+            if value is not None:
+                return value
+            scope = scope.parent
+
+        raise KeyError(identif)
+
+    def define(self, identif, value):
+        self.bindings[identif] = value
+
+class Frame(object):
+    """
+        An array-backed frame for programs compiled by rinha.resolver.
+
+        References are resolved to (depth, slot) pairs ahead of time, so there
+        are no names left to look up at run time.
+    """
+
+    __slots__ = ('slots', 'parent')
+    _immutable_fields_ = ['parent']
+
+    def __init__(self, slots, parent = None):
+        self.slots = slots
+        self.parent = parent
+
+    def lookup(self, identif):
+        raise KeyError(identif)
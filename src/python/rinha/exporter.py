@@ -0,0 +1,140 @@
+"""
+    Exporter to the official rinha JSON AST (the `kind`/`location` schema
+    rinha.loader reads), for parsed trees.
+
+    Locations come from the rinha.locations table the tree was parsed with;
+    nodes missing from it get an empty span. Names of lets and parameters
+    are not nodes, so they are given the span of the let or function they
+    belong to. Objects are built children first from an explicit stack, and
+    dumps writes the JSON text from another one rather than with json.dumps,
+    which recurses per level of nesting, so exporting spends no Python
+    recursion on deep trees.
+"""
+
+import json
+
+from rinha import ast
+from rinha.optimizer import children
+
+KINDS = {
+    ast.Add: 'Add',
+    ast.Sub: 'Sub',
+    ast.Mul: 'Mul',
+    ast.Div: 'Div',
+    ast.Rem: 'Rem',
+    ast.Eq: 'Eq',
+    ast.Neq: 'Neq',
+    ast.Lt: 'Lt',
+    ast.Gt: 'Gt',
+    ast.Lte: 'Lte',
+    ast.Gte: 'Gte',
+    ast.And: 'And',
+    ast.Or: 'Or',
+}
+
+class Exporter(object):
+    def __init__(self, locations = None, filename = '<source>'):
+        self.locations = locations
+        self.filename = filename
+
+    def location(self, term):
+        span = self.locations.span(term) if self.locations is not None else None
+        start, end = span if span is not None else (0, 0)
+        return {'start': start, 'end': end, 'filename': self.filename}
+
+    def name(self, text, term):
+        return {'text': text, 'location': self.location(term)}
+
+    def node(self, term, objs):
+        # objs are the exported children of term, in optimizer.children order
+        if isinstance(term, ast.Reference):
+            obj = {'kind': 'Var', 'text': term.identif}
+        elif isinstance(term, ast.Int) or isinstance(term, ast.BigInt):
+            obj = {'kind': 'Int', 'value': int(term.to_str())}
+        elif isinstance(term, ast.Str):
+            obj = {'kind': 'Str', 'value': term.value}
+        elif isinstance(term, ast.Bool):
+            obj = {'kind': 'Bool', 'value': term.value}
+        elif isinstance(term, ast.Binary):
+            obj = {'kind': 'Binary', 'op': KINDS[type(term)], 'lhs': objs[0], 'rhs': objs[1]}
+        elif isinstance(term, ast.Pair):
+            obj = {'kind': 'Tuple', 'first': objs[0], 'second': objs[1]}
+        elif isinstance(term, ast.First):
+            obj = {'kind': 'First', 'value': objs[0]}
+        elif isinstance(term, ast.Second):
+            obj = {'kind': 'Second', 'value': objs[0]}
+        elif isinstance(term, ast.Print):
+            obj = {'kind': 'Print', 'value': objs[0]}
+        elif isinstance(term, ast.Function):
+            params = [self.name(identif, term) for identif in term.params.ids]
+            obj = {'kind': 'Function', 'parameters': params, 'value': objs[0]}
+        elif isinstance(term, ast.Call):
+            obj = {'kind': 'Call', 'callee': objs[0], 'arguments': objs[1:]}
+        elif isinstance(term, ast.Let):
+            obj = {'kind': 'Let', 'name': self.name(term.identif, term), 'value': objs[0], 'next': objs[1]}
+        elif isinstance(term, ast.If):
+            obj = {'kind': 'If', 'condition': objs[0], 'then': objs[1], 'otherwise': objs[2]}
+        else:
+            raise ValueError('Cannot export %s' % type(term).__name__)
+
+        obj['location'] = self.location(term)
+        return obj
+
+    def export(self, term):
+        done = []
+        stack = [(term, False)]
+        while stack:
+            term, visited = stack.pop()
+            if visited:
+                count = len(children(term))
+                objs = done[len(done) - count:]
+                del done[len(done) - count:]
+                done.append(self.node(term, objs))
+            else:
+                stack.append((term, True))
+                for child in reversed(children(term)):
+                    stack.append((child, False))
+
+        return {'name': self.filename, 'expression': done[0], 'location': done[0]['location']}
+
+def export(term, locations = None, filename = '<source>'):
+    return Exporter(locations, filename).export(term)
+
+def chunks(obj, indent = '  '):
+    # Yields the text of obj indented like json.dumps(obj, indent=2); the
+    # stack holds pending text and (value, depth) pairs still to be written
+    stack = [(obj, 0)]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, tuple):
+            yield item
+            continue
+
+        value, depth = item
+        if isinstance(value, dict) and value:
+            opening, closing = '{', '}'
+            entries = [(json.dumps(key) + ': ', value[key]) for key in value]
+        elif isinstance(value, list) and value:
+            opening, closing = '[', ']'
+            entries = [('', element) for element in value]
+        else:
+            yield json.dumps(value)
+            continue
+
+        pending = []
+        separator = '\n' + indent * (depth + 1)
+        for prefix, element in entries:
+            pending.append(separator + prefix)
+            pending.append((element, depth + 1))
+            separator = ',\n' + indent * (depth + 1)
+        pending.append('\n' + indent * depth + closing)
+
+        yield opening
+        stack.extend(reversed(pending))
+
+def dumps(term, locations = None, filename = '<source>'):
+    return ''.join(chunks(export(term, locations, filename)))
+
+def dump(term, f, locations = None, filename = '<source>'):
+    for chunk in chunks(export(term, locations, filename)):
+        f.write(chunk)
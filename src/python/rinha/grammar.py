@@ -1,8 +1,17 @@
+import hashlib
+
 from rply import ParserGenerator
+from rply.grammar import Grammar
+from rply.parser import LRParser
+from rply.parsergenerator import LRTable
 
 from rinha.lexical import lexicon
 from rinha import ast
 
+# Bump whenever a production changes the trees it builds, so that parse
+# caches keyed on it (see rinha.cache) stop matching
+VERSION = 3
+
 pg = ParserGenerator(
     tokens = lexicon,
     cache_id='rinha'
@@ -22,7 +31,7 @@ def term_semi(tokens):
 
 @pg.production('term : DIGITS')
 def term_digits(tokens):
-    return ast.Int(int(tokens[0].getstr()))
+    return ast.int_literal(tokens[0].getstr())
 
 @pg.production('term : STRING')
 def term_string(tokens):
@@ -52,7 +61,7 @@ def identif_token(tokens):
 @pg.production('term : OPEN_PARENS term COMMA term CLOSE_PARENS')
 def term_tuple(tokens):
     _, left, _, right, _ = tokens
-    return ast.Tuple(left, right)
+    return ast.Pair(left, right)
 
 ## TODO JOIN WITH FUNCTION
 @pg.production('term : FIRST OPEN_PARENS term CLOSE_PARENS')
@@ -215,4 +224,98 @@ def error_handler(token):
         )
     )
 
-parser = pg.build()
+## Source locations
+#
+# Productions only get the symbols they reduce, so the table parse() fills
+# is reached through `recorder`. Every production that builds a node spans
+# it from its first symbol to its last. The ones passing a node through, like
+# parentheses and braces, keep the location it already has, but remember how
+# far the symbol they reduced to reaches for the productions around it, so
+# spans end on the same token as pratt's do.
+
+class Recorder(object):
+    def __init__(self):
+        self.locations = None
+        self.extents = {}
+
+    def edge(self, item):
+        extent = self.extents.get(id(item), None)
+        if extent is not None:
+            return extent
+        return self.locations.edge(item)
+
+    def reduced(self, node, tokens):
+        head, tail = self.edge(tokens[0]), self.edge(tokens[-1])
+        if head is None or tail is None:
+            return
+        for token in tokens:
+            if token is node:
+                self.extents[id(node)] = (head[0], tail[1], head[2])
+                return
+        self.locations.add(node, head[0], tail[1], head[2])
+
+recorder = Recorder()
+
+def located(func):
+    def production(tokens):
+        node = func(tokens)
+        if recorder.locations is not None and tokens and isinstance(node, ast.Term):
+            recorder.reduced(node, tokens)
+        return node
+    return production
+
+pg.productions = [
+    (name, syms, located(func), precedence) for name, syms, func, precedence in pg.productions
+]
+
+## Tables
+#
+# Building the LALR tables is the expensive part of pg.build(), so they are
+# generated ahead of time into rinha/parsetab.py (python -m rinha.tables).
+# Those are only used while they match the productions above: any change to
+# the grammar falls back to building them at import until regenerated.
+
+def grammar():
+    g = Grammar(pg.tokens)
+    for level, (assoc, terms) in enumerate(pg.precedence, 1):
+        for term in terms:
+            g.set_precedence(term, assoc, level)
+    for name, syms, func, precedence in pg.productions:
+        g.add_production(name, syms, func, precedence)
+    g.set_start()
+    return g
+
+def signature(g):
+    digest = hashlib.sha1()
+    for term in sorted(g.terminals):
+        digest.update(('%s\n' % term).encode('ascii'))
+    for p in g.productions:
+        assoc, level = p.prec
+        line = '%s : %s ; %s %d\n' % (p.name, ' '.join(p.prod), assoc, level)
+        digest.update(line.encode('ascii'))
+    return digest.hexdigest()
+
+def build():
+    try:
+        from rinha import parsetab
+    except ImportError:
+        parsetab = None
+
+    g = grammar()
+    if parsetab is None or parsetab.SIGNATURE != signature(g):
+        return pg.build()
+
+    table = LRTable(
+        g, parsetab.LR_ACTION, parsetab.LR_GOTO, parsetab.DEFAULT_REDUCTIONS, [], []
+    )
+    return LRParser(table, pg.error_handler)
+
+parser = build()
+
+def parse(tokens, locations = None):
+    recorder.locations = locations
+    try:
+        return parser.parse(tokens)
+    finally:
+        recorder.locations = None
+        recorder.extents = {}
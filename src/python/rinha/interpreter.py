@@ -1,7 +1,68 @@
+from rinha import grammar, pratt
 from rinha.lexical import lexer
-from rinha.grammar import parser
+from rinha.resolver import resolve
+from rinha.compiler import compile
+from rinha.vm import run
+from rinha.memo import memoize
+from rinha.optimizer import optimize as optimize_tree
+from rinha.specialize import specialize
+from rinha.profiler import profile
+from rinha.serialize import decode
+from rinha.output import output
 
-def interpret(source):
-    stream = lexer.lex(source)
-    ast = parser.parse(stream)
-    return ast.eval()
\ No newline at end of file
+BACKENDS = ['tree', 'vm', 'specialize']
+PARSERS = ['pratt', 'rply']
+
+def parse(source, cache = None, parser = 'pratt', locations = None):
+    # source is a string, or a file object or mmap that is lexed as it is read
+    if cache is not None and not isinstance(source, str):
+        source = decode(source.read())  # cache keys hash the whole source
+
+    if cache is not None:
+        ast = cache.get(source, parser)
+        if ast is not None:
+            return ast
+
+    if isinstance(source, str):
+        stream = lexer.lex(source)
+    else:
+        stream = lexer.lex_file(source)
+    if parser == 'pratt':
+        ast = pratt.parser.parse(stream, locations)
+    elif parser == 'rply':
+        ast = grammar.parse(stream, locations)
+    else:
+        raise ValueError('Unknown parser: %s' % parser)
+
+    if cache is not None:
+        cache.put(source, ast, parser)
+    return ast
+
+def execute(ast, backend = 'tree', memo = None, optimize = False, profiler = None, locations = None):
+    if optimize:
+        ast = optimize_tree(ast)
+
+    program = resolve(ast, locations)
+
+    if memo is not None:
+        program = memoize(program, memo, locations)
+
+    if profiler is not None:
+        if backend != 'tree':
+            raise ValueError('Profiling needs the tree backend, not %s' % backend)
+        program = profile(program, profiler, locations)
+
+    try:
+        if backend == 'vm':
+            return run(compile(program))
+        elif backend == 'tree':
+            return program.eval()
+        elif backend == 'specialize':
+            return specialize(program).eval()
+        else:
+            raise ValueError('Unknown backend: %s' % backend)
+    finally:
+        output.flush()
+
+def interpret(source, backend = 'tree', memo = None, cache = None, parser = 'pratt', optimize = False):
+    return execute(parse(source, cache, parser), backend, memo, optimize)
@@ -0,0 +1,41 @@
+"""
+    RPython JIT hints, with no-op stand-ins when running on a plain Python
+    host (pytest, pypy entrypoint.py) where the rpython toolchain is absent.
+
+    The hints are placed, but `make rinha` has not been shown to translate
+    the vm path, and it would not annotate as it is:
+
+        vm.run          boxes OPERATORS[i].compute(), which returns host
+                        ints, bools, Strs or Values alike
+        memo.LRUCache   is an OrderedDict
+        output.Output   writes a bytearray, by default to sys.stdout.buffer
+
+    Each needs an RPython-friendly version before translation can succeed.
+"""
+
+try:
+    from rpython.rlib.jit import JitDriver, promote, elidable
+    from rpython.rlib.objectmodel import we_are_translated
+    TRANSLATABLE = True
+except ImportError:
+    TRANSLATABLE = False
+
+    class JitDriver(object):
+        def __init__(self, **kwargs):
+            self.greens = kwargs.get('greens', [])
+            self.reds = kwargs.get('reds', [])
+
+        def jit_merge_point(self, **live):
+            pass
+
+        def can_enter_jit(self, **live):
+            pass
+
+    def promote(value):
+        return value
+
+    def elidable(fn):
+        return fn
+
+    def we_are_translated():
+        return False
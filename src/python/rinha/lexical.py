@@ -1,15 +1,27 @@
-import re
-from rply import LexerGenerator
+"""
+    Single-pass scanner for rinha sources.
 
-__ignore = [
-    r'\s+',                     # empty space
-    r'[\n\r]+',                 # line break
-    r'//.*[\n\r]+',             # single-line // comments
-]
+    Every character is dispatched on its class (space, digit, word, quote,
+    slash or symbol) instead of trying each rule in turn. Tokens keep only
+    offsets into the source and slice their text on demand, so punctuation
+    and keywords never copy anything.
 
-__ignore_with_flags = [
-    (r'/\*.*\*/', re.DOTALL)    # multiline /* comments */
-]
+    Token names are the ones in `lexicon`, which rinha.grammar uses as its
+    terminals. Keywords are whole words: `letter` is one IDENTIFIER.
+
+    File objects (anything with read(n), including mmap) are scanned a few
+    lines at a time: the buffer is refilled up to a line break, and no token
+    but a /* comment spans lines, so memory stays bounded by the chunk size
+    and the longest line or comment rather than by the whole source.
+"""
+
+from rply.errors import LexingError
+from rply.token import SourcePosition
+
+from rinha.ast import Box
+from rinha.serialize import decode
+
+CHUNK = 64 * 1024
 
 __lexicon_keywords = [
     ('TRUE'              , 'true'),
@@ -47,35 +59,263 @@ __lexicon_operators = [
     ('ASSIGN'           , '='),
 ]
 
-__lexicon_regex = [
-    ('STRING'           , r'"(\\\\|\\"|\\\w|[^"\\\n])*"'),
-    ('DIGITS'           , r'\d+'),
-    ('IDENTIFIER'       , r'[\w_$][\w\d_$]*'),
+__lexicon_literals = [
+    'STRING',                   # "..." with \\ \" and \<word char> escapes
+    'DIGITS',                   # [0-9]+
+    'IDENTIFIER',               # [\w$][\w$]*, unless it is a keyword
 ]
 
-__lexicon_operators = (
-    __lexicon_keywords + 
-    __lexicon_operators + 
-    __lexicon_regex
+lexicon = (
+    [k for (k, v) in __lexicon_keywords] +
+    [k for (k, v) in __lexicon_operators] +
+    __lexicon_literals
 )
 
-lexicon = [k for (k, v) in __lexicon_operators]
+KEYWORDS = dict((v, k) for (k, v) in __lexicon_keywords)
+KEYWORD_MAX = max(len(v) for (k, v) in __lexicon_keywords)
+
+# Single character operators, and the ones that may start a two character
+# operator mapped to the (second character, name) pairs they can start
+SINGLE = {}
+PAIRS = {}
+for name, text in __lexicon_operators:
+    if len(text) == 1:
+        SINGLE[text] = name
+    else:
+        PAIRS.setdefault(text[0], []).append((text[1], name))
+
+## Character classes
+
+OTHER, SPACE, NEWLINE, SLASH, QUOTE, SYMBOL, DIGIT, WORD = range(8)
+
+CLASSES = [OTHER] * 128
+for c in ' \t\r\f\v':
+    CLASSES[ord(c)] = SPACE
+CLASSES[ord('\n')] = NEWLINE
+for c in list(SINGLE) + list(PAIRS):
+    CLASSES[ord(c)] = SYMBOL
+CLASSES[ord('/')] = SLASH
+CLASSES[ord('"')] = QUOTE
+for c in '0123456789':
+    CLASSES[ord(c)] = DIGIT
+for c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$':
+    CLASSES[ord(c)] = WORD
+
+def char_class(c):
+    code = ord(c)
+    if code < 128:
+        return CLASSES[code]
+    elif c.isalnum():
+        return WORD
+    return OTHER
+
+def is_escape(c):
+    return c == '"' or c == '\\' or c == '_' or c.isalnum()
+
+## Tokens
+
+class Token(Box):
+    __slots__ = ('name', 'source', 'start', 'end', 'lineno', 'colno', 'base')
+
+    def __init__(self, name, source, start, end, lineno, colno, base = 0):
+        self.name = name
+        self.source = source
+        self.start = start
+        self.end = end
+        self.lineno = lineno
+        self.colno = colno
+        self.base = base
+
+    def gettokentype(self):
+        return self.name
+
+    def getstr(self):
+        return self.source[self.start:self.end]
+
+    value = property(getstr)
+
+    def getsourcepos(self):
+        return SourcePosition(self.base + self.start, self.lineno, self.colno)
+
+    def __repr__(self):
+        return 'Token(%r, %r)' % (self.name, self.getstr())
+
+## Scanner
+
+class Stream(object):
+    def __init__(self, source):
+        self.source = source
+        self.base = 0
+        self.pos = 0
+        self.lineno = 1
+        self.line_start = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next()
+
+    def error(self, message, at):
+        return LexingError(message, SourcePosition(self.base + at, self.lineno, at - self.line_start + 1))
+
+    def newlines(self, start, end):
+        count = self.source.count('\n', start, end)
+        if count > 0:
+            self.lineno += count
+            self.line_start = self.source.rfind('\n', start, end) + 1
+
+    def more(self, keep):
+        return False
+
+    def skip(self, i):
+        source = self.source
+        end = len(source)
+
+        while True:
+            if i >= end:
+                if not self.more(i):
+                    break
+                i, source, end = 0, self.source, len(self.source)
+                continue
+
+            cls = char_class(source[i])
+            if cls == SPACE:
+                i += 1
+            elif cls == NEWLINE:
+                i += 1
+                self.lineno += 1
+                self.line_start = i
+            elif cls == SLASH and i + 1 < end and source[i + 1] == '/':
+                i = source.find('\n', i + 2)
+                if i < 0:
+                    i = end
+            elif cls == SLASH and i + 1 < end and source[i + 1] == '*':
+                close = source.find('*/', i + 2)
+                if close < 0:
+                    if not self.more(i):
+                        raise self.error('unterminated comment', i)
+                    i, source, end = 0, self.source, len(self.source)
+                    continue
+                self.newlines(i, close)
+                i = close + 2
+            else:
+                break
+
+        return i
+
+    def string(self, i):
+        source = self.source
+        end = len(source)
+
+        i += 1
+        while i < end:
+            c = source[i]
+            if c == '"':
+                return i + 1
+            elif c == '\n':
+                break
+            elif c == '\\':
+                if i + 1 >= end or not is_escape(source[i + 1]):
+                    raise self.error('invalid escape', i)
+                i += 2
+            else:
+                i += 1
+
+        raise self.error('unterminated string', i)
+
+    def next(self):
+        start = self.skip(self.pos)
+        source = self.source
+        end = len(source)
+        if start >= end:
+            self.pos = start
+            raise StopIteration
+
+        c = source[start]
+        cls = char_class(c)
+        i = start + 1
+
+        if cls == WORD:
+            while i < end and char_class(source[i]) >= DIGIT:
+                i += 1
+            name = 'IDENTIFIER'
+            if i - start <= KEYWORD_MAX:
+                name = KEYWORDS.get(source[start:i], 'IDENTIFIER')
+
+        elif cls == DIGIT:
+            while i < end and char_class(source[i]) == DIGIT:
+                i += 1
+            name = 'DIGITS'
+
+        elif cls == QUOTE:
+            i = self.string(start)
+            name = 'STRING'
+
+        elif cls == SYMBOL or cls == SLASH:
+            name = None
+            if i < end:
+                for second, pair in PAIRS.get(c, []):
+                    if source[i] == second:
+                        name = pair
+                        i += 1
+                        break
+            if name is None:
+                name = SINGLE.get(c, None)
+            if name is None:
+                raise self.error('unexpected %r' % c, start)
+
+        else:
+            raise self.error('unexpected %r' % c, start)
+
+        self.pos = i
+        return Token(name, source, start, i, self.lineno, start - self.line_start + 1, self.base)
+
+def newline(raw):
+    return b'\n' if isinstance(raw, bytes) else u'\n'
+
+class FileStream(Stream):
+    def __init__(self, f, chunk = CHUNK):
+        Stream.__init__(self, '')
+        self.f = f
+        self.chunk = chunk
+        self.rest = None
 
-lg = LexerGenerator()
+    def more(self, keep):
+        # Drops the buffer before `keep` and appends input up to the next
+        # line break, so a token never straddles two buffers
+        pieces = []
+        if self.rest is not None:
+            pieces.append(self.rest)
+            self.rest = None
 
-for regex in __ignore:
-    lg.ignore(regex)
+        while True:
+            data = self.f.read(self.chunk)
+            if not data:
+                break
+            cut = data.rfind(newline(data))
+            if cut < 0:
+                pieces.append(data)
+                continue
+            pieces.append(data[:cut + 1])
+            if cut + 1 < len(data):
+                self.rest = data[cut + 1:]
+            break
 
-for regex, params in __ignore_with_flags:
-    lg.ignore(regex, params)
+        if not pieces:
+            return False
 
-for token, constant in __lexicon_keywords:
-    lg.add(token, re.escape(constant))
+        self.source = self.source[keep:] + decode(pieces[0][:0].join(pieces))
+        self.base += keep
+        self.pos -= keep
+        self.line_start -= keep
+        return True
 
-for token, constant in __lexicon_operators:
-    lg.add(token, re.escape(constant))
+class Lexer(object):
+    def lex(self, source):
+        return Stream(source)
 
-for token, regex in __lexicon_regex:
-    lg.add(token, regex)
+    def lex_file(self, f, chunk = CHUNK):
+        return FileStream(f, chunk)
 
-lexer = lg.build()
+lexer = Lexer()
@@ -0,0 +1,209 @@
+"""
+    Loader for the official rinha JSON AST (the `kind`/`location` schema of
+    the files in src/json), which skips lexing and parsing entirely.
+
+    The JSON is decoded here rather than by the json module, whose decoder
+    recurses once per level of nesting and wants the whole document: files
+    are read in chunks and scanned token by token, with the objects still
+    open kept on an explicit stack. Each node is built as its JSON object
+    is closed, bottom-up, so neither the text nor a dict tree of the whole
+    program is ever held, and let chains of any length load without
+    recursion.
+"""
+
+import re
+import json
+
+from rinha import ast
+
+BINARY = {
+    'Add': ast.Add,
+    'Sub': ast.Sub,
+    'Mul': ast.Mul,
+    'Div': ast.Div,
+    'Rem': ast.Rem,
+    'Eq': ast.Eq,
+    'Neq': ast.Neq,
+    'Lt': ast.Lt,
+    'Gt': ast.Gt,
+    'Lte': ast.Lte,
+    'Gte': ast.Gte,
+    'And': ast.And,
+    'Or': ast.Or,
+}
+
+def text(value):
+    # json decodes to unicode on Python 2, the rest of the tree uses str
+    return value if isinstance(value, str) else value.encode('utf-8')
+
+def params(ids):
+    params = ast.ParamList()
+    params.ids = list(ids)
+    return params
+
+def args(exprs):
+    args = ast.ArgList()
+    args.exprs = list(exprs)
+    return args
+
+def node(obj):
+    kind = obj.get('kind')
+
+    if kind == 'Var':
+        return ast.Reference(text(obj['text']))
+    elif kind == 'Int':
+        return ast.int_literal(str(obj['value']))
+    elif kind == 'Binary':
+        return BINARY[obj['op']](obj['lhs'], obj['rhs'])
+    elif kind == 'Call':
+        return ast.Call(obj['callee'], args(obj['arguments']))
+    elif kind == 'If':
+        return ast.If(obj['condition'], obj['then'], obj['otherwise'])
+    elif kind == 'Let':
+        return ast.Let(obj['name'], obj['value'], obj['next'])
+    elif kind == 'Function':
+        return ast.Function(params(obj['parameters']), obj['value'])
+    elif kind == 'Str':
+        return ast.Str(text(obj['value']))
+    elif kind == 'Bool':
+        return ast.Bool(obj['value'])
+    elif kind == 'Print':
+        return ast.Print(obj['value'])
+    elif kind == 'Tuple':
+        return ast.Pair(obj['first'], obj['second'])
+    elif kind == 'First':
+        return ast.First(obj['value'])
+    elif kind == 'Second':
+        return ast.Second(obj['value'])
+    elif kind is not None:
+        raise ValueError('Unknown node kind: %s' % kind)
+
+    # Parameters and let names are {text, location}, the file is
+    # {name, expression, location} and locations are left as they are
+    if 'text' in obj:
+        return text(obj['text'])
+    elif 'expression' in obj:
+        return obj['expression']
+    else:
+        return obj
+
+## Decoder
+
+CHUNK_SIZE = 64 * 1024
+
+PUNCTUATION, STRING, NUMBER, LITERAL = 1, 2, 3, 4
+
+TOKEN = re.compile(r'''\s*(?:
+    ([{}\[\]:,])
+  | ("(?:[^"\\]|\\.)*")
+  | (-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+  | (true|false|null)
+)''', re.VERBOSE | re.DOTALL)
+
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+def tokens(read, text = ''):
+    # (group, text) of each token; read is called for more text, if given
+    buffer, pos = text, 0
+    while True:
+        end = len(buffer)
+        for match in iter(TOKEN.scanner(buffer, pos).match, None):
+            # A token reaching the end of the buffer may go on in the next chunk
+            if match.end() == end and read is not None:
+                break
+            pos = match.end()
+            yield match.lastindex, match.group(match.lastindex)
+
+        chunk = read(CHUNK_SIZE) if read is not None else ''
+        if chunk:
+            if isinstance(chunk, bytes) and not isinstance(chunk, str):
+                chunk = chunk.decode('utf-8')
+            buffer, pos = buffer[pos:] + chunk, 0
+        elif read is not None:
+            read = None
+        else:
+            if buffer[pos:].strip():
+                raise ValueError('Invalid JSON near %r' % buffer[pos:pos + 20])
+            return
+
+def string(text):
+    if '\\' in text:
+        return json.loads(text)
+    return text[1:-1]
+
+def scalar(group, text):
+    if group == STRING:
+        return string(text)
+    elif group == NUMBER:
+        if '.' in text or 'e' in text or 'E' in text:
+            return float(text)
+        return int(text)
+    return LITERALS[text]
+
+# What the decoder expects next
+VALUE, KEY, COLON, AFTER = range(4)
+
+def decode(tokens, hook):
+    # Containers still open, as [container, key of the value being read]
+    stack = []
+    state = VALUE
+
+    for group, text in tokens:
+        if group == PUNCTUATION:
+            if text == ',':
+                if state != AFTER or not stack:
+                    raise ValueError('Unexpected ,')
+                state = KEY if isinstance(stack[-1][0], dict) else VALUE
+                continue
+            elif text == ':':
+                if state != COLON:
+                    raise ValueError('Unexpected :')
+                state = VALUE
+                continue
+            elif text == '{' or text == '[':
+                if state != VALUE:
+                    raise ValueError('Unexpected %s' % text)
+                stack.append([{} if text == '{' else [], None])
+                state = KEY if text == '{' else VALUE
+                continue
+
+            # } or ], after a value or in an empty container
+            if not stack or isinstance(stack[-1][0], dict) != (text == '}'):
+                raise ValueError('Unexpected %s' % text)
+            container, key = stack.pop()
+            if state != AFTER and (container or key is not None):
+                raise ValueError('Unexpected %s' % text)
+            value = hook(container) if text == '}' else container
+
+        elif state == KEY:
+            if group != STRING:
+                raise ValueError('Expected an object key')
+            stack[-1][1] = string(text)
+            state = COLON
+            continue
+        elif state != VALUE:
+            raise ValueError('Expected , between values')
+        else:
+            value = scalar(group, text)
+
+        if not stack:
+            if next(tokens, None) is not None:
+                raise ValueError('Extra data after JSON value')
+            return value
+        top = stack[-1]
+        if isinstance(top[0], dict):
+            top[0][top[1]] = value
+            top[1] = None
+        else:
+            top[0].append(value)
+        state = AFTER
+
+    raise ValueError('Unexpected end of JSON')
+
+def loads(source):
+    if isinstance(source, bytes) and not isinstance(source, str):
+        source = source.decode('utf-8')
+    return decode(tokens(None, source), node)
+
+def load(f):
+    return decode(tokens(f.read), node)
@@ -0,0 +1,91 @@
+"""
+    Source locations of parsed nodes, kept beside the tree.
+
+    Nodes carry no position: the parsers fill a Locations table instead,
+    when given one, so trees stay as small as they were and evaluating them
+    never touches it. Each located node gets an entry number; its source
+    span is packed as start << 32 | end into one array and the line it
+    starts on into another. Offsets are absolute character offsets into the
+    source, like the token positions they come from.
+
+    Entries are found by id(), so the table holds on to its nodes to keep
+    their ids from being reused. Passes that replace a node (the resolver,
+    memoization) move its entry to the replacement, so the running tree can
+    be looked up too. Trees from a parse cache or a JSON AST have no entries.
+"""
+
+from array import array
+
+SPAN_BITS = 32
+SPAN_MASK = (1 << SPAN_BITS) - 1
+
+def token_span(token):
+    pos = token.getsourcepos()
+    if pos is None:
+        return None
+    return pos.idx, pos.idx + len(token.getstr()), pos.lineno
+
+class Locations(object):
+    def __init__(self):
+        self.index = {}
+        self.nodes = []
+        self.spans = array('l')
+        self.lines = array('l')
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return id(node) in self.index
+
+    def add(self, node, start, end, line):
+        if id(node) in self.index:
+            return
+        self.index[id(node)] = len(self.nodes)
+        self.nodes.append(node)
+        self.spans.append(start << SPAN_BITS | end)
+        self.lines.append(line)
+
+    def edge(self, item):
+        # (start, end, line) of a token or a located node, else None
+        if hasattr(item, 'gettokentype'):
+            return token_span(item)
+        i = self.index.get(id(item), -1)
+        if i < 0:
+            return None
+        packed = self.spans[i]
+        return packed >> SPAN_BITS, packed & SPAN_MASK, self.lines[i]
+
+    def cover(self, node, first, last):
+        # Locates node from the start of first to the end of last, each a
+        # token or a node located already; nodes keep their first location
+        head, tail = self.edge(first), self.edge(last)
+        if head is not None and tail is not None:
+            self.add(node, head[0], tail[1], head[2])
+
+    def moved(self, old, new):
+        i = self.index.get(id(old), -1)
+        if i >= 0 and old is not new:
+            packed = self.spans[i]
+            self.add(new, packed >> SPAN_BITS, packed & SPAN_MASK, self.lines[i])
+
+    def span(self, node):
+        i = self.index.get(id(node), -1)
+        if i < 0:
+            return None
+        packed = self.spans[i]
+        return packed >> SPAN_BITS, packed & SPAN_MASK
+
+    def line(self, node):
+        i = self.index.get(id(node), -1)
+        return self.lines[i] if i >= 0 else 0
+
+    def failed(self, tb):
+        # The innermost located node whose eval a traceback went through
+        found = None
+        while tb is not None:
+            node = tb.tb_frame.f_locals.get('self', None)
+            if node is not None and id(node) in self.index:
+                found = node
+            tb = tb.tb_next
+        return found
@@ -0,0 +1,231 @@
+"""
+    Opt-in memoization of pure rinha functions.
+
+    A function is pure when its body cannot print, only calls functions that
+    are pure themselves and reads nothing from enclosing frames but pure
+    functions that are bound exactly once. Such functions are rewritten into
+    MemoFunction nodes that share one bounded LRU cache keyed on the function
+    and its argument values.
+
+    Functions that create closures or end in a tail call are left alone: the
+    first could hand out closures over a stale frame, the second would need
+    the host stack the tail call avoided.
+"""
+
+from collections import OrderedDict
+
+from rinha import ast
+
+
+class LRUCache(object):
+    def __init__(self, size = 4096):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.pop(key, None)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries[key] = value
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def report(self):
+        return 'memo: %d hits, %d misses, %d/%d entries' % (
+            self.hits, self.misses, len(self.entries), self.size
+        )
+
+## Cache keys
+
+def value_key(value):
+    if isinstance(value, ast.Int) or isinstance(value, ast.Str) or isinstance(value, ast.Bool):
+        return (value.__class__, value.value)
+    elif isinstance(value, ast.BigInt):
+        return (ast.BigInt, value.to_str())
+    elif isinstance(value, ast.Tuple):
+        left, right = value_key(value.left), value_key(value.right)
+        if left is None or right is None:
+            return None
+        return (ast.Tuple, left, right)
+    else:
+        return None
+
+def args_key(fn, args):
+    keys = [fn]
+    for arg in args:
+        key = value_key(arg)
+        if key is None:
+            return None
+        keys.append(key)
+    return tuple(keys)
+
+## Memoized functions
+
+class MemoFunction(ast.SlotFunction):
+    __slots__ = ('cache',)
+
+    def __init__(self, fn, cache):
+        ast.SlotFunction.__init__(self, fn.params, fn.body, fn.size)
+        self.cache = cache
+
+    def apply(self, scope):
+        key = args_key(self, scope.slots[:len(self.params.ids)])
+        if key is None:
+            return self.body.eval(scope)
+
+        result = self.cache.get(key)
+        if result is None:
+            result = self.body.eval(scope)
+            self.cache.put(key, result)
+        return result
+
+## Purity analysis
+
+class Purity(object):
+    def __init__(self):
+        self.functions = []
+        self.impure = set()
+        self.free = {}
+        self.assigned = {}
+        self.bound = {}
+
+    def binding(self, frames, ref):
+        return (frames[len(frames) - 1 - ref.depth], ref.slot)
+
+    def assign(self, key):
+        self.assigned[key] = self.assigned.get(key, 0) + 1
+
+    def walk(self, term, frames, fn):
+        if isinstance(term, ast.SlotLet):
+            # Along let chains iteratively, as they can be as long as the program
+            while isinstance(term, ast.SlotLet):
+                key = (frames[-1], term.slot)
+                self.assign(key)
+                if isinstance(term.expr, ast.SlotFunction):
+                    self.bound[key] = term.expr
+                self.walk(term.expr, frames, fn)
+                term = term.next
+            self.walk(term, frames, fn)
+
+        elif isinstance(term, ast.SlotFunction):
+            if fn is not None:
+                self.impure.add(fn)
+            self.functions.append(term)
+            self.free[term] = []
+            for slot in range(len(term.params.ids)):
+                self.assign((term, slot))
+            self.walk(term.body, frames + [term], term)
+
+        elif isinstance(term, ast.SlotReference):
+            if fn is not None and term.depth > 0:
+                self.free[fn].append(self.binding(frames, term))
+            if term.fallback is not None:
+                self.walk(term.fallback, frames, fn)
+
+        elif isinstance(term, ast.Call):
+            if fn is not None:
+                callee = term.callee
+                if isinstance(term, ast.TailCall):
+                    self.impure.add(fn)
+                elif not isinstance(callee, ast.SlotReference) or callee.depth == 0:
+                    self.impure.add(fn)
+            self.walk(term.callee, frames, fn)
+            for expr in term.args.exprs:
+                self.walk(expr, frames, fn)
+
+        elif isinstance(term, ast.Print):
+            if fn is not None:
+                self.impure.add(fn)
+            self.walk(term.expr, frames, fn)
+
+        elif isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+            self.walk(term.left, frames, fn)
+            self.walk(term.right, frames, fn)
+
+        elif isinstance(term, ast.If):
+            self.walk(term.condition, frames, fn)
+            self.walk(term.then, frames, fn)
+            self.walk(term.otherwise, frames, fn)
+
+        elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+            self.walk(term.ref, frames, fn)
+
+        elif isinstance(term, ast.Reference):
+            if fn is not None:
+                self.impure.add(fn)
+
+    def pure(self):
+        pure = set(fn for fn in self.functions if fn not in self.impure)
+
+        changed = True
+        while changed:
+            changed = False
+            for fn in list(pure):
+                for key in self.free[fn]:
+                    if self.assigned.get(key, 0) != 1 or self.bound.get(key) not in pure:
+                        pure.discard(fn)
+                        changed = True
+                        break
+
+        return pure
+
+def pure_functions(program):
+    assert isinstance(program, ast.Program)
+    purity = Purity()
+    purity.walk(program.body, [program], None)
+    return purity.pure()
+
+## Rewriting
+
+def rewrite(term, pure, cache, locations = None):
+    if isinstance(term, ast.SlotFunction):
+        term.body = rewrite(term.body, pure, cache, locations)
+        if term in pure:
+            memo = MemoFunction(term, cache)
+            if locations is not None:
+                locations.moved(term, memo)
+            return memo
+
+    elif isinstance(term, ast.Let):
+        head = term
+        while True:
+            term.expr = rewrite(term.expr, pure, cache, locations)
+            if not isinstance(term.next, ast.Let):
+                term.next = rewrite(term.next, pure, cache, locations)
+                return head
+            term = term.next
+
+    elif isinstance(term, ast.Call):
+        term.callee = rewrite(term.callee, pure, cache, locations)
+        term.args.exprs = [rewrite(e, pure, cache, locations) for e in term.args.exprs]
+
+    elif isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+        term.left = rewrite(term.left, pure, cache, locations)
+        term.right = rewrite(term.right, pure, cache, locations)
+
+    elif isinstance(term, ast.If):
+        term.condition = rewrite(term.condition, pure, cache, locations)
+        term.then = rewrite(term.then, pure, cache, locations)
+        term.otherwise = rewrite(term.otherwise, pure, cache, locations)
+
+    elif isinstance(term, ast.Print):
+        term.expr = rewrite(term.expr, pure, cache, locations)
+
+    elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+        term.ref = rewrite(term.ref, pure, cache, locations)
+
+    return term
+
+def memoize(program, cache, locations = None):
+    pure = pure_functions(program)
+    program.body = rewrite(program.body, pure, cache, locations)
+    return program
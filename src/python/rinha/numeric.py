@@ -0,0 +1,80 @@
+"""
+    Machine words and bigints behind rinha's Int and BigInt.
+
+    The translated build uses rarithmetic.ovfcheck and rlib.rbigint. On a
+    plain Python host ovfcheck raises OverflowError for results outside a
+    machine word, just like the translated build, so both take the same
+    paths; rbigint is a stand-in over host integers with the part of its API
+    used by rinha.ast.
+"""
+
+import sys
+
+try:
+    from rpython.rlib.rarithmetic import ovfcheck
+    from rpython.rlib.rbigint import rbigint
+except ImportError:
+    WORD_MIN = -sys.maxsize - 1
+    WORD_MAX = sys.maxsize
+
+    def ovfcheck(value):
+        if not WORD_MIN <= value <= WORD_MAX:
+            raise OverflowError('integer overflow')
+        return value
+
+    class rbigint(object):
+        __slots__ = ('num', 'sign')
+
+        def __init__(self, num):
+            self.num = num
+            self.sign = (num > 0) - (num < 0)
+
+        @staticmethod
+        def fromint(value):
+            return rbigint(value)
+
+        @staticmethod
+        def fromdecimalstr(text):
+            return rbigint(int(text))
+
+        def toint(self):
+            return int(ovfcheck(self.num))
+
+        def str(self):
+            return str(self.num)
+
+        def add(self, other):
+            return rbigint(self.num + other.num)
+
+        def sub(self, other):
+            return rbigint(self.num - other.num)
+
+        def mul(self, other):
+            return rbigint(self.num * other.num)
+
+        def floordiv(self, other):
+            return rbigint(self.num // other.num)
+
+        def mod(self, other):
+            return rbigint(self.num % other.num)
+
+        def eq(self, other):
+            return self.num == other.num
+
+        def lt(self, other):
+            return self.num < other.num
+
+def rem(a, b):
+    # Remainder truncated towards zero, like C and fmod, without going
+    # through floats: a floor remainder with the divisor's sign is moved to
+    # the dividend's
+    r = a % b
+    if r != 0 and (r < 0) != (a < 0):
+        r -= b
+    return r
+
+def big_rem(a, b):
+    r = a.mod(b)
+    if r.sign != 0 and r.sign != a.sign:
+        r = r.sub(b)
+    return r
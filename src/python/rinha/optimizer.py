@@ -0,0 +1,390 @@
+"""
+    Tree rewrites run on parsed programs before they are resolved.
+
+    Constant folding computes binary operators whose operands are literals
+    with the same compute() the evaluator uses, so results match exactly;
+    operations that would fail (e.g. division by zero, comparing a string
+    with a number) are left for the evaluator to report when reached. An
+    `if` on a literal condition becomes the branch it takes, and a tuple
+    of literals becomes a Tuple value. `&&` and `||` whose left side is a
+    boolean literal that decides them become that literal, since their right
+    side would never be evaluated.
+
+    `first` and `second` of a tuple expression become the element they pick
+    when the other one is a literal or a function, so dropping it can
+    neither skip a print nor an error.
+
+    Only literals are ever discarded, so every print still happens, and in
+    the same order.
+
+    Before folding, calls to small functions bound by `let` are replaced by
+    a copy of their body, with a `let` per argument. A function is inlined
+    only if it cannot reach itself in the call graph and every name it binds
+    or reads is bound once in the whole program, so the copy reads the same
+    bindings at the call site as the closure would. Names bound by the copy
+    are renamed apart, since they now live in the caller's frame.
+"""
+
+from rinha import ast
+
+
+def constant(term):
+    return isinstance(term, ast.Value)
+
+def discardable(term):
+    return isinstance(term, ast.Value) or isinstance(term, ast.Function)
+
+## Constant folding
+
+def fold_logic(term):
+    # The value of the left side that decides the operator on its own
+    decides = isinstance(term, ast.Or)
+    if isinstance(term.left, ast.Bool) and term.left.value == decides:
+        return ast.boxed(decides)
+    return term
+
+def fold_binary(term):
+    if isinstance(term, ast.And) or isinstance(term, ast.Or):
+        folded = fold_logic(term)
+        if folded is not term:
+            return folded
+    if not constant(term.left) or not constant(term.right):
+        return term
+    if isinstance(term.left, ast.Tuple) or isinstance(term.right, ast.Tuple):
+        return term
+
+    try:
+        return ast.boxed(term.compute(term.left, term.right))
+    except (ArithmeticError, TypeError, ValueError):
+        return term
+
+def fold_pair(term):
+    if constant(term.left) and constant(term.right):
+        return ast.Tuple(term.left, term.right)
+    return term
+
+def fold_first(term):
+    target = term.ref
+    if isinstance(target, ast.Tuple):
+        return target.left
+    if isinstance(target, ast.Pair) and discardable(target.right):
+        return target.left
+    return term
+
+def fold_second(term):
+    target = term.ref
+    if isinstance(target, ast.Tuple):
+        return target.right
+    if isinstance(target, ast.Pair) and discardable(target.left):
+        return target.right
+    return term
+
+## Dead branches
+
+def fold_if(term):
+    if constant(term.condition) and not isinstance(term.condition, ast.Tuple):
+        return term.then if term.condition.is_truthy() else term.otherwise
+    return term
+
+## Rewriting
+
+def fold(term):
+    if isinstance(term, ast.Let):
+        # Iterate along let chains, which can be as long as the program
+        head = term
+        while True:
+            term.expr = fold(term.expr)
+            if not isinstance(term.next, ast.Let):
+                term.next = fold(term.next)
+                break
+            term = term.next
+        return head
+
+    elif isinstance(term, ast.Binary):
+        term.left = fold(term.left)
+        term.right = fold(term.right)
+        return fold_binary(term)
+
+    elif isinstance(term, ast.If):
+        term.condition = fold(term.condition)
+        term.then = fold(term.then)
+        term.otherwise = fold(term.otherwise)
+        return fold_if(term)
+
+    elif isinstance(term, ast.Pair):
+        term.left = fold(term.left)
+        term.right = fold(term.right)
+        return fold_pair(term)
+
+    elif isinstance(term, ast.First):
+        term.ref = fold(term.ref)
+        return fold_first(term)
+
+    elif isinstance(term, ast.Second):
+        term.ref = fold(term.ref)
+        return fold_second(term)
+
+    elif isinstance(term, ast.Function):
+        term.body = fold(term.body)
+
+    elif isinstance(term, ast.Call):
+        term.callee = fold(term.callee)
+        term.args.exprs = [fold(e) for e in term.args.exprs]
+
+    elif isinstance(term, ast.Print):
+        term.expr = fold(term.expr)
+
+    return term
+
+## Inlining
+
+INLINE_SIZE = 32
+INLINE_DEPTH = 4
+
+def children(term):
+    if isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+        return [term.left, term.right]
+    elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+        return [term.ref]
+    elif isinstance(term, ast.Print):
+        return [term.expr]
+    elif isinstance(term, ast.Function):
+        return [term.body]
+    elif isinstance(term, ast.Call):
+        return [term.callee] + term.args.exprs
+    elif isinstance(term, ast.Let):
+        return [term.expr, term.next]
+    elif isinstance(term, ast.If):
+        return [term.condition, term.then, term.otherwise]
+    return []
+
+def size(term):
+    count = 0
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        count += 1
+        stack.extend(children(term))
+    return count
+
+def names(term):
+    # Names bound (parameters and lets) and read anywhere under term
+    bound, read = [], []
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, ast.Function):
+            bound.extend(term.params.ids)
+        elif isinstance(term, ast.Let):
+            bound.append(term.identif)
+        elif isinstance(term, ast.Reference):
+            read.append(term.identif)
+        stack.extend(children(term))
+    return bound, read
+
+def frame_names(fn):
+    # Parameters and the names bound by lets in the function's own frame
+    lets = []
+    stack = [fn.body]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, ast.Let):
+            lets.append(term.identif)
+        if not isinstance(term, ast.Function):
+            stack.extend(children(term))
+    return list(fn.params.ids), lets
+
+def functions_in(term):
+    # Outermost functions under term
+    found = []
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, ast.Function):
+            found.append(term)
+        else:
+            stack.extend(children(term))
+    return found
+
+class CallGraph(object):
+    def __init__(self, program):
+        self.bindings = {}
+        self.functions = {}
+        self.calls = {}
+
+        bound, _ = names(program)
+        for name in bound:
+            self.bindings[name] = self.bindings.get(name, 0) + 1
+
+        stack = [program]
+        while stack:
+            term = stack.pop()
+            if isinstance(term, ast.Let) and isinstance(term.expr, ast.Function):
+                self.functions[term.identif] = term.expr
+            stack.extend(children(term))
+
+        for name, fn in self.functions.items():
+            _, read = names(fn)
+            self.calls[name] = [n for n in read if n in self.functions]
+
+    def recursive(self, name):
+        seen = set()
+        stack = list(self.calls[name])
+        while stack:
+            callee = stack.pop()
+            if callee == name:
+                return True
+            if callee not in seen:
+                seen.add(callee)
+                stack.extend(self.calls[callee])
+        return False
+
+    def inlinable(self, name, fn):
+        if self.functions.get(name) is not fn or self.bindings[name] != 1:
+            return False
+        if self.recursive(name) or size(fn.body) > INLINE_SIZE:
+            return False
+
+        # The copy merges the function's frame into the caller's, so those
+        # names must not be shadowed inside it, and its other reads must find
+        # the same bindings from the call site as from the definition
+        params, lets = frame_names(fn)
+        frame = set(params + lets)
+        inside = {}
+        nested = set()
+        for term in functions_in(fn.body):
+            bound, _ = names(term)
+            for n in bound:
+                inside[n] = inside.get(n, 0) + 1
+                nested.add(n)
+        if frame & nested:
+            return False
+        for n in lets:
+            # Names made up by earlier inlining are bound exactly once
+            if self.bindings.get(n, 1) != 1:
+                return False
+
+        _, read = names(fn.body)
+        for n in read:
+            if n in frame:
+                continue
+            outside = self.bindings.get(n, 0) - inside.get(n, 0)
+            if outside > (0 if n in nested else 1):
+                return False
+        return True
+
+class Inliner(object):
+    def __init__(self, program):
+        self.graph = CallGraph(program)
+        self.counter = 0
+
+    def fresh(self, name):
+        self.counter += 1
+        return '%s#%d' % (name, self.counter)
+
+    def copy(self, term, renames):
+        if isinstance(term, ast.Value):
+            return term
+        elif isinstance(term, ast.Reference):
+            return ast.Reference(renames.get(term.identif, term.identif))
+        elif isinstance(term, ast.Let):
+            expr = self.copy(term.expr, renames)
+            return ast.Let(renames.get(term.identif, term.identif), expr, self.copy(term.next, renames))
+        elif isinstance(term, ast.Function):
+            params = ast.ParamList()
+            params.ids = list(term.params.ids)
+            return ast.Function(params, self.copy(term.body, renames))
+        elif isinstance(term, ast.Call):
+            args = ast.ArgList()
+            args.exprs = [self.copy(e, renames) for e in term.args.exprs]
+            return ast.Call(self.copy(term.callee, renames), args)
+        elif isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+            return type(term)(self.copy(term.left, renames), self.copy(term.right, renames))
+        elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+            return type(term)(self.copy(term.ref, renames))
+        elif isinstance(term, ast.Print):
+            return ast.Print(self.copy(term.expr, renames))
+        elif isinstance(term, ast.If):
+            return ast.If(
+                self.copy(term.condition, renames),
+                self.copy(term.then, renames),
+                self.copy(term.otherwise, renames),
+            )
+        raise NotImplementedError(type(term).__name__)
+
+    def expand(self, fn, args, inlinable):
+        # The function's frame becomes part of the caller's, so its
+        # parameters and the lets in its frame get fresh names. Arguments
+        # naming an inlinable function are substituted instead, so calls
+        # through them can be inlined in turn.
+        renames = {}
+        bindings = []
+        for param, arg in zip(fn.params.ids, args):
+            if isinstance(arg, ast.Reference) and arg.identif in inlinable:
+                renames[param] = arg.identif
+            else:
+                renames[param] = self.fresh(param)
+                bindings.append((renames[param], arg))
+
+        _, lets = frame_names(fn)
+        for name in lets:
+            renames[name] = self.fresh(name)
+
+        body = self.copy(fn.body, renames)
+        for name, arg in reversed(bindings):
+            body = ast.Let(name, arg, body)
+        return body
+
+    def inline(self, term, inlinable, depth = 0):
+        if isinstance(term, ast.Let):
+            # Along let chains iteratively, as they can be as long as the program
+            head = term
+            while True:
+                term.expr = self.inline(term.expr, inlinable, depth)
+                if isinstance(term.expr, ast.Function) and self.graph.inlinable(term.identif, term.expr):
+                    inlinable = dict(inlinable)
+                    inlinable[term.identif] = term.expr
+                if not isinstance(term.next, ast.Let):
+                    term.next = self.inline(term.next, inlinable, depth)
+                    return head
+                term = term.next
+
+        elif isinstance(term, ast.Call):
+            term.args.exprs = [self.inline(e, inlinable, depth) for e in term.args.exprs]
+            callee = term.callee
+            if isinstance(callee, ast.Reference) and callee.identif in inlinable:
+                fn = inlinable[callee.identif]
+                if len(fn.params.ids) == len(term.args.exprs):
+                    body = self.expand(fn, term.args.exprs, inlinable)
+                    # Calls through substituted arguments are only visible
+                    # now; the call graph cannot see them, so bound the depth
+                    if depth < INLINE_DEPTH:
+                        body = self.inline(body, inlinable, depth + 1)
+                    return body
+            term.callee = self.inline(callee, inlinable, depth)
+
+        elif isinstance(term, ast.Function):
+            term.body = self.inline(term.body, inlinable, depth)
+
+        elif isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+            term.left = self.inline(term.left, inlinable, depth)
+            term.right = self.inline(term.right, inlinable, depth)
+
+        elif isinstance(term, ast.If):
+            term.condition = self.inline(term.condition, inlinable, depth)
+            term.then = self.inline(term.then, inlinable, depth)
+            term.otherwise = self.inline(term.otherwise, inlinable, depth)
+
+        elif isinstance(term, ast.Print):
+            term.expr = self.inline(term.expr, inlinable, depth)
+
+        elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+            term.ref = self.inline(term.ref, inlinable, depth)
+
+        return term
+
+def inline(program):
+    return Inliner(program).inline(program, {})
+
+def optimize(term):
+    return fold(inline(term))
@@ -0,0 +1,203 @@
+# Generated by python -m rinha.tables from the productions in rinha.grammar.
+# Do not edit: regenerate it whenever the grammar changes.
+
+SIGNATURE = 'bed4c63e30175801b2c4dcab657d03ca0825f41b'
+
+LR_ACTION = [
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -4, 'AND': -4, 'CLOSE_BRACES': -4, 'CLOSE_PARENS': -4, 'COMMA': -4, 'EQ': -4, 'GT': -4, 'GTEQ': -4, 'LT': -4, 'LTEQ': -4, 'MINUS': -4, 'NEQ': -4, 'OR': -4, 'PERCENT': -4, 'PLUS': -4, 'SEMI_COLON': -4, 'SLASH': -4, 'STAR': -4},
+    {'$end': -13, 'AND': -13, 'CLOSE_BRACES': -13, 'CLOSE_PARENS': -13, 'COMMA': -13, 'EQ': -13, 'GT': -13, 'GTEQ': -13, 'LT': -13, 'LTEQ': -13, 'MINUS': -13, 'NEQ': -13, 'OR': -13, 'PERCENT': -13, 'PLUS': -13, 'SEMI_COLON': -13, 'SLASH': -13, 'STAR': -13},
+    {'OPEN_PARENS': 18},
+    {'IDENTIFIER': 19},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -9, 'AND': -9, 'CLOSE_BRACES': -9, 'CLOSE_PARENS': -9, 'COMMA': -9, 'EQ': -9, 'GT': -9, 'GTEQ': -9, 'LT': -9, 'LTEQ': -9, 'MINUS': -9, 'NEQ': -9, 'OPEN_PARENS': -9, 'OR': -9, 'PERCENT': -9, 'PLUS': -9, 'SEMI_COLON': -9, 'SLASH': -9, 'STAR': -9},
+    {'$end': 0, 'AND': 21, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -8, 'AND': -8, 'CLOSE_BRACES': -8, 'CLOSE_PARENS': -8, 'COMMA': -8, 'EQ': -8, 'GT': -8, 'GTEQ': -8, 'LT': -8, 'LTEQ': -8, 'MINUS': -8, 'NEQ': -8, 'OPEN_PARENS': 35, 'OR': -8, 'PERCENT': -8, 'PLUS': -8, 'SEMI_COLON': -8, 'SLASH': -8, 'STAR': -8},
+    {'OPEN_PARENS': 36},
+    {'$end': -3, 'AND': -3, 'CLOSE_BRACES': -3, 'CLOSE_PARENS': -3, 'COMMA': -3, 'EQ': -3, 'GT': -3, 'GTEQ': -3, 'LT': -3, 'LTEQ': -3, 'MINUS': -3, 'NEQ': -3, 'OR': -3, 'PERCENT': -3, 'PLUS': -3, 'SEMI_COLON': -3, 'SLASH': -3, 'STAR': -3},
+    {'OPEN_PARENS': 37},
+    {'$end': -7, 'AND': -7, 'CLOSE_BRACES': -7, 'CLOSE_PARENS': -7, 'COMMA': -7, 'EQ': -7, 'GT': -7, 'GTEQ': -7, 'LT': -7, 'LTEQ': -7, 'MINUS': -7, 'NEQ': -7, 'OR': -7, 'PERCENT': -7, 'PLUS': -7, 'SEMI_COLON': -7, 'SLASH': -7, 'STAR': -7},
+    {'OPEN_PARENS': 38},
+    {'OPEN_PARENS': 39},
+    {'$end': -5, 'AND': -5, 'CLOSE_BRACES': -5, 'CLOSE_PARENS': -5, 'COMMA': -5, 'EQ': -5, 'GT': -5, 'GTEQ': -5, 'LT': -5, 'LTEQ': -5, 'MINUS': -5, 'NEQ': -5, 'OR': -5, 'PERCENT': -5, 'PLUS': -5, 'SEMI_COLON': -5, 'SLASH': -5, 'STAR': -5},
+    {'$end': -31, 'AND': -31, 'CLOSE_BRACES': -31, 'CLOSE_PARENS': -31, 'COMMA': -31, 'EQ': -31, 'GT': -31, 'GTEQ': -31, 'LT': -31, 'LTEQ': -31, 'MINUS': -31, 'NEQ': -31, 'OR': -31, 'PERCENT': -31, 'PLUS': -31, 'SEMI_COLON': -31, 'SLASH': -31, 'STAR': -31},
+    {'$end': -6, 'AND': -6, 'CLOSE_BRACES': -6, 'CLOSE_PARENS': -6, 'COMMA': -6, 'EQ': -6, 'GT': -6, 'GTEQ': -6, 'LT': -6, 'LTEQ': -6, 'MINUS': -6, 'NEQ': -6, 'OR': -6, 'PERCENT': -6, 'PLUS': -6, 'SEMI_COLON': -6, 'SLASH': -6, 'STAR': -6},
+    {'CLOSE_PARENS': -28, 'COMMA': -28, 'IDENTIFIER': 41},
+    {'ASSIGN': 42},
+    {'AND': 21, 'CLOSE_PARENS': 43, 'COMMA': 44, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -2, 'AND': -2, 'CLOSE_BRACES': -2, 'CLOSE_PARENS': -2, 'COMMA': -2, 'EQ': -2, 'GT': -2, 'GTEQ': -2, 'LT': -2, 'LTEQ': -2, 'MINUS': -2, 'NEQ': -2, 'OR': -2, 'PERCENT': -2, 'PLUS': -2, 'SEMI_COLON': -2, 'SLASH': -2, 'STAR': -2},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'CLOSE_PARENS': -35, 'COMMA': -35, 'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'CLOSE_PARENS': 64, 'COMMA': 65},
+    {'CLOSE_PARENS': -29, 'COMMA': -29},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -1, 'AND': -1, 'CLOSE_BRACES': -1, 'CLOSE_PARENS': -1, 'COMMA': -1, 'EQ': -1, 'GT': -1, 'GTEQ': -1, 'LT': -1, 'LTEQ': -1, 'MINUS': -1, 'NEQ': -1, 'OR': -1, 'PERCENT': -1, 'PLUS': -1, 'SEMI_COLON': -1, 'SLASH': -1, 'STAR': -1},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -14, 'AND': 21, 'CLOSE_BRACES': -14, 'CLOSE_PARENS': -14, 'COMMA': -14, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -16, 'AND': 21, 'CLOSE_BRACES': -16, 'CLOSE_PARENS': -16, 'COMMA': -16, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -20, 'AND': 21, 'CLOSE_BRACES': -20, 'CLOSE_PARENS': -20, 'COMMA': -20, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -23, 'AND': 21, 'CLOSE_BRACES': -23, 'CLOSE_PARENS': -23, 'COMMA': -23, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -15, 'AND': 21, 'CLOSE_BRACES': -15, 'CLOSE_PARENS': -15, 'COMMA': -15, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -24, 'AND': 21, 'CLOSE_BRACES': -24, 'CLOSE_PARENS': -24, 'COMMA': -24, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -26, 'AND': 21, 'CLOSE_BRACES': -26, 'CLOSE_PARENS': -26, 'COMMA': -26, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -19, 'AND': 21, 'CLOSE_BRACES': -19, 'CLOSE_PARENS': -19, 'COMMA': -19, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -21, 'AND': 21, 'CLOSE_BRACES': -21, 'CLOSE_PARENS': -21, 'COMMA': -21, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -18, 'AND': 21, 'CLOSE_BRACES': -18, 'CLOSE_PARENS': -18, 'COMMA': -18, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -25, 'AND': 21, 'CLOSE_BRACES': -25, 'CLOSE_PARENS': -25, 'COMMA': -25, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -17, 'AND': 21, 'CLOSE_BRACES': -17, 'CLOSE_PARENS': -17, 'COMMA': -17, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -22, 'AND': 21, 'CLOSE_BRACES': -22, 'CLOSE_PARENS': -22, 'COMMA': -22, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_PARENS': -36, 'COMMA': -36, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'CLOSE_PARENS': 68, 'COMMA': 69},
+    {'AND': 21, 'CLOSE_PARENS': 70, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_PARENS': 71, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_PARENS': 72, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_PARENS': 73, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'FN_ARROW': 74},
+    {'CLOSE_PARENS': -28, 'COMMA': -28, 'IDENTIFIER': 41},
+    {'AND': 21, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 76, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_PARENS': 77, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -38, 'AND': -38, 'CLOSE_BRACES': -38, 'CLOSE_PARENS': -38, 'COMMA': -38, 'EQ': -38, 'GT': -38, 'GTEQ': -38, 'LT': -38, 'LTEQ': -38, 'MINUS': -38, 'NEQ': -38, 'OR': -38, 'PERCENT': -38, 'PLUS': -38, 'SEMI_COLON': -38, 'SLASH': -38, 'STAR': -38},
+    {'CLOSE_PARENS': -35, 'COMMA': -35, 'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -11, 'AND': -11, 'CLOSE_BRACES': -11, 'CLOSE_PARENS': -11, 'COMMA': -11, 'EQ': -11, 'GT': -11, 'GTEQ': -11, 'LT': -11, 'LTEQ': -11, 'MINUS': -11, 'NEQ': -11, 'OR': -11, 'PERCENT': -11, 'PLUS': -11, 'SEMI_COLON': -11, 'SLASH': -11, 'STAR': -11},
+    {'OPEN_BRACES': 79},
+    {'$end': -12, 'AND': -12, 'CLOSE_BRACES': -12, 'CLOSE_PARENS': -12, 'COMMA': -12, 'EQ': -12, 'GT': -12, 'GTEQ': -12, 'LT': -12, 'LTEQ': -12, 'MINUS': -12, 'NEQ': -12, 'OR': -12, 'PERCENT': -12, 'PLUS': -12, 'SEMI_COLON': -12, 'SLASH': -12, 'STAR': -12},
+    {'$end': -39, 'AND': -39, 'CLOSE_BRACES': -39, 'CLOSE_PARENS': -39, 'COMMA': -39, 'EQ': -39, 'GT': -39, 'GTEQ': -39, 'LT': -39, 'LTEQ': -39, 'MINUS': -39, 'NEQ': -39, 'OR': -39, 'PERCENT': -39, 'PLUS': -39, 'SEMI_COLON': -39, 'SLASH': -39, 'STAR': -39},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_BRACES': 82, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'CLOSE_PARENS': -30, 'COMMA': 65},
+    {'AND': -2, 'DIGITS': 10, 'EQ': -2, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'GT': -2, 'GTEQ': -2, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'LT': -2, 'LTEQ': -2, 'MINUS': -2, 'NEQ': -2, 'OPEN_PARENS': 5, 'OR': -2, 'PERCENT': -2, 'PLUS': -2, 'PRINT': 14, 'SECOND': 13, 'SEMI_COLON': -2, 'SLASH': -2, 'STAR': -2, 'STRING': 1, 'TRUE': 17},
+    {'$end': -10, 'AND': -10, 'CLOSE_BRACES': -10, 'CLOSE_PARENS': -10, 'COMMA': -10, 'EQ': -10, 'GT': -10, 'GTEQ': -10, 'LT': -10, 'LTEQ': -10, 'MINUS': -10, 'NEQ': -10, 'OR': -10, 'PERCENT': -10, 'PLUS': -10, 'SEMI_COLON': -10, 'SLASH': -10, 'STAR': -10},
+    {'CLOSE_PARENS': -37, 'COMMA': 69},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -34, 'AND': -34, 'CLOSE_BRACES': -34, 'CLOSE_PARENS': -34, 'COMMA': -34, 'EQ': -34, 'GT': -34, 'GTEQ': -34, 'LT': -34, 'LTEQ': -34, 'MINUS': -34, 'NEQ': -34, 'OR': -34, 'PERCENT': -34, 'PLUS': -34, 'SEMI_COLON': -34, 'SLASH': -34, 'STAR': -34},
+    {'$end': -33, 'AND': 21, 'CLOSE_BRACES': -33, 'CLOSE_PARENS': -33, 'COMMA': -33, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'$end': -27, 'AND': 21, 'CLOSE_BRACES': -27, 'CLOSE_PARENS': -27, 'COMMA': -27, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_BRACES': 86, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'AND': 21, 'CLOSE_BRACES': 87, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'ELSE': 88},
+    {'$end': -32, 'AND': -32, 'CLOSE_BRACES': -32, 'CLOSE_PARENS': -32, 'COMMA': -32, 'EQ': -32, 'GT': -32, 'GTEQ': -32, 'LT': -32, 'LTEQ': -32, 'MINUS': -32, 'NEQ': -32, 'OR': -32, 'PERCENT': -32, 'PLUS': -32, 'SEMI_COLON': -32, 'SLASH': -32, 'STAR': -32},
+    {'OPEN_BRACES': 89},
+    {'DIGITS': 10, 'FALSE': 12, 'FIRST': 9, 'FN': 3, 'IDENTIFIER': 6, 'IF': 11, 'LET': 4, 'OPEN_PARENS': 5, 'PRINT': 14, 'SECOND': 13, 'STRING': 1, 'TRUE': 17},
+    {'AND': 21, 'CLOSE_BRACES': 91, 'EQ': 23, 'GT': 30, 'GTEQ': 29, 'LT': 24, 'LTEQ': 31, 'MINUS': 25, 'NEQ': 33, 'OR': 26, 'PERCENT': 28, 'PLUS': 34, 'SEMI_COLON': 22, 'SLASH': 32, 'STAR': 27},
+    {'$end': -40, 'AND': -40, 'CLOSE_BRACES': -40, 'CLOSE_PARENS': -40, 'COMMA': -40, 'EQ': -40, 'GT': -40, 'GTEQ': -40, 'LT': -40, 'LTEQ': -40, 'MINUS': -40, 'NEQ': -40, 'OR': -40, 'PERCENT': -40, 'PLUS': -40, 'SEMI_COLON': -40, 'SLASH': -40, 'STAR': -40},
+]
+
+LR_GOTO = [
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 7},
+    {},
+    {},
+    {},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 20},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'params': 40},
+    {},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 45},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 46},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 47},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 48},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 49},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 50},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 51},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 52},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 53},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 54},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 55},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 56},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 57},
+    {'args': 59, 'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 58},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 60},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 61},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 62},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 63},
+    {},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 66},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 67},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'params': 75},
+    {},
+    {},
+    {},
+    {'args': 78, 'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 58},
+    {},
+    {},
+    {},
+    {},
+    {'binary': 2, 'body': 80, 'bool': 15, 'function': 16, 'reference': 8, 'term': 81},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 83},
+    {},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 84},
+    {},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 85},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {},
+    {'binary': 2, 'bool': 15, 'function': 16, 'reference': 8, 'term': 90},
+    {},
+    {},
+]
+
+DEFAULT_REDUCTIONS = [
+    0, -4, -13, 0, 0, 0, -9, 0, 0, 0, -3, 0, -7, 0, 0, -5,
+    -31, -6, 0, 0, 0, 0, -2, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, -29, 0, -1, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, -38, 0, -11, 0, -12, -39, 0, 0, 0, -10, 0, 0,
+    -34, 0, 0, 0, 0, 0, 0, -32, 0, 0, 0, -40,
+]
@@ -0,0 +1,269 @@
+"""
+    Hand-written precedence-climbing parser for rinha.
+
+    Builds the same rinha.ast nodes as the rply grammar in rinha.grammar,
+    but binary operators bind by precedence and associate to the left:
+
+        ||                  1
+        &&                  2
+        == !=               3
+        < > <= >=           4
+        + -                 5
+        * / %               6
+
+    Argument and parameter lists are appended to in place and chains of
+    `let` are parsed in a loop, so parsing takes linear time and the host
+    stack only grows with the nesting of the source.
+
+    Given a rinha.locations.Locations, every node is located from its first
+    token to its last one as it is built.
+
+    Trees depend on grammar.VERSION for caching just like rply's do: bump it
+    whenever a change here builds different trees.
+"""
+
+from rinha import ast
+
+PRECEDENCE = {
+    'OR': 1,
+    'AND': 2,
+    'EQ': 3, 'NEQ': 3,
+    'LT': 4, 'GT': 4, 'LTEQ': 4, 'GTEQ': 4,
+    'PLUS': 5, 'MINUS': 5,
+    'STAR': 6, 'SLASH': 6, 'PERCENT': 6,
+}
+
+END = '$end'
+
+# Tokens after which a trailing `;` ends a term instead of starting a `let`
+# continuation, e.g. `{ f(x); }`
+CLOSERS = [END, 'CLOSE_BRACES', 'CLOSE_PARENS', 'COMMA', 'SEMI_COLON']
+
+def binary(name, left, right):
+    if name == 'OR':
+        return ast.Or(left, right)
+    elif name == 'AND':
+        return ast.And(left, right)
+    elif name == 'EQ':
+        return ast.Eq(left, right)
+    elif name == 'NEQ':
+        return ast.Neq(left, right)
+    elif name == 'LT':
+        return ast.Lt(left, right)
+    elif name == 'GT':
+        return ast.Gt(left, right)
+    elif name == 'LTEQ':
+        return ast.Lte(left, right)
+    elif name == 'GTEQ':
+        return ast.Gte(left, right)
+    elif name == 'PLUS':
+        return ast.Add(left, right)
+    elif name == 'MINUS':
+        return ast.Sub(left, right)
+    elif name == 'STAR':
+        return ast.Mul(left, right)
+    elif name == 'SLASH':
+        return ast.Div(left, right)
+    elif name == 'PERCENT':
+        return ast.Rem(left, right)
+    raise ValueError('Unknown operator: %s' % name)
+
+## Parser state
+
+class State(object):
+    def __init__(self, tokens, locations = None):
+        self.tokens = tokens
+        self.ahead = []
+        self.last = None
+        self.locations = locations
+
+    def peek(self, n = 0):
+        while len(self.ahead) <= n:
+            if self.ahead and self.ahead[-1] is None:
+                self.ahead.append(None)
+                continue
+            try:
+                self.ahead.append(next(self.tokens))
+            except StopIteration:
+                self.ahead.append(None)
+        return self.ahead[n]
+
+    def kind(self, n = 0):
+        token = self.peek(n)
+        return END if token is None else token.gettokentype()
+
+    def advance(self):
+        token = self.peek()
+        if token is None:
+            raise self.error()
+        self.ahead.pop(0)
+        self.last = token
+        return token
+
+    def expect(self, name):
+        if self.kind() != name:
+            raise self.error()
+        return self.advance()
+
+    def locate(self, node, first):
+        # From first (a token or a node) to the last token consumed
+        if self.locations is not None:
+            self.locations.cover(node, first, self.last)
+        return node
+
+    def error(self):
+        token = self.peek()
+        if token is None:
+            lineno = self.last.getsourcepos().lineno if self.last is not None else 1
+            return ValueError("Error on line %d token: %s" % (lineno, END))
+        return ValueError(
+            "Error on line %d token: %s" % (token.getsourcepos().lineno, token.gettokentype())
+        )
+
+    ## Grammar
+
+    def program(self):
+        term = self.term()
+        if self.kind() != END:
+            raise self.error()
+        return term
+
+    def term(self):
+        term = self.expression(0)
+        while self.kind() == 'SEMI_COLON' and self.kind(1) in CLOSERS:
+            self.advance()
+        return term
+
+    def expression(self, min_precedence):
+        # Spans start on the first token, parentheses included
+        first = self.peek()
+        left = self.prefix()
+        while True:
+            name = self.kind()
+            precedence = PRECEDENCE.get(name, 0)
+            if precedence <= min_precedence:
+                return left
+            self.advance()
+            left = self.locate(binary(name, left, self.expression(precedence)), first)
+
+    def prefix(self):
+        token = self.advance()
+        name = token.gettokentype()
+
+        if name == 'DIGITS':
+            return self.locate(ast.int_literal(token.getstr()), token)
+
+        elif name == 'STRING':
+            return self.locate(ast.Str(token.getstr()[1:][:-1]), token)
+
+        elif name == 'TRUE' or name == 'FALSE':
+            return self.locate(ast.Bool(name == 'TRUE'), token)
+
+        elif name == 'IDENTIFIER':
+            return self.calls(self.locate(ast.Reference(token.getstr()), token), token)
+
+        elif name == 'OPEN_PARENS':
+            term = self.term()
+            if self.kind() == 'COMMA':
+                self.advance()
+                right = self.term()
+                self.expect('CLOSE_PARENS')
+                term = self.locate(ast.Pair(term, right), token)
+            else:
+                self.expect('CLOSE_PARENS')
+            return self.calls(term, token)
+
+        elif name == 'FIRST':
+            return self.locate(ast.First(self.parenthesized()), token)
+
+        elif name == 'SECOND':
+            return self.locate(ast.Second(self.parenthesized()), token)
+
+        elif name == 'PRINT':
+            return self.locate(ast.Print(self.parenthesized()), token)
+
+        elif name == 'FN':
+            return self.locate(self.function(), token)
+
+        elif name == 'IF':
+            condition = self.parenthesized()
+            then = self.block()
+            self.expect('ELSE')
+            return self.locate(ast.If(condition, then, self.block()), token)
+
+        elif name == 'LET':
+            return self.let(token)
+
+        self.ahead.insert(0, token)
+        raise self.error()
+
+    def parenthesized(self):
+        self.expect('OPEN_PARENS')
+        term = self.term()
+        self.expect('CLOSE_PARENS')
+        return term
+
+    def block(self):
+        self.expect('OPEN_BRACES')
+        term = self.term()
+        self.expect('CLOSE_BRACES')
+        return term
+
+    def calls(self, callee, first):
+        while self.kind() == 'OPEN_PARENS':
+            self.advance()
+            args = ast.ArgList()
+            while self.kind() != 'CLOSE_PARENS':
+                if self.kind() == 'COMMA':
+                    self.advance()
+                else:
+                    args.exprs.append(self.term())
+                    if self.kind() != 'CLOSE_PARENS':
+                        self.expect('COMMA')
+            self.advance()
+            callee = self.locate(ast.Call(callee, args), first)
+        return callee
+
+    def function(self):
+        self.expect('OPEN_PARENS')
+        params = ast.ParamList()
+        while self.kind() != 'CLOSE_PARENS':
+            if self.kind() == 'COMMA':
+                self.advance()
+            else:
+                params.ids.append(self.expect('IDENTIFIER').getstr())
+                if self.kind() != 'CLOSE_PARENS':
+                    self.expect('COMMA')
+        self.advance()
+        self.expect('FN_ARROW')
+
+        if self.kind() == 'OPEN_BRACES':
+            return ast.Function(params, self.block())
+        return ast.Function(params, self.term())
+
+    def let(self, token):
+        # Called after the first LET; takes the whole chain that follows
+        bindings = []
+        while True:
+            identif = self.expect('IDENTIFIER').getstr()
+            self.expect('ASSIGN')
+            bindings.append((token, identif, self.term()))
+            self.expect('SEMI_COLON')
+            if self.kind() != 'LET':
+                break
+            token = self.advance()
+
+        # Every let in the chain ends where the chain does
+        term = self.term()
+        while bindings:
+            token, identif, expr = bindings.pop()
+            term = self.locate(ast.Let(identif, expr, term), token)
+        return term
+
+## Parser
+
+class Parser(object):
+    def parse(self, tokens, locations = None):
+        return State(tokens, locations).program()
+
+parser = Parser()
@@ -0,0 +1,160 @@
+"""
+    Profiler for the tree walker.
+
+    profile() wraps the interesting nodes of a resolved program (calls,
+    operators, ifs, tuples and prints) and the body of every function in
+    Probes, which time their node and keep a stack of what is running. Each
+    frame is charged its own time, without that of the frames it runs, so
+    the result is the collapsed-stack format flame graph tools read:
+
+        <main>;Call:4;fib:1;If:2;Add:2;Call:2;fib:1;If:2 1250
+
+    one line per stack, with the microseconds spent in its last frame.
+    Functions are named after the `let` binding them, and everything is
+    labelled with the line it starts on when the program comes with its
+    rinha.locations table. Literals and references are charged to the node
+    using them.
+
+    Nothing is wrapped unless a program is profiled, so running without the
+    profiler costs nothing. Tail calls return to the trampoline in
+    Closure.call before the callee runs, so the callee shows up next to its
+    caller rather than inside it, as the frame it replaces is gone.
+"""
+
+import time
+
+from rinha import ast
+
+timer = getattr(time, 'perf_counter', time.time)
+
+class Profiler(object):
+    def __init__(self):
+        self.stack = []
+        self.times = {}
+        self.calls = {}
+        self.functions = set()
+
+    def enter(self, label):
+        # label, start, time spent in frames above it
+        self.stack.append([label, timer(), 0.0])
+
+    def leave(self):
+        label, start, inner = self.stack.pop()
+        elapsed = timer() - start
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+        key = ';'.join([frame[0] for frame in self.stack] + [label])
+        self.times[key] = self.times.get(key, 0.0) + elapsed - inner
+        self.calls[label] = self.calls.get(label, 0) + 1
+
+    def collapsed(self):
+        lines = []
+        for key in sorted(self.times):
+            lines.append('%s %d' % (key, int(self.times[key] * 1e6)))
+        return '\n'.join(lines) + '\n'
+
+    def hot(self):
+        # (own seconds, calls, label) of every function, hottest first
+        own = {}
+        for key, seconds in self.times.items():
+            label = key.rsplit(';', 1)[-1]
+            own[label] = own.get(label, 0.0) + seconds
+        return sorted(
+            [(own[label], self.calls[label], label) for label in own if label in self.functions],
+            reverse=True,
+        )
+
+    def report(self, limit = 10):
+        hot = self.hot()[:limit]
+        lines = ['%10s %10s  %s' % ('own ms', 'calls', 'function')]
+        for seconds, calls, label in hot:
+            lines.append('%10.2f %10d  %s' % (seconds * 1000, calls, label))
+        return '\n'.join(lines) + '\n'
+
+class Probe(ast.Term):
+    __slots__ = ('term', 'label', 'profiler')
+
+    def __init__(self, term, label, profiler):
+        self.term = term
+        self.label = label
+        self.profiler = profiler
+
+    def eval(self, scope = None):
+        self.profiler.enter(self.label)
+        try:
+            return self.term.eval(scope)
+        finally:
+            self.profiler.leave()
+
+    def to_json(self):
+        return self.term.to_json()
+
+## Instrumenting
+
+class Instrument(object):
+    def __init__(self, profiler, locations = None):
+        self.profiler = profiler
+        self.locations = locations
+
+    def label(self, term, name):
+        line = self.locations.line(term) if self.locations is not None else 0
+        if line > 0:
+            return '%s:%d' % (name, line)
+        return name
+
+    def probe(self, term, label):
+        return Probe(term, label, self.profiler)
+
+    def function(self, fn, name):
+        label = self.label(fn, name)
+        self.profiler.functions.add(label)
+        fn.body = self.probe(self.wrap(fn.body), label)
+        return fn
+
+    def wrap(self, term):
+        if isinstance(term, ast.Let):
+            # Iterate along let chains, which can be as long as the program
+            head = term
+            while True:
+                if isinstance(term.expr, ast.Function):
+                    term.expr = self.function(term.expr, term.identif)
+                else:
+                    term.expr = self.wrap(term.expr)
+                if not isinstance(term.next, ast.Let):
+                    term.next = self.wrap(term.next)
+                    break
+                term = term.next
+            return head
+
+        elif isinstance(term, ast.Function):
+            return self.function(term, '<fn>')
+
+        elif isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+            term.left = self.wrap(term.left)
+            term.right = self.wrap(term.right)
+
+        elif isinstance(term, ast.If):
+            term.condition = self.wrap(term.condition)
+            term.then = self.wrap(term.then)
+            term.otherwise = self.wrap(term.otherwise)
+
+        elif isinstance(term, ast.Call):
+            term.callee = self.wrap(term.callee)
+            term.args.exprs = [self.wrap(e) for e in term.args.exprs]
+
+        elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+            term.ref = self.wrap(term.ref)
+
+        elif isinstance(term, ast.Print):
+            term.expr = self.wrap(term.expr)
+
+        else:
+            return term
+
+        return self.probe(term, self.label(term, type(term).__name__))
+
+def profile(program, profiler, locations = None):
+    assert isinstance(program, ast.Program)
+    program.body = Probe(Instrument(profiler, locations).wrap(program.body), '<main>', profiler)
+    return program
@@ -0,0 +1,178 @@
+"""
+    Static resolution of names into (depth, slot) frame indexes.
+
+    Every function body and the top level of a program get one frame. The
+    parameters take the first slots and each distinct name bound by a `let`
+    takes the next one, so rebinding a name overwrites its slot just like
+    Scope.define does.
+
+    A `let` only binds its name from the point it runs on, and only on the
+    branch it is in, as Scope.define would. A name whose slot is surely bound
+    where it is read becomes a plain SlotReference; one whose slot may not be
+    bound yet (bound in one `if` branch only, or later in a frame enclosing a
+    function) falls back to the next frame out that may hold it, like
+    Scope.lookup does. Function bodies are resolved after the frame that
+    encloses them, so they also see names bound after the function itself
+    (e.g. recursion, forward references), through such a fallback.
+
+    Calls in tail position of a function body, including through `if`
+    branches and `let` continuations, become TailCall nodes. Those return a
+    Bounce to the caller's Closure.call, which runs it in a loop instead of
+    growing the host stack.
+
+    Nodes replaced on the way keep their source location, when given a
+    rinha.locations.Locations table.
+"""
+
+from rinha import ast
+
+
+class Layout(object):
+    def __init__(self, params = None, parent = None, locations = None, visible = None):
+        self.parent = parent
+        self.locations = locations
+        self.slots = {}
+        self.size = 0
+        self.pending = []
+        # Names surely bound at this point of the walk, and in each enclosing
+        # frame when the function of this one was created
+        self.bound = set()
+        self.visible = visible if visible is not None else []
+
+        if params is not None:
+            for i, identif in enumerate(params):
+                self.slots[identif] = i
+                self.bound.add(identif)
+            self.size = len(params)
+
+    def declare(self, identif):
+        slot = self.slots.get(identif, -1)
+        if slot < 0:
+            slot = self.size
+            self.slots[identif] = slot
+            self.size += 1
+        self.bound.add(identif)
+        return slot
+
+    def find(self, identif):
+        # (depth, slot) of the frames that may hold identif, innermost first,
+        # up to the first one that surely does
+        found = []
+        depth = 0
+        layout = self
+        while layout is not None:
+            slot = layout.slots.get(identif, -1)
+            if slot >= 0:
+                found.append((depth, slot))
+                bound = layout.bound if depth == 0 else self.visible[depth - 1]
+                if identif in bound:
+                    break
+            layout = layout.parent
+            depth += 1
+
+        return found
+
+    def flush(self):
+        while self.pending:
+            fn, visible = self.pending.pop()
+            layout = Layout(fn.params.ids, self, self.locations, visible)
+            fn.body = tail(layout.resolve(fn.body), self.locations)
+            layout.flush()
+            fn.size = layout.size
+
+    def moved(self, old, new):
+        if self.locations is not None:
+            self.locations.moved(old, new)
+        return new
+
+    def resolve(self, term):
+        if isinstance(term, ast.Reference):
+            found = self.find(term.identif)
+            if not found:
+                return term
+            # A name no frame surely holds raises from the outermost one
+            ref = None
+            while found:
+                depth, slot = found.pop()
+                ref = ast.SlotReference(term.identif, depth, slot, ref)
+            return self.moved(term, ref)
+
+        elif isinstance(term, ast.Let):
+            # Along let chains iteratively, as they can be as long as the program
+            lets = []
+            while isinstance(term, ast.Let):
+                expr = self.resolve(term.expr)
+                lets.append((term, expr, self.declare(term.identif)))
+                term = term.next
+            next = self.resolve(term)
+            while lets:
+                term, expr, slot = lets.pop()
+                next = self.moved(term, ast.SlotLet(term.identif, expr, next, slot))
+            return next
+
+        elif isinstance(term, ast.Function):
+            fn = self.moved(term, ast.SlotFunction(term.params, term.body))
+            self.pending.append((fn, [set(self.bound)] + self.visible))
+            return fn
+
+        elif isinstance(term, ast.Call):
+            term.callee = self.resolve(term.callee)
+            term.args.exprs = [self.resolve(e) for e in term.args.exprs]
+
+        elif isinstance(term, ast.And) or isinstance(term, ast.Or):
+            # The right side may not run
+            term.left = self.resolve(term.left)
+            bound = set(self.bound)
+            term.right = self.resolve(term.right)
+            self.bound = bound
+
+        elif isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+            term.left = self.resolve(term.left)
+            term.right = self.resolve(term.right)
+
+        elif isinstance(term, ast.If):
+            term.condition = self.resolve(term.condition)
+            bound = set(self.bound)
+            term.then = self.resolve(term.then)
+            then, self.bound = self.bound, bound
+            term.otherwise = self.resolve(term.otherwise)
+            self.bound &= then
+
+        elif isinstance(term, ast.Print):
+            term.expr = self.resolve(term.expr)
+
+        elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+            term.ref = self.resolve(term.ref)
+
+        return term
+
+
+def tail(term, locations = None):
+    if isinstance(term, ast.TailCall):
+        return term
+
+    elif isinstance(term, ast.Call):
+        call = ast.TailCall(term.callee, term.args)
+        if locations is not None:
+            locations.moved(term, call)
+        return call
+
+    elif isinstance(term, ast.If):
+        term.then = tail(term.then, locations)
+        term.otherwise = tail(term.otherwise, locations)
+
+    elif isinstance(term, ast.Let):
+        head = term
+        while isinstance(term.next, ast.Let):
+            term = term.next
+        term.next = tail(term.next, locations)
+        return head
+
+    return term
+
+
+def resolve(term, locations = None):
+    layout = Layout(None, None, locations)
+    body = layout.resolve(term)
+    layout.flush()
+    return ast.Program(body, layout.size)
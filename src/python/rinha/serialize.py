@@ -0,0 +1,337 @@
+"""
+    Versioned binary images of parsed rinha programs.
+
+    An image is a header, a flat table of fixed-size node records, a table of
+    int lists (call arguments and function parameters) and a string table
+    holding every identifier and string literal once:
+
+        header   magic, version, node count, root, list and string offsets
+        nodes    kind:u8 a:i32 b:i32 c:i32, children always before parents
+        lists    count:u32 item:i32 * count, referenced by byte offset
+        strings  count:u32 (offset:u32 length:u32) * count, then utf-8 bytes
+
+    Records refer to their children by index, so loading never parses text.
+    Image decodes on demand from any buffer: only records reachable from the
+    requested node are decoded, and strings are decoded on first use.
+    open_image() keeps the file mapped until the image is closed, so a caller
+    that needs a few nodes pays for those alone; load() decodes the whole
+    tree and unmaps the file at once, since every backend walks the entire
+    program anyway.
+"""
+
+import mmap
+import struct
+
+from rinha import ast
+
+MAGIC = b'RNHA'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHIIII')
+NODE = struct.Struct('<Biii')
+U32 = struct.Struct('<I')
+I32 = struct.Struct('<i')
+SPAN = struct.Struct('<II')
+
+## Node kinds
+
+INT, LONG, STR, BOOL, PAIR, FIRST, SECOND, PRINT, FUNCTION, CALL, LET, IF, REF = range(13)
+
+BINARY = 32
+OPERATORS = [
+    ast.Add, ast.Sub, ast.Mul, ast.Div, ast.Rem, ast.Eq, ast.Neq,
+    ast.Lt, ast.Gt, ast.Lte, ast.Gte, ast.And, ast.Or,
+]
+
+I32_MIN, I32_MAX = -2 ** 31, 2 ** 31 - 1
+
+def encode(value):
+    return value if isinstance(value, bytes) else value.encode('utf-8')
+
+def decode(raw):
+    return raw if isinstance(raw, str) else raw.decode('utf-8')
+
+## Writer
+
+class Writer(object):
+    def __init__(self):
+        self.nodes = []
+        self.lists = []
+        self.list_size = 0
+        self.strings = []
+        self.string_index = {}
+        self.index = {}
+
+    def string(self, value):
+        i = self.string_index.get(value, -1)
+        if i < 0:
+            i = len(self.strings)
+            self.strings.append(encode(value))
+            self.string_index[value] = i
+        return i
+
+    def list(self, items):
+        offset = self.list_size
+        self.lists.append(U32.pack(len(items)))
+        for item in items:
+            self.lists.append(I32.pack(item))
+        self.list_size += 4 * (len(items) + 1)
+        return offset
+
+    def children(self, term):
+        if isinstance(term, ast.Binary) or isinstance(term, ast.Pair):
+            return [term.left, term.right]
+        elif isinstance(term, ast.First) or isinstance(term, ast.Second):
+            return [term.ref]
+        elif isinstance(term, ast.Print):
+            return [term.expr]
+        elif isinstance(term, ast.Function):
+            return [term.body]
+        elif isinstance(term, ast.Call):
+            return [term.callee] + term.args.exprs
+        elif isinstance(term, ast.Let):
+            return [term.expr, term.next]
+        elif isinstance(term, ast.If):
+            return [term.condition, term.then, term.otherwise]
+        else:
+            return []
+
+    def record(self, term):
+        ix = self.index
+
+        if isinstance(term, ast.Int):
+            if I32_MIN <= term.value <= I32_MAX:
+                return INT, term.value, 0, 0
+            return LONG, self.string(str(term.value)), 0, 0
+        elif isinstance(term, ast.BigInt):
+            return LONG, self.string(term.to_str()), 0, 0
+        elif isinstance(term, ast.Str):
+            return STR, self.string(term.value), 0, 0
+        elif isinstance(term, ast.Bool):
+            return BOOL, 1 if term.value else 0, 0, 0
+        elif isinstance(term, ast.Binary):
+            return BINARY + OPERATORS.index(type(term)), ix[id(term.left)], ix[id(term.right)], 0
+        elif isinstance(term, ast.Pair):
+            return PAIR, ix[id(term.left)], ix[id(term.right)], 0
+        elif isinstance(term, ast.First):
+            return FIRST, ix[id(term.ref)], 0, 0
+        elif isinstance(term, ast.Second):
+            return SECOND, ix[id(term.ref)], 0, 0
+        elif isinstance(term, ast.Print):
+            return PRINT, ix[id(term.expr)], 0, 0
+        elif isinstance(term, ast.Function):
+            params = self.list([self.string(p) for p in term.params.ids])
+            return FUNCTION, params, ix[id(term.body)], 0
+        elif isinstance(term, ast.Call):
+            args = self.list([ix[id(e)] for e in term.args.exprs])
+            return CALL, ix[id(term.callee)], args, 0
+        elif isinstance(term, ast.Let):
+            return LET, self.string(term.identif), ix[id(term.expr)], ix[id(term.next)]
+        elif isinstance(term, ast.If):
+            return IF, ix[id(term.condition)], ix[id(term.then)], ix[id(term.otherwise)]
+        elif isinstance(term, ast.Reference):
+            return REF, self.string(term.identif), 0, 0
+        else:
+            raise ValueError('Cannot serialize %s' % type(term).__name__)
+
+    def add(self, root):
+        # Iterative post-order, so deep let chains don't hit the recursion limit
+        stack = [(root, False)]
+        while stack:
+            term, ready = stack.pop()
+            if id(term) in self.index:
+                continue
+            if ready:
+                self.index[id(term)] = len(self.nodes)
+                self.nodes.append(NODE.pack(*self.record(term)))
+            else:
+                stack.append((term, True))
+                for child in reversed(self.children(term)):
+                    stack.append((child, False))
+        return self.index[id(root)]
+
+    def image(self, root):
+        root = self.add(root)
+
+        nodes = b''.join(self.nodes)
+        lists = b''.join(self.lists)
+
+        spans = []
+        offset = 0
+        for raw in self.strings:
+            spans.append(SPAN.pack(offset, len(raw)))
+            offset += len(raw)
+        strings = U32.pack(len(self.strings)) + b''.join(spans) + b''.join(self.strings)
+
+        lists_at = HEADER.size + len(nodes)
+        strings_at = lists_at + len(lists)
+        header = HEADER.pack(MAGIC, VERSION, 0, len(self.nodes), root, lists_at, strings_at)
+        return header + nodes + lists + strings
+
+def dumps(tree):
+    return Writer().image(tree)
+
+def dump(tree, f):
+    f.write(dumps(tree))
+
+## Reader
+
+class Image(object):
+    def __init__(self, data):
+        if len(data) < HEADER.size:
+            raise ValueError('Not a rinha image: truncated header')
+
+        magic, version, _, count, root, lists_at, strings_at = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a rinha image')
+        if version != VERSION:
+            raise ValueError('Unsupported rinha image version %d' % version)
+        if HEADER.size + count * NODE.size != lists_at or not lists_at <= strings_at <= len(data) - 4:
+            raise ValueError('Corrupt rinha image: bad section offsets')
+        if root >= count:
+            raise ValueError('Corrupt rinha image: bad root')
+
+        self.data = data
+        self.count = count
+        self.root_index = root
+        self.lists_at = lists_at
+        self.strings_at = strings_at
+        self.string_count = U32.unpack_from(data, strings_at)[0]
+        self.blob_at = strings_at + 4 + self.string_count * SPAN.size
+        if self.blob_at > len(data):
+            raise ValueError('Corrupt rinha image: bad string table')
+        self.strings = [None] * self.string_count
+        self.nodes = [None] * count
+
+    # Operands are checked before they are followed, so that a damaged
+    # image raises ValueError like a bad header does
+
+    def string(self, i):
+        if not 0 <= i < self.string_count:
+            raise ValueError('Corrupt rinha image: bad string index')
+        value = self.strings[i]
+        if value is None:
+            offset, length = SPAN.unpack_from(self.data, self.strings_at + 4 + i * SPAN.size)
+            start = self.blob_at + offset
+            if start + length > len(self.data):
+                raise ValueError('Corrupt rinha image: bad string span')
+            value = self.strings[i] = decode(self.data[start:start + length])
+        return value
+
+    def list(self, offset):
+        at = self.lists_at + offset
+        if offset < 0 or at + 4 > self.strings_at:
+            raise ValueError('Corrupt rinha image: bad list offset')
+        count = U32.unpack_from(self.data, at)[0]
+        if at + 4 + 4 * count > self.strings_at:
+            raise ValueError('Corrupt rinha image: bad list length')
+        return [I32.unpack_from(self.data, at + 4 + 4 * i)[0] for i in range(count)]
+
+    def record(self, i):
+        return NODE.unpack_from(self.data, HEADER.size + i * NODE.size)
+
+    def children(self, i):
+        kind, a, b, c = self.record(i)
+        if kind >= BINARY or kind == PAIR:
+            return [a, b]
+        elif kind == FIRST or kind == SECOND or kind == PRINT:
+            return [a]
+        elif kind == FUNCTION:
+            return [b]
+        elif kind == CALL:
+            return [a] + self.list(b)
+        elif kind == LET:
+            return [b, c]
+        elif kind == IF:
+            return [a, b, c]
+        else:
+            return []
+
+    def decode(self, i):
+        kind, a, b, c = self.record(i)
+        nodes = self.nodes
+
+        if kind == INT:
+            return ast.Int(a)
+        elif kind == LONG:
+            return ast.int_literal(self.string(a))
+        elif kind == STR:
+            return ast.Str(self.string(a))
+        elif kind == BOOL:
+            return ast.Bool(a == 1)
+        elif BINARY <= kind < BINARY + len(OPERATORS):
+            return OPERATORS[kind - BINARY](nodes[a], nodes[b])
+        elif kind == PAIR:
+            return ast.Pair(nodes[a], nodes[b])
+        elif kind == FIRST:
+            return ast.First(nodes[a])
+        elif kind == SECOND:
+            return ast.Second(nodes[a])
+        elif kind == PRINT:
+            return ast.Print(nodes[a])
+        elif kind == FUNCTION:
+            params = ast.ParamList()
+            params.ids = [self.string(s) for s in self.list(a)]
+            return ast.Function(params, nodes[b])
+        elif kind == CALL:
+            args = ast.ArgList()
+            args.exprs = [nodes[e] for e in self.list(b)]
+            return ast.Call(nodes[a], args)
+        elif kind == LET:
+            return ast.Let(self.string(a), nodes[b], nodes[c])
+        elif kind == IF:
+            return ast.If(nodes[a], nodes[b], nodes[c])
+        elif kind == REF:
+            return ast.Reference(self.string(a))
+        else:
+            raise ValueError('Corrupt rinha image: unknown node kind %d' % kind)
+
+    def node(self, i):
+        if self.nodes[i] is None:
+            # Children always precede their parents, so decoding the missing
+            # reachable records in index order never needs recursion
+            pending = set()
+            stack = [i]
+            while stack:
+                j = stack.pop()
+                if j in pending or self.nodes[j] is not None:
+                    continue
+                pending.add(j)
+                for child in self.children(j):
+                    if not 0 <= child < j:
+                        raise ValueError('Corrupt rinha image: bad child index')
+                    stack.append(child)
+
+            for j in sorted(pending):
+                self.nodes[j] = self.decode(j)
+
+        return self.nodes[i]
+
+    def root(self):
+        return self.node(self.root_index)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def loads(data):
+    return Image(data).root()
+
+def open_image(filename):
+    with open(filename, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return Image(data)
+    except ValueError:
+        data.close()
+        raise
+
+def load(filename):
+    with open_image(filename) as image:
+        return image.root()
@@ -0,0 +1,237 @@
+"""
+    Self-specializing binary operators for the tree walker.
+
+    specialize() turns every binary operator of a resolved program into its
+    uninitialized variant. The first time one runs, it looks at the operand
+    types and rewrites itself into a variant for them (e.g. AddIntInt),
+    which checks both types once and computes and boxes the result without
+    going through compute() and boxed(). When that check fails, the node
+    deoptimizes: it rewrites itself back into the generic operator for good,
+    so a polymorphic site settles instead of flipping between variants.
+
+    Nodes are rewritten in place by switching their class, which works since
+    every variant shares the operator's slots; no parent has to be patched.
+    RPython cannot do that, so this is a host-only execution mode.
+"""
+
+from rinha import ast
+from rinha.numeric import ovfcheck, rem
+from rinha.optimizer import children
+
+
+def integer(value):
+    if ast.SMALL_INT_MIN <= value <= ast.SMALL_INT_MAX:
+        return ast.SMALL_INTS[value - ast.SMALL_INT_MIN]
+    return ast.Int(value)
+
+def boolean(value):
+    return ast.TRUE if value else ast.FALSE
+
+## Rewriting
+
+# Operands may recurse into the very node being evaluated, so by the time
+# they are computed a nested evaluation may have rewritten it already: every
+# eval reads what it needs from its class before evaluating them.
+
+def deoptimize(node, lhs, rhs):
+    node.__class__ = GENERIC.get(type(node), type(node))
+    return ast.boxed(node.compute(lhs, rhs))
+
+class Uninitialized(ast.Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        generic = GENERIC[type(self)]
+        lhs, rhs = self.left.eval(scope), self.right.eval(scope)
+        assert isinstance(lhs, ast.Value) and isinstance(rhs, ast.Value)
+
+        if isinstance(self, Uninitialized):
+            variant = None
+            if isinstance(lhs, ast.Int) and isinstance(rhs, ast.Int):
+                variant = INT_INT.get(generic, None)
+            elif isinstance(lhs, ast.Str) and isinstance(rhs, ast.Str):
+                variant = STR_STR.get(generic, None)
+            self.__class__ = variant if variant is not None else generic
+
+        return ast.boxed(generic.compute(self, lhs, rhs))
+
+class IntArithmetic(ast.Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        fast = self.fast
+        lhs, rhs = self.left.eval(scope), self.right.eval(scope)
+        if isinstance(lhs, ast.Int) and isinstance(rhs, ast.Int):
+            try:
+                return integer(ovfcheck(fast(lhs.value, rhs.value)))
+            except OverflowError:
+                # Still Int x Int, only this result needs a BigInt
+                return ast.boxed(self.compute(lhs, rhs))
+        return deoptimize(self, lhs, rhs)
+
+class IntComparison(ast.Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        fast = self.fast
+        lhs, rhs = self.left.eval(scope), self.right.eval(scope)
+        if isinstance(lhs, ast.Int) and isinstance(rhs, ast.Int):
+            return boolean(fast(lhs.value, rhs.value))
+        return deoptimize(self, lhs, rhs)
+
+class StrConcat(ast.Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        lhs, rhs = self.left.eval(scope), self.right.eval(scope)
+        if isinstance(lhs, ast.Str) and isinstance(rhs, ast.Str):
+            return ast.concat(lhs, rhs)
+        return deoptimize(self, lhs, rhs)
+
+class StrComparison(ast.Binary):
+    __slots__ = ()
+
+    def eval(self, scope = None):
+        fast = self.fast
+        lhs, rhs = self.left.eval(scope), self.right.eval(scope)
+        if isinstance(lhs, ast.Str) and isinstance(rhs, ast.Str):
+            return boolean(fast(lhs.value, rhs.value))
+        return deoptimize(self, lhs, rhs)
+
+## Uninitialized operators
+
+class AddUninitialized(Uninitialized, ast.Add): __slots__ = ()
+class SubUninitialized(Uninitialized, ast.Sub): __slots__ = ()
+class MulUninitialized(Uninitialized, ast.Mul): __slots__ = ()
+class DivUninitialized(Uninitialized, ast.Div): __slots__ = ()
+class RemUninitialized(Uninitialized, ast.Rem): __slots__ = ()
+class EqUninitialized(Uninitialized, ast.Eq): __slots__ = ()
+class NeqUninitialized(Uninitialized, ast.Neq): __slots__ = ()
+class LtUninitialized(Uninitialized, ast.Lt): __slots__ = ()
+class GtUninitialized(Uninitialized, ast.Gt): __slots__ = ()
+class LteUninitialized(Uninitialized, ast.Lte): __slots__ = ()
+class GteUninitialized(Uninitialized, ast.Gte): __slots__ = ()
+
+## Int x Int
+
+class AddIntInt(IntArithmetic, ast.Add):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a + b
+
+class SubIntInt(IntArithmetic, ast.Sub):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a - b
+
+class MulIntInt(IntArithmetic, ast.Mul):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a * b
+
+class DivIntInt(IntArithmetic, ast.Div):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a // b
+
+class RemIntInt(IntArithmetic, ast.Rem):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return rem(a, b)
+
+class EqIntInt(IntComparison, ast.Eq):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a == b
+
+class NeqIntInt(IntComparison, ast.Neq):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a != b
+
+class LtIntInt(IntComparison, ast.Lt):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a < b
+
+class GtIntInt(IntComparison, ast.Gt):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a > b
+
+class LteIntInt(IntComparison, ast.Lte):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a <= b
+
+class GteIntInt(IntComparison, ast.Gte):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a >= b
+
+## Str x Str
+
+class AddStrStr(StrConcat, ast.Add):
+    __slots__ = ()
+
+class EqStrStr(StrComparison, ast.Eq):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a == b
+
+class NeqStrStr(StrComparison, ast.Neq):
+    __slots__ = ()
+
+    def fast(self, a, b):
+        return a != b
+
+## Tables
+
+UNINITIALIZED = {
+    ast.Add: AddUninitialized, ast.Sub: SubUninitialized, ast.Mul: MulUninitialized,
+    ast.Div: DivUninitialized, ast.Rem: RemUninitialized, ast.Eq: EqUninitialized,
+    ast.Neq: NeqUninitialized, ast.Lt: LtUninitialized, ast.Gt: GtUninitialized,
+    ast.Lte: LteUninitialized, ast.Gte: GteUninitialized,
+}
+
+INT_INT = {
+    ast.Add: AddIntInt, ast.Sub: SubIntInt, ast.Mul: MulIntInt, ast.Div: DivIntInt,
+    ast.Rem: RemIntInt, ast.Eq: EqIntInt, ast.Neq: NeqIntInt, ast.Lt: LtIntInt,
+    ast.Gt: GtIntInt, ast.Lte: LteIntInt, ast.Gte: GteIntInt,
+}
+
+STR_STR = {
+    ast.Add: AddStrStr, ast.Eq: EqStrStr, ast.Neq: NeqStrStr,
+}
+
+# Every variant back to the generic operator it stands for
+GENERIC = {}
+for table in [UNINITIALIZED, INT_INT, STR_STR]:
+    for generic, variant in table.items():
+        GENERIC[variant] = generic
+
+## Pass
+
+def specialize(program):
+    assert isinstance(program, ast.Program)
+    stack = [program.body]
+    while stack:
+        term = stack.pop()
+        variant = UNINITIALIZED.get(type(term), None)
+        if variant is not None:
+            term.__class__ = variant
+
+        stack.extend(children(term))
+    return program
@@ -0,0 +1,50 @@
+"""
+    Regenerates rinha/parsetab.py, the precomputed LALR tables that
+    rinha.grammar loads instead of running the parser generator at import.
+
+    Run from src/python after changing a production: python -m rinha.tables
+"""
+
+import os
+
+from rinha import grammar
+
+HEADER = '''\
+# Generated by python -m rinha.tables from the productions in rinha.grammar.
+# Do not edit: regenerate it whenever the grammar changes.
+
+'''
+
+def row(entries):
+    return '{%s}' % ', '.join('%r: %d' % (k, entries[k]) for k in sorted(entries))
+
+def render(table):
+    lines = [HEADER]
+    lines.append('SIGNATURE = %r\n\n' % grammar.signature(table.grammar))
+
+    lines.append('LR_ACTION = [\n')
+    for entries in table.lr_action:
+        lines.append('    %s,\n' % row(entries))
+    lines.append(']\n\n')
+
+    lines.append('LR_GOTO = [\n')
+    for entries in table.lr_goto:
+        lines.append('    %s,\n' % row(entries))
+    lines.append(']\n\n')
+
+    lines.append('DEFAULT_REDUCTIONS = [\n')
+    reductions = table.default_reductions
+    for i in range(0, len(reductions), 16):
+        lines.append('    %s,\n' % ', '.join('%d' % r for r in reductions[i:i + 16]))
+    lines.append(']\n')
+    return ''.join(lines)
+
+def main():
+    table = grammar.pg.build().lr_table
+    path = os.path.join(os.path.dirname(os.path.abspath(grammar.__file__)), 'parsetab.py')
+    with open(path, 'w') as f:
+        f.write(render(table))
+    print('%s: %d states' % (path, len(table.lr_action)))
+
+if __name__ == '__main__':
+    main()
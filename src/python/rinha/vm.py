@@ -0,0 +1,242 @@
+"""
+    Stack machine for the bytecode produced by rinha.compiler.
+
+    Calls do not recurse in the host: the caller's code, pc and frame are
+    pushed on an explicit call stack and the loop carries on in the callee,
+    so recursion depth is bounded by memory instead of the host stack. Tail
+    calls push nothing, so they run in constant space.
+
+    On a plain Python host this is not the fast backend: every instruction
+    goes through the dispatch chain below, which costs more than a node of
+    the tree walker does, so fib(22) runs about 1.5x slower here than under
+    the tree backend. Its use is deep recursion without the host stack.
+
+    The loop carries RPython JIT hints: (pc, code) identify a position in
+    the program and are green, while the frame and both stacks are red.
+    Entering a function and jumping backwards are the places where a trace
+    could close into a loop. These are hints only: this path has never been
+    translated, and is not annotatable as it stands (see rinha.jit).
+"""
+
+from rinha import ast
+from rinha.env import Frame
+from rinha.jit import JitDriver, promote, we_are_translated
+from rinha.memo import MemoFunction, args_key
+from rinha.output import output
+from rinha.compiler import (
+    CONST, LOAD_LOCAL, LOAD_OUTER, LOOKUP, STORE, BINARY, JUMP, JUMP_IF_FALSE,
+    FUNCTION, CALL, RETURN, PRINT, FIRST, SECOND, TAIL_CALL, TUPLE, AND_JUMP,
+    OR_JUMP, LOAD_BOUND, CALLABLE, OPERATORS, NAMES,
+)
+
+
+def get_printable_location(pc, code):
+    return '%s:%d %s' % (code.name, pc, NAMES[code.instrs[pc]])
+
+jitdriver = JitDriver(
+    greens = ['pc', 'code'],
+    reds = ['frame', 'stack', 'calls'],
+    get_printable_location = get_printable_location,
+)
+
+
+class Return(object):
+    __slots__ = ('code', 'pc', 'frame', 'memo', 'key')
+    _immutable_fields_ = ['code', 'pc', 'frame', 'memo', 'key']
+
+    def __init__(self, code, pc, frame, memo = None, key = None):
+        self.code = code
+        self.pc = pc
+        self.frame = frame
+        self.memo = memo
+        self.key = key
+
+
+def run(code, frame = None):
+    frame = Frame([None] * code.size, frame)
+    stack = []
+    calls = []
+    pc = 0
+
+    while True:
+        if we_are_translated():
+            jitdriver.jit_merge_point(pc=pc, code=code, frame=frame, stack=stack, calls=calls)
+        op = code.instrs[pc]
+
+        if op == LOAD_LOCAL:
+            value = frame.slots[code.instrs[pc + 1]]
+            if value is None:
+                raise KeyError(code.names[pc])
+            stack.append(value)
+            pc += 2
+
+        elif op == CONST:
+            stack.append(code.consts[code.instrs[pc + 1]])
+            pc += 2
+
+        elif op == BINARY:
+            rhs = stack.pop()
+            lhs = stack.pop()
+            assert isinstance(lhs, ast.Value) and isinstance(rhs, ast.Value)
+            stack.append(ast.boxed(OPERATORS[code.instrs[pc + 1]].compute(lhs, rhs)))
+            pc += 2
+
+        elif op == JUMP_IF_FALSE:
+            if stack.pop().is_truthy():
+                pc += 2
+            else:
+                pc = code.instrs[pc + 1]
+
+        elif op == AND_JUMP:
+            lhs = stack[-1]
+            if isinstance(lhs, ast.Bool) and not lhs.value:
+                pc = code.instrs[pc + 1]
+            else:
+                pc += 2
+
+        elif op == OR_JUMP:
+            lhs = stack[-1]
+            if isinstance(lhs, ast.Bool) and lhs.value:
+                pc = code.instrs[pc + 1]
+            else:
+                pc += 2
+
+        elif op == JUMP:
+            target = code.instrs[pc + 1]
+            if target < pc:
+                pc = target
+                if we_are_translated():
+                    jitdriver.can_enter_jit(pc=pc, code=code, frame=frame, stack=stack, calls=calls)
+            else:
+                pc = target
+
+        elif op == LOAD_OUTER:
+            scope = frame
+            depth = code.instrs[pc + 1]
+            while depth > 0:
+                scope = scope.parent
+                depth -= 1
+            value = scope.slots[code.instrs[pc + 2]]
+            if value is None:
+                raise KeyError(code.names[pc])
+            stack.append(value)
+            pc += 3
+
+        elif op == LOAD_BOUND:
+            scope = frame
+            depth = code.instrs[pc + 1]
+            while depth > 0:
+                scope = scope.parent
+                depth -= 1
+            value = scope.slots[code.instrs[pc + 2]]
+            if value is None:
+                pc += 4
+            else:
+                stack.append(value)
+                pc = code.instrs[pc + 3]
+
+        elif op == CALLABLE:
+            fn = stack[-1]
+            assert isinstance(fn, ast.Closure)
+            assert len(fn.function.params.ids) == code.instrs[pc + 1]
+            pc += 2
+
+        elif op == CALL:
+            argc = code.instrs[pc + 1]
+            args = stack[len(stack) - argc:]
+            del stack[len(stack) - argc:]
+            fn = stack.pop()
+
+            assert isinstance(fn, ast.Closure)
+
+            memo, key = None, None
+            if isinstance(fn.function, MemoFunction):
+                memo, key = fn.function, args_key(fn.function, args)
+                value = memo.cache.get(key) if key is not None else None
+                if value is not None:
+                    stack.append(value)
+                    pc += 2
+                    continue
+
+            calls.append(Return(code, pc + 2, frame, memo, key))
+            code = promote(fn.function.code)
+            frame = Frame(args + [None] * (code.size - argc), fn.scope)
+            pc = 0
+            if we_are_translated():
+                jitdriver.can_enter_jit(pc=pc, code=code, frame=frame, stack=stack, calls=calls)
+
+        elif op == TAIL_CALL:
+            argc = code.instrs[pc + 1]
+            args = stack[len(stack) - argc:]
+            del stack[len(stack) - argc:]
+            fn = stack.pop()
+
+            assert isinstance(fn, ast.Closure)
+
+            if isinstance(fn.function, MemoFunction):
+                # Memoized callees return through RETURN to store their
+                # result, so they take a frame on the call stack like CALL
+                key = args_key(fn.function, args)
+                if key is not None:
+                    value = fn.function.cache.get(key)
+                    if value is not None:
+                        stack.append(value)
+                        pc += 2
+                        continue
+                    calls.append(Return(code, pc + 2, frame, fn.function, key))
+
+            code = promote(fn.function.code)
+            frame = Frame(args + [None] * (code.size - argc), fn.scope)
+            pc = 0
+            if we_are_translated():
+                jitdriver.can_enter_jit(pc=pc, code=code, frame=frame, stack=stack, calls=calls)
+
+        elif op == RETURN:
+            if not calls:
+                return stack.pop()
+            ret = calls.pop()
+            if ret.key is not None:
+                ret.memo.cache.put(ret.key, stack[-1])
+            code = ret.code
+            frame = ret.frame
+            pc = ret.pc
+
+        elif op == STORE:
+            frame.slots[code.instrs[pc + 1]] = stack.pop()
+            pc += 2
+
+        elif op == FUNCTION:
+            fn = code.functions[code.instrs[pc + 1]].function
+            stack.append(ast.Closure(fn, frame))
+            pc += 2
+
+        elif op == PRINT:
+            box = stack[-1]
+            assert isinstance(box, ast.Value)
+            output.write_line(box.to_str())
+            pc += 1
+
+        elif op == TUPLE:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(ast.Tuple(left, right))
+            pc += 1
+
+        elif op == FIRST:
+            target = stack.pop()
+            assert isinstance(target, ast.Tuple)
+            stack.append(target.left)
+            pc += 1
+
+        elif op == SECOND:
+            target = stack.pop()
+            assert isinstance(target, ast.Tuple)
+            stack.append(target.right)
+            pc += 1
+
+        elif op == LOOKUP:
+            stack.append(frame.lookup(code.consts[code.instrs[pc + 1]].value))
+            pc += 2
+
+        else:
+            raise NotImplementedError('opcode %d' % op)
@@ -3,9 +3,10 @@
 """
 
 import sys
-from rpython.rlib.streamio import open_file_as_stream
+from rpython.rlib.streamio import open_file_as_stream, fdopen_as_stream
 from rpython.jit.codewriter.policy import JitPolicy
 from rinha.interpreter import interpret
+from rinha.output import output, FLUSH_FULL
 
 
 def main(argv):
@@ -13,11 +14,11 @@ def main(argv):
         print __doc__
         return 1
     filename = argv[1]
+    output.attach(fdopen_as_stream(1, 'w'), FLUSH_FULL)
     f = open_file_as_stream(filename)
-    source = f.readall()
+    interpret(f, 'vm')
     f.close()
-
-    interpret(filename, source)
+    output.flush()
     return 0
 
 
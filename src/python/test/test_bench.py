@@ -0,0 +1,20 @@
+from bench.suite import CORPUS, FIELDS, run, table
+from rinha.interpreter import BACKENDS
+
+def test_corpus_runs_everywhere(capfd):
+    for name in sorted(CORPUS):
+        for backend in BACKENDS:
+            result = run(name, backend, 0.01, 1)
+            assert sorted(result) == sorted(FIELDS)
+            assert result['eval_ms'] >= 0
+
+    # Printed output is captured, not written
+    out, _ = capfd.readouterr()
+    assert out == ''
+
+def test_table():
+    result = dict((f, 0) for f in FIELDS)
+    result.update(program='fib', backend='vm', n=25, peak_rss_kb=None)
+    lines = table([result]).splitlines()
+    assert lines[0].split() == FIELDS
+    assert lines[1].split()[:3] == ['fib', 'vm', '25']
@@ -0,0 +1,73 @@
+import os
+
+from rinha import grammar, pratt
+from rinha.cache import ParseCache
+from rinha.interpreter import parse, interpret
+from rinha.serialize import REF
+from test.test_serialize import corrupt
+
+SOURCE = 'let f = fn (x) => { x * 2 }; f(21)'
+
+def test_miss_then_hit(tmpdir):
+    cache = ParseCache(str(tmpdir))
+
+    assert interpret(SOURCE, cache=cache).value == 42
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    assert interpret(SOURCE, cache=cache).value == 42
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache.entries()) == 1
+
+def test_hit_skips_parser(tmpdir, monkeypatch):
+    cache = ParseCache(str(tmpdir))
+    parse(SOURCE, cache)
+
+    def fail(stream):
+        raise AssertionError('parser called on a cache hit')
+
+    monkeypatch.setattr(pratt.parser, 'parse', fail)
+    assert interpret(SOURCE, cache=cache).value == 42
+
+def test_key_depends_on_grammar_version(tmpdir, monkeypatch):
+    cache = ParseCache(str(tmpdir))
+    key = cache.key(SOURCE)
+
+    monkeypatch.setattr('rinha.cache.GRAMMAR_VERSION', grammar.VERSION + 1)
+    assert cache.key(SOURCE) != key
+
+def test_corrupt_entry_is_dropped(tmpdir):
+    cache = ParseCache(str(tmpdir))
+    parse(SOURCE, cache)
+
+    with open(cache.path(SOURCE), 'wb') as f:
+        f.write(b'garbage')
+
+    assert cache.get(SOURCE) is None
+    assert not os.path.exists(cache.path(SOURCE))
+    assert interpret(SOURCE, cache=cache).value == 42
+
+def test_corrupt_operand_is_a_miss(tmpdir):
+    cache = ParseCache(str(tmpdir))
+    parse(SOURCE, cache)
+
+    with open(cache.path(SOURCE), 'rb') as f:
+        data = f.read()
+    with open(cache.path(SOURCE), 'wb') as f:
+        f.write(corrupt(data, REF, 1, 1000))
+
+    assert cache.get(SOURCE) is None
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert not os.path.exists(cache.path(SOURCE))
+    assert interpret(SOURCE, cache=cache).value == 42
+
+def test_eviction(tmpdir):
+    cache = ParseCache(str(tmpdir), max_bytes=1)
+    parse('1 + 1', cache)
+    parse('2 + 2', cache)
+
+    assert cache.evictions == 2
+    assert cache.entries() == []
+
+def test_key_depends_on_parser(tmpdir):
+    cache = ParseCache(str(tmpdir))
+    assert cache.key(SOURCE, 'pratt') != cache.key(SOURCE, 'rply')
@@ -1,6 +1,10 @@
 import os
+import mmap
 
-from rinha.interpreter import interpret
+from pytest import mark
+
+from rinha import ast
+from rinha.interpreter import interpret, BACKENDS
 
 def interpret_file(filename):
     with open('src/rinha/%s' % filename) as f:
@@ -30,13 +34,28 @@ def test_sample_file_geometry(capfd):
     assert out == 'scalene\n'
     assert err == ''
 
-# def test_sample_file_combination(capfd):
-#     result = interpret_file('combination.rinha')
-#     assert result.value == 55
-    
-#     out, err = capfd.readouterr()
-#     assert out == '55\n'
-#     assert err == ''
+def test_sample_file_combination(capfd):
+    result = interpret_file('combination.rinha')
+    assert result.value == 45
+
+    out, err = capfd.readouterr()
+    assert out == '45\n'
+    assert err == ''
+
+def test_file_object(capfd):
+    with open('src/rinha/fib.rinha', 'rb') as f:
+        interpret(f)
+
+    out, err = capfd.readouterr()
+    assert out == '@!compile::\n@!fibbo::55\n'
+
+def test_mmap(capfd):
+    with open('src/rinha/combination.rinha', 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            assert interpret(data, 'vm').value == 45
+        finally:
+            data.close()
 
 def test_sample_file_square(capfd):
     result = interpret_file('square.rinha')
@@ -146,9 +165,128 @@ def test_bool_algebra():
     result = interpret('false || true')
     assert result.value == True
 
+def test_short_circuit(capfd):
+    result = interpret('(1 == 2) && print(1)')
+    assert result.value == False
+
+    result = interpret('(1 == 1) || print(2)')
+    assert result.value == True
+
+    # Recursion on the right stops once the left side decides
+    result = interpret('let f = fn (n) => { (n == 0) || f(n - 1) }; f(100)')
+    assert result.value == True
+
+    out, _ = capfd.readouterr()
+    assert out == ''
+
 def test_let():
     result = interpret('let x = 1; x')
     assert result.value == 1
     
     result = interpret('let x = 1 + 2; x')
     assert result.value == 3
+
+def test_closure():
+    result = interpret('let add = fn (x) => { fn (y) => { x + y } }; let inc = add(1); inc(2)')
+    assert result.value == 3
+
+    result = interpret('let x = 1; let f = fn () => { x }; let g = fn (x) => { f() }; g(2)')
+    assert result.value == 1
+
+def test_call_does_not_leak_locals():
+    result = interpret('let x = 1; let f = fn (x) => { let y = x; y }; let _ = f(2); x')
+    assert result.value == 1
+
+def test_tail_calls():
+    result = interpret('''
+        let loop = fn (n, acc) => {
+            let m = (n - 1);
+            if (n == 0) { acc } else { loop(m, acc + n) }
+        };
+        loop(100000, 0)
+    ''')
+    assert result.value == 5000050000
+
+def test_mutual_tail_calls():
+    result = interpret('''
+        let even = fn (n) => { if (n == 0) { true } else { odd(n - 1) } };
+        let odd = fn (n) => { if (n == 0) { false } else { even(n - 1) } };
+        even(100001)
+    ''')
+    assert result.value == False
+
+def test_interned_values():
+    assert interpret('1 < 2') is ast.TRUE
+    assert interpret('2 == 3') is ast.FALSE
+    assert interpret('1 + 1') is interpret('4 / 2')
+    assert interpret('1000 * 1000').value == 1000000
+
+def test_print_comparison(capfd):
+    interpret('print(1 < 2)')
+    out, err = capfd.readouterr()
+    assert out == 'true\n'
+
+@mark.parametrize('backend', BACKENDS)
+def test_bigint(backend):
+    source = 'let fact = fn (n) => { if (n == 0) { 1 } else { n * fact(n - 1) } }; fact(30)'
+    result = interpret(source, backend)
+    assert isinstance(result, ast.BigInt)
+    assert result.to_str() == '265252859812191058636308480000000'
+
+    # Back to a word once the result fits again
+    result = interpret('let big = 9223372036854775807 + 1; big - 2', backend)
+    assert isinstance(result, ast.Int)
+    assert result.value == 9223372036854775806
+
+    result = interpret('99999999999999999999999 % (0 - 7)', backend)
+    assert result.to_str() == str(99999999999999999999999 % 7)
+
+    result = interpret('(0 - 99999999999999999999999) / 10', backend)
+    assert result.to_str() == str(-99999999999999999999999 // 10)
+
+    result = interpret('"n = " + 99999999999999999999999', backend)
+    assert result.to_str() == 'n = 99999999999999999999999'
+
+@mark.parametrize('backend', BACKENDS)
+def test_bigint_in_tuple(backend, capfd):
+    interpret('print((100000000000000000000, 1))', backend)
+    interpret('print(("x", (true, 0 - 100000000000000000000)))', backend)
+    assert capfd.readouterr() == (
+        "(100000000000000000000, 1)\n('x', (True, -100000000000000000000))\n", ''
+    )
+
+def test_bigint_comparison():
+    big = '(9223372036854775807 * 4)'
+    assert interpret('%s > 1' % big) is ast.TRUE
+    assert interpret('%s < 1' % big) is ast.FALSE
+    assert interpret('%s == %s' % (big, big)) is ast.TRUE
+    assert interpret('%s != %s + 1' % (big, big)) is ast.TRUE
+    assert interpret('%s == "x"' % big) is ast.FALSE
+    assert interpret('%s >= 0 - %s' % (big, big)) is ast.TRUE
+
+@mark.parametrize('backend', BACKENDS)
+def test_string_accumulation(backend, capfd):
+    source = '''
+let repeat = fn (s, n, acc) => { if (n == 0) { acc } else { repeat(s, n - 1, acc + s) } };
+let s = repeat("ab", 5000, "");
+let _ = print(s == repeat("abab", 2500, ""));
+s + 1
+'''
+    result = interpret(source, backend)
+    assert result.to_str() == 'ab' * 5000 + '1'
+    out, _ = capfd.readouterr()
+    assert out == 'true\n'
+
+def test_ropes():
+    short = ast.concat(ast.Str('a'), ast.Int(1))
+    assert short.text == 'a1'
+
+    rope = ast.Str('')
+    for i in range(1000):
+        rope = ast.concat(rope, ast.Str('%03d' % i))
+    assert rope.text is None
+    assert rope.length == 3000
+
+    # Flattened once, iteratively, however deep the rope is
+    assert rope.to_str() == ''.join('%03d' % i for i in range(1000))
+    assert rope.text is not None and rope.left is None
@@ -1,3 +1,4 @@
+import io
 from rply import LexingError
 from rinha.lexical import lexer
 from pytest import raises
@@ -718,4 +719,76 @@ def test_let_declaration_if_boolean():
     assert token.value == '}'
 
     with raises(StopIteration):
-        stream.next()
\ No newline at end of file
+        stream.next()
+
+def test_keyword_prefixed_identifiers():
+    stream = lexer.lex('letter iffy fnord print_x')
+
+    for value in ['letter', 'iffy', 'fnord', 'print_x']:
+        token = stream.next()
+        assert token.name == 'IDENTIFIER'
+        assert token.value == value
+
+    with raises(StopIteration):
+        stream.next()
+
+
+def test_comments_between_tokens():
+    stream = lexer.lex('/* a */ print /* b */ print // c')
+
+    assert [token.name for token in stream] == ['PRINT', 'PRINT']
+
+
+def test_unexpected_character():
+    stream = lexer.lex('print @')
+    stream.next()
+
+    with raises(LexingError):
+        stream.next()
+
+
+def test_source_positions():
+    stream = lexer.lex('let x = 1;\n  /* two\n lines */ print(x)')
+
+    positions = [(t.name, t.getsourcepos().lineno, t.getsourcepos().colno) for t in stream]
+
+    assert positions[:2] == [('LET', 1, 1), ('IDENTIFIER', 1, 5)]
+    assert positions[5:7] == [('PRINT', 3, 11), ('OPEN_PARENS', 3, 16)]
+
+
+def test_token_offsets():
+    source = 'print("hello")'
+    token = list(lexer.lex(source))[2]
+
+    assert token.source is source
+    assert (token.start, token.end) == (6, 13)
+    assert token.getsourcepos().idx == 6
+
+
+def test_file_matches_string():
+    with open('src/rinha/geom.rinha') as f:
+        source = f.read() + '/* a\nmultiline\ncomment */ "ok"'
+
+    def tokens(stream):
+        return [(t.name, t.value, t.getsourcepos().lineno, t.getsourcepos().colno) for t in stream]
+
+    expected = tokens(lexer.lex(source))
+    for chunk in [1, 3, 16, 4096]:
+        assert tokens(lexer.lex_file(io.StringIO(u'' + source), chunk)) == expected
+        assert tokens(lexer.lex_file(io.BytesIO(source.encode('utf-8')), chunk)) == expected
+
+
+def test_file_keeps_one_buffer():
+    source = 'let x = 1;\n' * 1000 + 'x'
+    stream = lexer.lex_file(io.BytesIO(source.encode('utf-8')), 64)
+
+    for token in stream:
+        assert len(stream.source) < 128
+
+
+def test_file_unterminated_comment():
+    stream = lexer.lex_file(io.BytesIO(b'print /* never\nclosed'), 4)
+    stream.next()
+
+    with raises(LexingError):
+        stream.next()
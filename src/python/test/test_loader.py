@@ -0,0 +1,63 @@
+from pytest import mark, raises
+
+from rinha import ast
+from rinha.interpreter import execute
+from rinha import loader
+from rinha.loader import load, loads
+
+def load_file(filename):
+    with open('src/json/%s' % filename) as f:
+        return load(f)
+
+@mark.parametrize('filename, out', [
+    ('print.json', 'Hello world\n'),
+    ('fib.json', '55\n'),
+    ('sum.json', '15\n'),
+    ('combination.json', '45\n'),
+])
+def test_sample_files(filename, out, capfd):
+    for backend in ['tree', 'vm']:
+        execute(load_file(filename), backend)
+        assert capfd.readouterr() == (out, '')
+
+def test_tree_shape():
+    tree = load_file('sum.json')
+    assert isinstance(tree, ast.Let)
+    assert tree.identif == 'sum'
+    assert isinstance(tree.expr, ast.Function)
+    assert tree.expr.params.ids == ['n']
+    assert isinstance(tree.expr.body, ast.If)
+    assert isinstance(tree.expr.body.condition, ast.Eq)
+
+def test_tuples_and_booleans():
+    tree = loads('''{"name": "t.rinha", "expression": {
+        "kind": "Let", "name": {"text": "t"},
+        "value": {"kind": "Tuple", "first": {"kind": "Bool", "value": true},
+                                   "second": {"kind": "Str", "value": "x"}},
+        "next": {"kind": "Second", "value": {"kind": "Var", "text": "t"}}
+    }}''')
+    result = execute(tree)
+    assert isinstance(result, ast.Str)
+    assert result.value == 'x'
+
+def test_deep_let_chain():
+    depth = 3000
+    lets = ''.join(
+        '{"kind": "Let", "name": {"text": "x%d"}, "value": {"kind": "Int", "value": %d}, "next": ' % (i, i)
+        for i in range(depth)
+    )
+    tree = loads('{"name": "deep.rinha", "expression": %s{"kind": "Var", "text": "x%d"}%s}' % (
+        lets, depth - 1, '}' * depth,
+    ))
+    assert execute(tree).value == depth - 1
+
+@mark.parametrize('filename, out', [('fib.json', '55\n'), ('combination.json', '45\n')])
+def test_small_chunks(filename, out, monkeypatch, capfd):
+    monkeypatch.setattr(loader, 'CHUNK_SIZE', 7)
+    execute(load_file(filename))
+    assert capfd.readouterr() == (out, '')
+
+@mark.parametrize('source', ['{"kind": "Int", "value": }', '[1, 2,]', '{"a" 1}', '{"kind": "Bool", "value": true} 1', '[1'])
+def test_invalid_json(source):
+    with raises(ValueError):
+        loads(source)
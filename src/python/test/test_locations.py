@@ -0,0 +1,107 @@
+import json
+import sys
+
+from pytest import mark, raises
+
+from rinha import ast
+from rinha.interpreter import parse, execute, PARSERS
+from rinha.locations import Locations
+from rinha.resolver import resolve
+from rinha.memo import memoize, LRUCache, MemoFunction
+from rinha.exporter import dumps, export
+from rinha.loader import loads
+from rinha import serialize
+
+SOURCE = '''let add = fn (a, b) => {
+    a + b
+};
+let pair = (add(1, 2), "x");
+print(first(pair))
+'''
+
+def located(source, parser = 'pratt'):
+    locations = Locations()
+    return parse(source, parser=parser, locations=locations), locations
+
+def text(source, locations, node):
+    start, end = locations.span(node)
+    return source[start:end]
+
+@mark.parametrize('parser', PARSERS)
+def test_spans(parser):
+    tree, locations = located(SOURCE, parser)
+    fn = tree.expr
+    pair = tree.next.expr
+
+    assert text(SOURCE, locations, tree) == SOURCE.strip()
+    assert text(SOURCE, locations, fn) == 'fn (a, b) => {\n    a + b\n}'
+    assert text(SOURCE, locations, fn.body) == 'a + b'
+    assert text(SOURCE, locations, pair) == '(add(1, 2), "x")'
+    assert text(SOURCE, locations, pair.left) == 'add(1, 2)'
+    assert text(SOURCE, locations, pair.right) == '"x"'
+    assert text(SOURCE, locations, tree.next.next) == 'print(first(pair))'
+
+    assert locations.line(fn.body) == 2
+    assert locations.line(tree.next.next) == 5
+
+@mark.parametrize('source', [
+    SOURCE,
+    'let x = if (1 < 2) { ((1 + 2)) * 3 } else { 0 };\nlet f = fn () => { x };\nif (x < 0) { f() } else { (f(), x) }',
+])
+def test_parsers_agree(source):
+    pratt, pratt_locations = located(source, 'pratt')
+    rply, rply_locations = located(source, 'rply')
+    assert pratt_locations.spans == rply_locations.spans
+    assert pratt_locations.lines == rply_locations.lines
+
+def test_untouched_without_table():
+    tree = parse(SOURCE)
+    assert tree not in Locations()
+    assert Locations().line(tree) == 0
+
+def test_resolved_nodes_keep_locations():
+    tree, locations = located('let f = fn (n) => { g(n) };\nlet g = fn (n) => { n };\nf(1)')
+    program = resolve(tree, locations)
+    fn = program.body.expr
+    assert isinstance(fn, ast.SlotFunction)
+    assert locations.line(fn) == 1
+    assert isinstance(fn.body, ast.TailCall)
+    assert locations.line(fn.body) == 1
+    assert locations.line(program.body.next.next) == 3
+
+def test_memoized_functions_keep_locations():
+    tree, locations = located('let sq = fn (n) => { n * n };\nsq(3)')
+    program = memoize(resolve(tree, locations), LRUCache(), locations)
+    assert isinstance(program.body.expr, MemoFunction)
+    assert locations.span(program.body.expr) == (9, 28)
+
+def test_failed_node():
+    source = 'let f = fn (x) => {\n    x + first(1)\n};\nf(2)'
+    tree, locations = located(source)
+    with raises(AssertionError):
+        try:
+            execute(tree, 'tree', locations=locations)
+        except AssertionError:
+            node = locations.failed(sys.exc_info()[2])
+            assert isinstance(node, ast.First)
+            assert locations.line(node) == 2
+            raise
+
+def test_export_round_trip(capfd):
+    tree, locations = located(SOURCE)
+    obj = export(tree, locations, 'pair.rinha')
+    assert obj['name'] == 'pair.rinha'
+    assert obj['expression']['kind'] == 'Let'
+    assert obj['expression']['value']['location'] == {'start': 10, 'end': 36, 'filename': 'pair.rinha'}
+
+    execute(loads(dumps(tree, locations)))
+    assert capfd.readouterr() == ('3\n', '')
+
+def test_dumps_matches_export():
+    tree, locations = located(SOURCE)
+    assert json.loads(dumps(tree, locations)) == export(tree, locations)
+
+def test_export_deep_let_chain():
+    source = ''.join('let x%d = %d;\n' % (i, i) for i in range(3000)) + 'x2999'
+    tree = parse(source)
+    assert serialize.dumps(loads(dumps(tree))) == serialize.dumps(tree)
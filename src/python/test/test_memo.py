@@ -0,0 +1,68 @@
+from rinha.lexical import lexer
+from rinha.grammar import parser
+from rinha.resolver import resolve
+from rinha.interpreter import interpret
+from rinha.memo import LRUCache, pure_functions
+
+def pure_names(source):
+    program = resolve(parser.parse(lexer.lex(source)))
+    pure = pure_functions(program)
+
+    names = []
+    term = program.body
+    while hasattr(term, 'next'):
+        if term.expr in pure:
+            names.append(term.identif)
+        term = term.next
+    return names
+
+FIB = 'let fib = fn (n) => { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };'
+
+def test_purity():
+    assert pure_names(FIB + 'fib(10)') == ['fib']
+    assert pure_names('let f = fn (n) => { print(n) }; f(1)') == []
+    assert pure_names('let f = fn (n) => { print(n) }; let g = fn (n) => { f(n) + 1 }; g(1)') == []
+    assert pure_names('let apply = fn (f, n) => { f(n) + 0 }; apply') == []
+    assert pure_names('let k = 1; let f = fn (n) => { n + k }; f(1)') == []
+    assert pure_names('let loop = fn (n) => { if (n == 0) { 0 } else { loop(n - 1) } }; loop(1)') == []
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_memoized_fib():
+    for backend in ['tree', 'vm']:
+        memo = LRUCache(128)
+        result = interpret(FIB + 'fib(60)', backend, memo)
+        assert result.value == 1548008755920
+        assert memo.misses == 61
+        assert memo.hits == 58
+
+def test_memoized_callee_in_tail_position():
+    source = '''
+let square = fn (n) => { n * n };
+let apply = fn (n) => { square(n % 5) };
+let loop = fn (i, acc) => { if (i == 0) { acc } else { loop(i - 1, acc + apply(i)) } };
+loop(50, 0)
+'''
+    for backend in ['tree', 'vm']:
+        memo = LRUCache()
+        assert interpret(source, backend, memo).value == 300
+        assert (memo.hits, memo.misses) == (45, 5)
+
+def test_impure_functions_are_not_cached(capfd):
+    source = 'let f = fn (n) => { print(n) }; let _ = f(1); f(1)'
+    for backend in ['tree', 'vm']:
+        memo = LRUCache(128)
+        interpret(source, backend, memo)
+        out, err = capfd.readouterr()
+        assert out == '1\n1\n'
+        assert memo.hits == 0
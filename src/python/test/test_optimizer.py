@@ -0,0 +1,148 @@
+from pytest import mark, raises
+
+from rinha import ast
+from rinha.lexical import lexer
+from rinha.pratt import parser
+from rinha.optimizer import optimize, children
+from rinha.interpreter import interpret
+from test.test_vm import SAMPLES, SNIPPETS
+
+def optimized(source):
+    return optimize(parser.parse(lexer.lex(source)))
+
+def run_both(source, capfd, backend):
+    expected = interpret(source, backend)
+    expected_out = capfd.readouterr()
+
+    result = interpret(source, backend, optimize=True)
+    out = capfd.readouterr()
+
+    assert result.to_str() == expected.to_str()
+    assert out == expected_out
+
+@mark.parametrize('backend', ['tree', 'vm'])
+@mark.parametrize('filename', SAMPLES + ['combination.rinha'])
+def test_sample_files(filename, backend, capfd):
+    with open('src/rinha/%s' % filename) as f:
+        run_both(f.read(), capfd, backend)
+
+@mark.parametrize('backend', ['tree', 'vm'])
+@mark.parametrize('source', SNIPPETS + [
+    'first((print(1), print(2)))',
+    'second((print(1), 2))',
+    'if (print(true)) { 1 } else { 2 }',
+    'print(1) + print(2)',
+])
+def test_snippets(source, backend, capfd):
+    run_both(source, capfd, backend)
+
+
+def test_fold_arithmetic():
+    term = optimized('1 + 2 * 3 - 4 / 2')
+
+    assert isinstance(term, ast.Int)
+    assert term.value == 5
+
+    term = optimized('"n = " + (2 * 21) == "n = 42"')
+    assert term is ast.TRUE
+
+
+def test_fold_short_circuit():
+    assert optimized('false && print(1)') is ast.FALSE
+    assert optimized('true || f(1)') is ast.TRUE
+
+    term = optimized('true && print(1)')
+    assert isinstance(term, ast.And)
+
+def test_fold_inside_functions():
+    term = optimized('let f = fn (x) => { x + (60 * 60) }; f(1)')
+
+    assert isinstance(term.expr.body, ast.Add)
+    assert term.expr.body.right.value == 3600
+
+
+def test_dead_branches():
+    term = optimized('if (1 < 2) { print("then") } else { print("else") }')
+
+    assert isinstance(term, ast.Print)
+    assert term.expr.value == 'then'
+
+
+def test_literal_tuples():
+    term = optimized('(1, "a")')
+    assert isinstance(term, ast.Tuple)
+
+    assert optimized('second((1, "a"))').value == 'a'
+    assert isinstance(optimized('first((f(1), 2))'), ast.Call)
+
+
+def test_side_effects_kept():
+    term = optimized('first((1, print(2)))')
+    assert isinstance(term, ast.First)
+
+    term = optimized('if (print(true)) { 1 } else { 2 }')
+    assert isinstance(term, ast.If)
+
+
+def test_errors_left_to_runtime():
+    term = optimized('if (true) { 1 } else { 1 / 0 }')
+    assert term.value == 1
+
+    term = optimized('1 / 0')
+    assert isinstance(term, ast.Div)
+
+    with raises(ZeroDivisionError):
+        interpret('1 / 0', optimize=True)
+
+
+def inlined_calls(term):
+    calls = []
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, ast.Call):
+            calls.append(term.callee.identif)
+        stack.extend(children(term))
+    return calls
+
+@mark.parametrize('backend', ['tree', 'vm'])
+@mark.parametrize('source', [
+    'let square = fn (n) => { n * n }; let n = 3; square(n + 1) + n',
+    'let f = fn (x) => { let y = (x * 2); y + 1 }; let y = 10; f(y) + y',
+    'let add = fn (x) => { fn (y) => { x + y } }; let inc = add(1); inc(2) + add(5)(5)',
+    'let k = 10; let f = fn (x) => { x + k }; let g = fn (k) => { f(k) }; g(1)',
+    'let f = fn (x) => { let y = (x * 2); fn (x) => { x + y } }; f(1)(2)',
+    'let apply = fn (f, x) => { f(f, x) }; let stop = fn (f, x) => { x }; apply(stop, 1)',
+    'let f = fn (a, b) => { let _ = print(b); a }; f(print(1), print(2))',
+])
+def test_inlining_snippets(source, backend, capfd):
+    run_both(source, capfd, backend)
+
+
+def test_inline_small_functions():
+    with open('src/rinha/square.rinha') as f:
+        term = optimized(f.read())
+
+    result = term.next.next
+    assert result.identif == 'result'
+    assert inlined_calls(result.expr) == []
+    assert interpret('let s = fn (n) => { n * n }; s(4)', optimize=True).value == 16
+
+
+def test_recursive_functions_not_inlined():
+    with open('src/rinha/fib.rinha') as f:
+        term = optimized(f.read())
+
+    assert sorted(inlined_calls(term)) == ['fibbo', 'fibbo', 'fibbo']
+
+
+def test_shadowed_names_not_inlined():
+    term = optimized('let k = 10; let f = fn (x) => { x + k }; let g = fn (k) => { f(k) }; g(1)')
+
+    assert inlined_calls(term.next.next.next) == ['f']
+
+
+def test_higher_order_depth_is_bounded():
+    term = optimized('let apply = fn (f, x) => { f(f, x) }; apply(apply, 1)')
+
+    assert inlined_calls(term.next) == ['apply']
@@ -0,0 +1,62 @@
+from pytest import raises
+
+from rinha.interpreter import interpret
+from rinha.output import Output, Capture, output, FLUSH_FULL, FLUSH_LINE
+
+class Counting(Capture):
+    def __init__(self):
+        Capture.__init__(self)
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+
+def test_capture():
+    captured = output.capture()
+    try:
+        interpret('let _ = print("a"); print(1 + 1)', backend='vm')
+        assert captured.getvalue() == 'a\n2\n'
+    finally:
+        output.attach()
+
+def test_full_buffer_batches_writes():
+    stream = Counting()
+    out = Output(stream, FLUSH_FULL, size=16)
+    for i in range(10):
+        out.write_line('line %d' % i)
+    assert len(stream.pieces) == 4
+    out.flush()
+    assert stream.getvalue() == ''.join('line %d\n' % i for i in range(10))
+
+def test_line_policy_flushes_every_line():
+    stream = Counting()
+    out = Output(stream, FLUSH_LINE)
+    out.write_line('a')
+    out.write_line('b')
+    assert stream.pieces == [b'a\n', b'b\n']
+    assert stream.flushes == 2
+
+def test_lines_longer_than_the_buffer():
+    stream = Capture()
+    out = Output(stream, FLUSH_FULL, size=8)
+    out.write_line('ab')
+    out.write_line('x' * 20)
+    out.write_line('cd')
+    out.flush()
+    assert stream.getvalue() == 'ab\n' + 'x' * 20 + '\ncd\n'
+
+def test_unicode():
+    stream = Capture()
+    out = Output(stream)
+    out.write_line(u'ol\xe1')
+    assert stream.getvalue() == u'ol\xe1\n'
+
+def test_flushed_when_program_fails():
+    stream = Capture()
+    output.attach(stream, FLUSH_FULL)
+    try:
+        with raises(ZeroDivisionError):
+            interpret('let _ = print("before"); 1 / 0')
+        assert stream.getvalue() == 'before\n'
+    finally:
+        output.attach()
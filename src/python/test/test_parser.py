@@ -1,5 +1,8 @@
 from rinha import ast
+from rinha.env import Scope
+from rinha import grammar, parsetab, serialize
 from rinha.grammar import parser
+from rinha.lexical import lexer
 from rply.token import Token
 
 def test_string():
@@ -173,7 +176,7 @@ def test_second_literal():
 
 
 def test_first_reference():
-    scope = {'pair' : ast.Tuple(ast.Str('x'), ast.Str('y'))}
+    scope = Scope({'pair' : ast.Tuple(ast.Str('x'), ast.Str('y'))})
     
     tokens = iter([
         Token('FIRST', 'first'),
@@ -189,7 +192,7 @@ def test_first_reference():
     assert result.value == 'x'
 
 def test_second_reference():
-    scope = {'pair' : ast.Tuple(ast.Str('x'), ast.Str('y'))}
+    scope = Scope({'pair' : ast.Tuple(ast.Str('x'), ast.Str('y'))})
     
     tokens = iter([
         Token('SECOND', 'second'),
@@ -205,7 +208,7 @@ def test_second_reference():
     assert result.value == 'y'
 
 def test_let(capfd):
-    scope = {}
+    scope = Scope()
     
     tokens = iter([
         Token('LET', 'let'),
@@ -234,3 +237,36 @@ def test_let(capfd):
     assert out == '123\n'
     assert err == ''
 
+
+def test_compact_nodes():
+    tokens = iter([
+        Token('DIGITS', '123'),
+        Token('PLUS', '+'),
+        Token('IDENTIFIER', 'x'),
+    ])
+
+    expr = parser.parse(tokens)
+
+    for node in [expr, expr.left, expr.right]:
+        assert not hasattr(node, '__dict__')
+
+
+def test_precomputed_tables():
+    assert parsetab.SIGNATURE == grammar.signature(grammar.grammar())
+    assert parser.lr_table.lr_action is parsetab.LR_ACTION
+
+
+def parse_image(parser, source):
+    try:
+        return serialize.dumps(parser.parse(lexer.lex(source)))
+    except ValueError as e:
+        return str(e)
+
+
+def test_precomputed_tables_match_generator():
+    built = grammar.pg.build()
+
+    for filename in ['print.rinha', 'fib.rinha', 'combination.rinha', 'geom.rinha', 'sum.rinha']:
+        with open('src/rinha/%s' % filename) as f:
+            source = f.read()
+        assert parse_image(parser, source) == parse_image(built, source)
@@ -0,0 +1,85 @@
+from pytest import mark, raises
+
+from rinha import ast, serialize
+from rinha.lexical import lexer
+from rinha.grammar import parser as rply_parser
+from rinha.pratt import parser
+from rinha.interpreter import interpret
+
+def parse(source):
+    return parser.parse(lexer.lex(source))
+
+
+@mark.parametrize('filename', ['print.rinha', 'source.rinha', 'square.rinha', 'sum.rinha'])
+def test_same_trees_as_rply(filename):
+    with open('src/rinha/%s' % filename) as f:
+        source = f.read()
+
+    expected = rply_parser.parse(lexer.lex(source))
+    assert serialize.dumps(parse(source)) == serialize.dumps(expected)
+
+
+def test_precedence():
+    term = parse('1 + 2 * 3 == 7 && a || b')
+
+    assert isinstance(term, ast.Or)
+    assert isinstance(term.left, ast.And)
+    assert isinstance(term.left.left, ast.Eq)
+    assert isinstance(term.left.left.left, ast.Add)
+    assert isinstance(term.left.left.left.right, ast.Mul)
+
+
+def test_left_associative():
+    term = parse('1 - 2 - 3')
+
+    assert isinstance(term, ast.Sub)
+    assert isinstance(term.left, ast.Sub)
+    assert term.right.value == 3
+    assert interpret('10 - 4 - 3').value == 3
+    assert interpret('let x = 1 + 2; x').value == 3
+
+
+def test_trailing_commas():
+    term = parse('let f = fn (x, y,) => { x }; f(1, 2,)')
+
+    assert term.expr.params.ids == ['x', 'y']
+    assert len(term.next.args.exprs) == 2
+
+
+def test_trailing_semicolons():
+    assert interpret('let f = fn () => { print(1); }; f();').value == 1
+
+
+def test_chained_calls():
+    assert interpret('let add = fn (x) => { fn (y) => { x + y } }; add(1)(2)').value == 3
+
+
+def test_tuple_and_parens():
+    term = parse('((1), (2, 3))')
+
+    assert isinstance(term, ast.Pair)
+    assert isinstance(term.left, ast.Int)
+    assert isinstance(term.right, ast.Pair)
+
+
+def test_long_let_chain():
+    source = ''.join('let x%d = %d; ' % (i, i) for i in range(5000)) + 'x4999'
+    term = parse(source)
+
+    depth = 0
+    while isinstance(term, ast.Let):
+        term = term.next
+        depth += 1
+    assert depth == 5000
+
+
+def test_many_arguments():
+    term = parse('f(%s)' % ', '.join(str(i) for i in range(5000)))
+
+    assert [e.value for e in term.args.exprs] == list(range(5000))
+
+
+def test_syntax_errors():
+    for source in ['let x = 1', '1 +', 'if (1) { 2 }', 'fn (1) => 2', ')', 'fn (x y) => { x }']:
+        with raises(ValueError):
+            parse(source)
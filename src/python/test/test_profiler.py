@@ -0,0 +1,65 @@
+from pytest import raises
+
+from rinha import ast
+from rinha.interpreter import parse, execute
+from rinha.profiler import Profiler
+from rinha.locations import Locations
+
+FIB = '''let fib = fn (n) => {
+    if (n < 2) { n } else { fib(n - 1) + fib(n - 2) }
+};
+fib(10)
+'''
+
+def profiled(source, **kwargs):
+    profiler = Profiler()
+    locations = Locations()
+    tree = parse(source, locations=locations, **kwargs)
+    result = execute(tree, 'tree', profiler=profiler, locations=locations)
+    return profiler, result
+
+def test_same_result():
+    profiler, result = profiled(FIB)
+    assert result.value == 55
+
+def test_function_calls():
+    profiler, _ = profiled(FIB)
+    assert profiler.calls['fib:1'] == 177
+    assert [label for _, _, label in profiler.hot()] == ['fib:1']
+    assert 'fib:1' in profiler.report()
+
+def test_collapsed_stacks():
+    profiler, _ = profiled(FIB)
+    lines = profiler.collapsed().splitlines()
+    stacks = [line.rsplit(' ', 1)[0] for line in lines]
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+    assert '<main>;Call:4;fib:1;If:2' in stacks
+    assert '<main>;Call:4;fib:1;If:2;Add:2;Call:2;fib:1;If:2;Lt:2' in stacks
+
+def test_tail_calls_replace_frames():
+    source = 'let f = fn (n) => { if (n == 0) { 0 } else { g(n - 1) } }; let g = fn (n) => { f(n) }; f(3)'
+    profiler, _ = profiled(source)
+    stacks = [line.rsplit(' ', 1)[0] for line in profiler.collapsed().splitlines()]
+    assert '<main>;Call:1;g:1' in stacks
+    assert not any('f:1;If:1;TailCall:1;g:1' in s for s in stacks)
+
+def test_lines_from_both_parsers():
+    for parser in ['pratt', 'rply']:
+        profiler, _ = profiled(FIB, parser=parser)
+        assert sorted(profiler.functions) == ['fib:1']
+
+def test_unlabelled_without_locations():
+    profiler = Profiler()
+    execute(parse(FIB), 'tree', profiler=profiler)
+    assert sorted(profiler.functions) == ['fib']
+    assert '<main>;Call;fib;If' in profiler.collapsed()
+
+def test_tree_backend_only():
+    with raises(ValueError):
+        execute(parse(FIB), 'vm', profiler=Profiler())
+
+def test_untouched_without_profiler():
+    tree = parse(FIB)
+    execute(tree, 'tree')
+    assert isinstance(tree.expr.body, ast.If)
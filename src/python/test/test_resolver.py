@@ -0,0 +1,88 @@
+from pytest import raises
+
+from rinha import ast
+from rinha.lexical import lexer
+from rinha.grammar import parser
+from rinha.resolver import resolve
+from rinha.interpreter import parse, execute, BACKENDS
+from rinha.memo import LRUCache
+
+def resolve_source(source):
+    return resolve(parser.parse(lexer.lex(source)))
+
+def test_top_level_slots():
+    program = resolve_source('let x = 1; let y = 2; x + y')
+    assert isinstance(program, ast.Program)
+    assert program.size == 2
+
+    let_x = program.body
+    let_y = let_x.next
+    assert isinstance(let_x, ast.SlotLet) and let_x.slot == 0
+    assert isinstance(let_y, ast.SlotLet) and let_y.slot == 1
+
+    add = let_y.next
+    assert (add.left.depth, add.left.slot) == (0, 0)
+    assert (add.right.depth, add.right.slot) == (0, 1)
+
+def test_rebinding_reuses_slot():
+    program = resolve_source('let x = 1; let x = (x + 1); x')
+    assert program.size == 1
+    assert program.eval().value == 2
+
+def test_function_frames():
+    program = resolve_source('let f = fn (a, b) => { let c = a; c + b }; f(1, 2)')
+    fn = program.body.expr
+    assert isinstance(fn, ast.SlotFunction)
+    assert fn.size == 3
+
+    body = fn.body
+    assert (body.expr.depth, body.expr.slot) == (0, 0)
+    assert (body.next.right.depth, body.next.right.slot) == (0, 1)
+    assert program.eval().value == 3
+
+def test_outer_references():
+    program = resolve_source('let f = fn (x) => { fn (y) => { x + y } }; let g = f(1); g(2)')
+    inner = program.body.expr.body
+    assert (inner.body.left.depth, inner.body.left.slot) == (1, 0)
+    assert (inner.body.right.depth, inner.body.right.slot) == (0, 0)
+    assert program.eval().value == 3
+
+def test_forward_reference():
+    program = resolve_source('let f = fn () => { g() }; let g = fn () => { 42 }; f()')
+    assert program.eval().value == 42
+
+def test_unbound_reference():
+    program = resolve_source('let f = fn () => { y }; f()')
+    with raises(KeyError):
+        program.eval()
+
+def test_let_in_one_branch():
+    source = 'let x = 1; let f = fn (c) => { if (c) { let x = 2; x } else { x } }; (f(true), f(false))'
+    fn = resolve_source(source).body.next.expr
+    otherwise = fn.body.otherwise
+    assert (otherwise.depth, otherwise.slot) == (0, 1)
+    assert (otherwise.fallback.depth, otherwise.fallback.slot) == (1, 0)
+    for backend in BACKENDS:
+        assert execute(parse(source), backend).to_str() == '(2, 1)'
+
+def test_let_after_inner_call():
+    source = 'let x = 1; let f = fn () => { let g = fn () => { x }; let r = g(); let x = 2; (r, g()) }; f()'
+    for backend in BACKENDS:
+        assert execute(parse(source), backend).to_str() == '(1, 2)'
+
+def test_surely_bound_has_no_fallback():
+    program = resolve_source('let x = 1; let f = fn () => { x }; if (true) { let y = 2; y } else { f() }')
+    assert program.body.next.expr.body.fallback is None
+    assert program.body.next.next.then.next.fallback is None
+
+def test_long_let_chain():
+    source = ''.join('let x%d = %d;\n' % (i, i) for i in range(5000)) + 'x0 + x4999'
+    for backend in BACKENDS:
+        assert execute(parse(source), backend).value == 4999
+    assert execute(parse(source), 'tree', LRUCache(), True).value == 4999
+
+def test_long_let_chain_in_function():
+    lets = ''.join('let x%d = n + %d;\n' % (i, i) for i in range(3000))
+    source = 'let f = fn (n) => {\n' + lets + 'g(x2999)\n};\nlet g = fn (n) => { n };\nf(1)'
+    for backend in BACKENDS:
+        assert execute(parse(source), backend).value == 3000
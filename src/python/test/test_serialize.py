@@ -0,0 +1,108 @@
+from pytest import mark, raises
+
+from rinha import ast
+from rinha.interpreter import parse, execute
+from rinha.serialize import dump, dumps, load, loads, open_image, Image, HEADER, NODE, REF, CALL
+
+SAMPLES = ['print.rinha', 'fib.rinha', 'geom.rinha', 'square.rinha', 'sum.rinha']
+
+def parse_file(filename):
+    with open('src/rinha/%s' % filename) as f:
+        return parse(f.read())
+
+@mark.parametrize('filename', SAMPLES)
+def test_roundtrip(filename, capfd):
+    tree = parse_file(filename)
+    data = dumps(tree)
+    assert data == dumps(loads(data))
+
+    expected = execute(parse_file(filename))
+    expected_out = capfd.readouterr()
+
+    result = execute(loads(data))
+    assert result.to_str() == expected.to_str()
+    assert capfd.readouterr() == expected_out
+
+def test_literals():
+    tree = parse('let t = ("a", 2 + 3000000000); let b = true; first(t)')
+    loaded = loads(dumps(tree))
+
+    assert isinstance(loaded, ast.Let)
+    assert loaded.identif == 't'
+    assert loaded.expr.left.value == 'a'
+    assert loaded.expr.right.right.value == 3000000000
+    assert loaded.next.expr.value == True
+    assert execute(loaded).value == 'a'
+
+def test_strings_are_shared():
+    data = dumps(parse('let x = 1; x + x + x'))
+    assert data.count(b'x') == 1
+
+def test_mmap_load(tmpdir):
+    path = str(tmpdir.join('fib.rinhac'))
+    with open(path, 'wb') as f:
+        dump(parse_file('fib.rinha'), f)
+
+    tree = load(path)
+    assert isinstance(tree, ast.Let)
+    assert tree.next.identif == 'fibbo'
+
+def test_mapped_image(tmpdir):
+    path = str(tmpdir.join('fib.rinhac'))
+    with open(path, 'wb') as f:
+        dump(parse_file('fib.rinha'), f)
+
+    with open_image(path) as image:
+        assert image.node(0) is not None
+        assert image.nodes.count(None) == image.count - 1
+        assert image.root().next.identif == 'fibbo'
+
+    with raises(ValueError):
+        image.record(0)
+
+def test_lazy_decoding():
+    image = Image(dumps(parse('let x = 1; x')))
+    assert image.nodes == [None] * image.count
+
+    image.node(0)
+    assert image.nodes.count(None) == image.count - 1
+
+def test_invalid_images():
+    data = dumps(parse('1'))
+
+    with raises(ValueError):
+        loads(b'XXXX' + data[4:])
+
+    with raises(ValueError):
+        loads(data[:4] + b'\xff\x00' + data[6:])
+
+    with raises(ValueError):
+        loads(data[:HEADER.size - 1])
+
+def corrupt(data, kind, field, value):
+    # Rewrites operand field (1-3) of the first record of kind
+    image = Image(data)
+    for i in range(image.count):
+        record = list(image.record(i))
+        if record[0] == kind:
+            record[field] = value
+            at = HEADER.size + i * NODE.size
+            return data[:at] + NODE.pack(*record) + data[at + NODE.size:]
+    raise AssertionError('no record of kind %d' % kind)
+
+@mark.parametrize('kind, field, value', [
+    (REF, 1, 999),
+    (REF, 1, -1),
+    (CALL, 2, 1 << 20),
+    (CALL, 2, -4),
+])
+def test_corrupt_operands(kind, field, value):
+    data = dumps(parse('let f = fn (x) => { x }; f(1)'))
+    with raises(ValueError):
+        loads(corrupt(data, kind, field, value))
+
+def test_corrupt_list_length():
+    data = dumps(parse('let f = fn (x) => { x }; f(1)'))
+    lists_at = HEADER.unpack_from(data, 0)[5]
+    with raises(ValueError):
+        loads(data[:lists_at] + b'\xff\xff\x00\x00' + data[lists_at + 4:])
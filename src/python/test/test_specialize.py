@@ -0,0 +1,80 @@
+from pytest import mark, raises
+
+from rinha import ast, specialize as spec
+from rinha.interpreter import interpret
+from rinha.lexical import lexer
+from rinha.pratt import parser
+from rinha.resolver import resolve
+from rinha.optimizer import children
+from test.test_vm import SAMPLES, SNIPPETS
+
+def run_both(source, capfd):
+    expected = interpret(source, backend='tree')
+    expected_out = capfd.readouterr()
+
+    result = interpret(source, backend='specialize')
+    out = capfd.readouterr()
+
+    assert type(result) is type(expected)
+    assert result.to_str() == expected.to_str()
+    assert out == expected_out
+
+def specialized(source):
+    program = spec.specialize(resolve(parser.parse(lexer.lex(source))))
+    return program, program.eval()
+
+def operators(program):
+    found = []
+    stack = [program.body]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, ast.Binary):
+            found.append(type(term))
+        stack.extend(children(term))
+    return found
+
+@mark.parametrize('filename', SAMPLES + ['combination.rinha'])
+def test_sample_files(filename, capfd):
+    with open('src/rinha/%s' % filename) as f:
+        run_both(f.read(), capfd)
+
+@mark.parametrize('source', SNIPPETS + [
+    '7 / 2', '(0 - 7) / 2', '7 % (0 - 3)', '1 != 2', '2 <= 2', '3 >= 4',
+    '"a" + "b"', '"a" == "a"', '"a" != "b"', '2000 * 2000', 'true == true',
+])
+def test_snippets(source, capfd):
+    run_both(source, capfd)
+
+def test_specializes_on_first_run():
+    program, result = specialized('let f = fn (n) => { if (n < 2) { n } else { n - 1 } }; f(5) + f(1)')
+    assert result.value == 5
+    assert sorted(t.__name__ for t in operators(program)) == ['AddIntInt', 'LtIntInt', 'SubIntInt']
+
+def test_unreached_stays_uninitialized():
+    program, _ = specialized('if (true) { 1 } else { 1 + 2 }')
+    assert operators(program) == [spec.AddUninitialized]
+
+def test_str_variants():
+    program, result = specialized('let s = "a" + "b"; s == "ab"')
+    assert result is ast.TRUE
+    assert sorted(t.__name__ for t in operators(program)) == ['AddStrStr', 'EqStrStr']
+
+def test_deoptimizes_to_generic():
+    source = 'let f = fn (x, y) => { x + y }; let _ = f(1, 2); f("n = ", 3)'
+    program, result = specialized(source)
+    assert result.value == 'n = 3'
+    assert operators(program) == [ast.Add]
+
+def test_generic_stays_generic():
+    source = 'let f = fn (x, y) => { x + y }; let _ = f("a", 1); f(1, 2)'
+    program, result = specialized(source)
+    assert result.value == 3
+    assert operators(program) == [ast.Add]
+
+def test_small_ints_are_shared():
+    _, result = specialized('40 + 2')
+    assert result is ast.boxed(42)
+
+def test_errors_match_tree():
+    with raises(ZeroDivisionError):
+        interpret('let f = fn (x) => { 1 / x }; let _ = f(1); f(0)', backend='specialize')
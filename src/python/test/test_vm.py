@@ -0,0 +1,111 @@
+from pytest import mark, raises
+
+from rinha.interpreter import interpret
+from rinha.lexical import lexer
+from rinha.grammar import parser
+from rinha.resolver import resolve
+from rinha.compiler import compile, CALL, TAIL_CALL
+from rinha.vm import get_printable_location
+
+SAMPLES = ['print.rinha', 'fib.rinha', 'geom.rinha', 'square.rinha', 'sum.rinha']
+
+SNIPPETS = [
+    'let _ = print(1); print(2)',
+    'let f = fn(x, y, z,) => { 0 }; f(print(1), print(2), print(3))',
+    'let tuple = (print(1), print(2)); print(tuple)',
+    'first(("x", "y"))',
+    'let x = 2; second((x, x + 1))',
+    '"a" + 2',
+    '(1 < 2) && (2 > 3)',
+    '(0 - 7) % 3',
+    'let x = 1; let x = (x + 1); x',
+    'let add = fn (x) => { fn (y) => { x + y } }; let inc = add(1); inc(2)',
+    'let f = fn () => { g() }; let g = fn () => { 42 }; f()',
+    'if (1 == 1) { "then" } else { "else" }',
+]
+
+def run_both(source, capfd):
+    expected = interpret(source, backend='tree')
+    expected_out = capfd.readouterr()
+
+    result = interpret(source, backend='vm')
+    out = capfd.readouterr()
+
+    assert type(result) is type(expected)
+    assert result.to_str() == expected.to_str()
+    assert out == expected_out
+
+@mark.parametrize('filename', SAMPLES)
+def test_sample_files(filename, capfd):
+    with open('src/rinha/%s' % filename) as f:
+        run_both(f.read(), capfd)
+
+@mark.parametrize('source', SNIPPETS)
+def test_snippets(source, capfd):
+    run_both(source, capfd)
+
+def test_deep_recursion():
+    source = 'let sum = fn (n) => { if (n == 0) { 0 } else { n + sum(n - 1) } }; sum(50000)'
+    result = interpret(source, backend='vm')
+    assert result.value == 1250025000
+
+def test_unbound_reference():
+    with raises(KeyError):
+        interpret('let f = fn () => { y }; f()', backend='vm')
+
+@mark.parametrize('source', [
+    'let f = fn (x) => { x }; f(print(1), print(2))',
+    'let g = 1; g(print(1))',
+    'let f = fn (x) => { x }; let h = fn () => { f(print(1), print(2)) }; h()',
+])
+def test_bad_calls_fail_before_arguments(source, capfd):
+    for backend in ['tree', 'vm']:
+        with raises(AssertionError):
+            interpret(source, backend=backend)
+        assert capfd.readouterr() == ('', '')
+
+def test_unbound_slot_names_the_reference():
+    source = 'let f = fn () => { g() }; let x = f(); let g = fn () => { 1 }; x'
+    for backend in ['tree', 'vm']:
+        with raises(KeyError) as error:
+            interpret(source, backend=backend)
+        assert error.value.args == ('g',)
+
+def test_bytecode():
+    program = resolve(parser.parse(lexer.lex('let f = fn (x) => { x }; f(1)')))
+    code = compile(program)
+    assert CALL in code.instrs
+    assert code.size == 1
+    assert code.functions[0].size == 1
+    assert code.functions[0].name == 'f'
+
+def test_printable_location():
+    program = resolve(parser.parse(lexer.lex('let f = fn (x) => { x }; f(1)')))
+    code = compile(program).functions[0]
+    assert get_printable_location(0, code) == 'f:0 LOAD_LOCAL'
+
+def test_tail_calls_run_in_constant_space():
+    source = 'let loop = fn (n, acc) => { if (n == 0) { acc } else { loop(n - 1, acc + n) } }; loop(100000, 0)'
+    program = resolve(parser.parse(lexer.lex(source)))
+    code = compile(program).functions[0]
+    assert TAIL_CALL in code.instrs
+    assert CALL not in code.instrs
+
+    result = interpret(source, backend='vm')
+    assert result.value == 5000050000
+
+@mark.parametrize('source', [
+    'false && print(1)',
+    'true || print(1)',
+    'true && print(true)',
+    'false || print(false)',
+    'let f = fn (n) => { (n > 0) && f(n - 1) }; f(10)',
+    'let f = fn (n) => { (n == 0) || f(n - 1) }; f(10)',
+    '1 && 2',
+])
+def test_short_circuit(source, capfd):
+    run_both(source, capfd)
+
+def test_short_circuit_skips_right():
+    source = 'let f = fn () => { print(1) }; (1 == 2) && f()'
+    assert interpret(source, backend='vm').to_str() == 'false'